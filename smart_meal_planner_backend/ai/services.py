@@ -1,21 +1,19 @@
 from typing import List, Dict, Any, Optional
-import openai
 import json
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from models import User, Recipe, InventoryItem
-from config import OPENAI_API_KEY
+from config import get_settings
+from monitoring.timing import timed
 from datetime import datetime
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def validate_api_key():
     """Validate that the OpenAI API key is properly configured"""
-    if not OPENAI_API_KEY:
+    if not get_settings().OPENAI_API_KEY:
         raise HTTPException(
             status_code=500,
             detail="OpenAI API key not configured. Please set the OPENAI_API_KEY environment variable."
@@ -25,6 +23,7 @@ def handle_openai_error(func):
     """Decorator to handle OpenAI API errors gracefully"""
     @wraps(func)
     async def wrapper(*args, **kwargs):
+        import openai
         try:
             validate_api_key()
             return await func(*args, **kwargs)
@@ -36,17 +35,11 @@ def handle_openai_error(func):
             raise HTTPException(status_code=500, detail="API authentication failed")
         except openai.RateLimitError as e:
             logger.error(f"OpenAI API rate limit exceeded: {str(e)}")
-            # Re-raise the original exception to be handled by the global exception handler
-            raise
+            raise rate_limit_exceeded(e)
         except openai.APIStatusError as e:
             logger.error(f"OpenAI API status error: {str(e)}")
             if e.status_code == 429:
-                # Convert to RateLimitError to be handled by the global exception handler
-                raise openai.RateLimitError(
-                    message=str(e),
-                    response=e.response,
-                    body=e.body
-                )
+                raise rate_limit_exceeded(e)
             raise HTTPException(status_code=e.status_code, detail=str(e))
         except openai.APIError as e:
             logger.error(f"OpenAI API error: {str(e)}")
@@ -59,9 +52,28 @@ def handle_openai_error(func):
             raise HTTPException(status_code=500, detail=str(e))
     return wrapper
 
-# Initialize OpenAI API key with validation
-validate_api_key()
-openai.api_key = OPENAI_API_KEY
+def rate_limit_exceeded(error: Exception) -> HTTPException:
+    """429 response for an upstream rate limit."""
+    return HTTPException(
+        status_code=429,
+        detail=str(error) or "Rate limit exceeded. Please try again later."
+    )
+
+@lru_cache()
+def _client():
+    """Build the OpenAI client on first use rather than at app import."""
+    import openai
+
+    validate_api_key()
+    settings = get_settings()
+    # OPENAI_BASE_URL sends requests to an OpenAI-compatible endpoint instead, e.g. loadtest/fake_openai.py
+    return openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+
+async def _chat_completion(**kwargs):
+    """Call the chat completion API, timed under the request's ``ai`` phase."""
+    client = _client()
+    with timed("ai"):
+        return await client.chat.completions.create(**kwargs)
 
 class AIService:
     RECIPE_TEMPLATE = {
@@ -353,7 +365,7 @@ class AIService:
         )
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a professional chef and nutritionist."},
@@ -408,7 +420,7 @@ class AIService:
         )
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a professional chef and nutritionist."},
@@ -449,7 +461,7 @@ Format the response as JSON with the same structure as the input recipe.
 Ensure instructions are updated to reflect new quantities."""
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -505,7 +517,7 @@ Ensure instructions are updated to reflect new quantities."""
         ])
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -569,7 +581,7 @@ Ensure instructions are updated to reflect new quantities."""
         ])
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -635,7 +647,7 @@ Ensure instructions are updated to reflect new quantities."""
         ])
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -692,7 +704,7 @@ Ensure instructions are updated to reflect new quantities."""
         ])
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -758,7 +770,7 @@ Ensure instructions are updated to reflect new quantities."""
         ])
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -820,7 +832,7 @@ Ensure instructions are updated to reflect new quantities."""
             json.dumps(AIService.OPTIMIZATION_TEMPLATE, indent=2)
         ])
 
-        response = await openai.ChatCompletion.acreate(
+        response = await _chat_completion(
             model="gpt-4",
             messages=[
                 {
@@ -873,7 +885,7 @@ Ensure instructions are updated to reflect new quantities."""
         ])
 
         try:
-            response = await openai.ChatCompletion.acreate(
+            response = await _chat_completion(
                 model="gpt-4",
                 messages=[
                     {
@@ -1,7 +1,7 @@
 """Add user relationships
 
 Revision ID: 164b2b539a69
-Revises: 
+Revises: 2f6d9b1c4e0a
 Create Date: 2024-12-04 20:35:21.556403
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = '164b2b539a69'
-down_revision: Union[str, None] = None
+down_revision: Union[str, None] = '2f6d9b1c4e0a'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
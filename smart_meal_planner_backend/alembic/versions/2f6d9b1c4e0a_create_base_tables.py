@@ -0,0 +1,101 @@
+"""Create base tables
+
+Revision ID: 2f6d9b1c4e0a
+Revises: 
+Create Date: 2026-10-19 09:12:44.180214
+
+Tables were previously created by ``Base.metadata.create_all`` at app start-up;
+the schema is now created by migrations only. Databases that already have these
+tables match ``164b2b539a69``: ``alembic stamp 164b2b539a69``, then ``alembic
+upgrade head`` for the later revisions.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6d9b1c4e0a'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table(
+        'inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('unit', sa.String(), nullable=True),
+        sa.Column('expiry_date', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_inventory_id'), 'inventory', ['id'], unique=False)
+    op.create_index(op.f('ix_inventory_name'), 'inventory', ['name'], unique=False)
+
+    op.create_table(
+        'recipes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('ingredients', sa.JSON(), nullable=True),
+        sa.Column('instructions', sa.JSON(), nullable=True),
+        sa.Column('prep_time', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recipes_id'), 'recipes', ['id'], unique=False)
+    op.create_index(op.f('ix_recipes_name'), 'recipes', ['name'], unique=False)
+
+    op.create_table(
+        'shopping_list',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('unit', sa.String(), nullable=True),
+        sa.Column('recipe_id', sa.Integer(), nullable=True),
+        sa.Column('purchased', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_shopping_list_id'), 'shopping_list', ['id'], unique=False)
+    op.create_index(op.f('ix_shopping_list_name'), 'shopping_list', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_shopping_list_name'), table_name='shopping_list')
+    op.drop_index(op.f('ix_shopping_list_id'), table_name='shopping_list')
+    op.drop_table('shopping_list')
+    op.drop_index(op.f('ix_recipes_name'), table_name='recipes')
+    op.drop_index(op.f('ix_recipes_id'), table_name='recipes')
+    op.drop_table('recipes')
+    op.drop_index(op.f('ix_inventory_name'), table_name='inventory')
+    op.drop_index(op.f('ix_inventory_id'), table_name='inventory')
+    op.drop_table('inventory')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,68 @@
+"""Add recipe cookability materialized view
+
+Revision ID: 5b9e2c7f0a18
+Revises: d41f7b2a9c63
+Create Date: 2026-10-19 18:40:12.377051
+
+``recipe_cookability`` holds each recipe's missing-ingredient count and shortfall
+against its owner's inventory; ``recipe_ingredients`` maps an ingredient back to
+the recipes using it, so an inventory change only recomputes those. Both start
+empty: a recipe without a row is computed on its owner's next read.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e2c7f0a18'
+down_revision: Union[str, None] = 'd41f7b2a9c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recipe_ingredients',
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('unit', sa.String(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('recipe_id', 'name', 'unit')
+    )
+    op.create_index(
+        'ix_recipe_ingredients_user_id_name_unit', 'recipe_ingredients', ['user_id', 'name', 'unit'], unique=False
+    )
+
+    op.create_table(
+        'recipe_cookability',
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        sa.Column('missing_count', sa.Integer(), nullable=True),
+        sa.Column('coverage', sa.Float(), nullable=True),
+        sa.Column('missing', sa.JSON(), nullable=True),
+        sa.Column('expires_on', sa.Date(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('recipe_id')
+    )
+    op.create_index(
+        'ix_recipe_cookability_user_id_rank', 'recipe_cookability',
+        ['user_id', 'missing_count', sa.text('coverage DESC'), 'recipe_id'], unique=False
+    )
+    op.create_index(
+        'ix_recipe_cookability_user_id_expires_on', 'recipe_cookability', ['user_id', 'expires_on'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_cookability_user_id_expires_on', table_name='recipe_cookability')
+    op.drop_index('ix_recipe_cookability_user_id_rank', table_name='recipe_cookability')
+    op.drop_table('recipe_cookability')
+    op.drop_index('ix_recipe_ingredients_user_id_name_unit', table_name='recipe_ingredients')
+    op.drop_table('recipe_ingredients')
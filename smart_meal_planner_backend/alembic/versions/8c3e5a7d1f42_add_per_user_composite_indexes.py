@@ -0,0 +1,37 @@
+"""Add per-user composite indexes
+
+Revision ID: 8c3e5a7d1f42
+Revises: 164b2b539a69
+Create Date: 2026-10-19 14:02:37.511902
+
+Every service query filters on ``user_id``; these indexes lead with it so the
+per-user lookups in ``api/services.py`` are index searches instead of table scans.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3e5a7d1f42'
+down_revision: Union[str, None] = '164b2b539a69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_inventory_user_id_name_unit', 'inventory', ['user_id', 'name', 'unit'], unique=False)
+    op.create_index('ix_inventory_user_id_expiry_date', 'inventory', ['user_id', 'expiry_date'], unique=False)
+    op.create_index('ix_recipes_user_id_id', 'recipes', ['user_id', 'id'], unique=False)
+    op.create_index('ix_shopping_list_user_id_name_unit', 'shopping_list', ['user_id', 'name', 'unit'], unique=False)
+    op.create_index('ix_shopping_list_user_id_purchased', 'shopping_list', ['user_id', 'purchased'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_shopping_list_user_id_purchased', table_name='shopping_list')
+    op.drop_index('ix_shopping_list_user_id_name_unit', table_name='shopping_list')
+    op.drop_index('ix_recipes_user_id_id', table_name='recipes')
+    op.drop_index('ix_inventory_user_id_expiry_date', table_name='inventory')
+    op.drop_index('ix_inventory_user_id_name_unit', table_name='inventory')
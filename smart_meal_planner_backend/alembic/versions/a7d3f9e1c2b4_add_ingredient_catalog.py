@@ -0,0 +1,176 @@
+"""Add canonical ingredient catalog
+
+Revision ID: a7d3f9e1c2b4
+Revises: 5b9e2c7f0a18
+Create Date: 2026-10-19 21:05:47.120934
+
+Inventory and shopping-list rows get an ``ingredient_id`` into the new ``ingredients``
+catalog and the ``base_unit`` their unit converts to (see ``api/ingredients.py``), and
+their uniqueness moves from (user_id, name, unit) to (user_id, ingredient_id, base_unit).
+Rows that now collide ("Tomatoes"/"tomato", "g"/"kg") are merged into the oldest one,
+converting quantities to its unit and keeping the earliest expiry date.
+
+``recipe_ingredients`` is derived data: it is recreated keyed by ingredient id and,
+like ``recipe_cookability``, refilled on each user's next read.
+
+"""
+from typing import Dict, List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.ingredients import canonical_unit, normalize_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9e1c2b4'
+down_revision: Union[str, None] = '5b9e2c7f0a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = "purchased = false"
+
+ingredients = sa.table('ingredients', sa.column('id', sa.Integer), sa.column('name', sa.String))
+
+
+def _catalog_ids(connection, names: set) -> Dict[str, int]:
+    ids = dict(connection.execute(sa.select(ingredients.c.name, ingredients.c.id)).all())
+    new = sorted(names - ids.keys())
+    if new:
+        connection.execute(ingredients.insert(), [{'name': name} for name in new])
+        ids = dict(connection.execute(sa.select(ingredients.c.name, ingredients.c.id)).all())
+    return ids
+
+
+def _backfill(table_name: str, pending_only: bool = False) -> None:
+    """Set ingredient_id, base_unit and the canonical unit; merge rows sharing them."""
+    connection = op.get_bind()
+    columns = ['id', 'user_id', 'name', 'unit', 'quantity'] + (['purchased'] if pending_only else ['expiry_date'])
+    table = sa.table(
+        table_name, sa.column('ingredient_id', sa.Integer), sa.column('base_unit', sa.String),
+        *(sa.column(name) for name in columns)
+    )
+    rows = connection.execute(
+        sa.select(*(table.c[name] for name in columns))
+        .where(table.c.name.is_not(None), table.c.unit.is_not(None))
+        .order_by(table.c.id)
+    ).all()
+    ids = _catalog_ids(connection, {normalize_name(row.name) for row in rows})
+
+    keepers: Dict[Tuple, dict] = {}
+    updates: List[dict] = []
+    merged: List[int] = []
+    for row in rows:
+        unit, base_unit, factor = canonical_unit(row.unit)
+        update = {
+            'row_id': row.id, 'unit': unit, 'base_unit': base_unit, 'ingredient_id': ids[normalize_name(row.name)],
+            'quantity': row.quantity, 'factor': factor,
+        }
+        if not pending_only:
+            update['expiry_date'] = row.expiry_date
+        if pending_only and row.purchased:
+            updates.append(update)  # purchased rows are history and never merge
+            continue
+        key = (row.user_id, update['ingredient_id'], base_unit)
+        keeper = keepers.get(key)
+        if keeper is None:
+            keepers[key] = update
+            updates.append(update)
+            continue
+        keeper['quantity'] = (keeper['quantity'] or 0) + (row.quantity or 0) * factor / keeper['factor']
+        if not pending_only and row.expiry_date is not None and (
+            keeper['expiry_date'] is None or row.expiry_date < keeper['expiry_date']
+        ):
+            keeper['expiry_date'] = row.expiry_date
+        merged.append(row.id)
+
+    if merged:
+        connection.execute(table.delete().where(table.c.id.in_(merged)))
+    if updates:
+        values = {name: sa.bindparam(name) for name in ('unit', 'base_unit', 'ingredient_id', 'quantity')}
+        if not pending_only:
+            values['expiry_date'] = sa.bindparam('expiry_date')
+        connection.execute(table.update().where(table.c.id == sa.bindparam('row_id')).values(**values), updates)
+
+
+def _recreate_recipe_ingredients(key_columns: List[sa.Column], index_columns: List[str], index_name: str) -> None:
+    op.drop_table('recipe_ingredients')
+    op.create_table(
+        'recipe_ingredients',
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        *key_columns,
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+        *(
+            [sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'])]
+            if 'ingredient_id' in index_columns else []
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('recipe_id', *index_columns[1:])
+    )
+    op.create_index(index_name, 'recipe_ingredients', index_columns, unique=False)
+    # Rows are recomputed on each user's next read
+    op.execute('DELETE FROM recipe_cookability')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingredients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_ingredients_name', 'ingredients', ['name'], unique=True)
+
+    for table_name in ('inventory', 'shopping_list'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('ingredient_id', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('base_unit', sa.String(), nullable=True))
+            batch_op.create_foreign_key(f'fk_{table_name}_ingredient_id', 'ingredients', ['ingredient_id'], ['id'])
+
+    _backfill('inventory')
+    _backfill('shopping_list', pending_only=True)
+
+    op.drop_index('uq_inventory_user_id_name_unit', table_name='inventory')
+    op.create_index(
+        'uq_inventory_user_id_ingredient_id_base_unit', 'inventory', ['user_id', 'ingredient_id', 'base_unit'],
+        unique=True
+    )
+    op.drop_index('uq_shopping_list_pending_user_id_name_unit', table_name='shopping_list')
+    op.create_index(
+        'uq_shopping_list_pending_user_id_ingredient_id_base_unit', 'shopping_list',
+        ['user_id', 'ingredient_id', 'base_unit'], unique=True,
+        sqlite_where=sa.text(PENDING), postgresql_where=sa.text(PENDING)
+    )
+
+    _recreate_recipe_ingredients(
+        [sa.Column('ingredient_id', sa.Integer(), nullable=False), sa.Column('base_unit', sa.String(), nullable=False)],
+        ['user_id', 'ingredient_id', 'base_unit'],
+        'ix_recipe_ingredients_user_id_ingredient_id_base_unit'
+    )
+
+
+def downgrade() -> None:
+    _recreate_recipe_ingredients(
+        [sa.Column('name', sa.String(), nullable=False), sa.Column('unit', sa.String(), nullable=False)],
+        ['user_id', 'name', 'unit'],
+        'ix_recipe_ingredients_user_id_name_unit'
+    )
+
+    op.drop_index('uq_shopping_list_pending_user_id_ingredient_id_base_unit', table_name='shopping_list')
+    op.create_index(
+        'uq_shopping_list_pending_user_id_name_unit', 'shopping_list', ['user_id', 'name', 'unit'], unique=True,
+        sqlite_where=sa.text(PENDING), postgresql_where=sa.text(PENDING)
+    )
+    op.drop_index('uq_inventory_user_id_ingredient_id_base_unit', table_name='inventory')
+    op.create_index('uq_inventory_user_id_name_unit', 'inventory', ['user_id', 'name', 'unit'], unique=True)
+
+    for table_name in ('shopping_list', 'inventory'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_constraint(f'fk_{table_name}_ingredient_id', type_='foreignkey')
+            batch_op.drop_column('base_unit')
+            batch_op.drop_column('ingredient_id')
+
+    op.drop_index('uq_ingredients_name', table_name='ingredients')
+    op.drop_table('ingredients')
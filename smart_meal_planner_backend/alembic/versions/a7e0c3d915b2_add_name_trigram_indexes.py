@@ -0,0 +1,41 @@
+"""Add trigram indexes for fuzzy name search
+
+Revision ID: a7e0c3d915b2
+Revises: a7d3f9e1c2b4
+Create Date: 2026-10-19 23:12:08.530417
+
+Postgres only: enables ``pg_trgm`` and adds GIN ``gin_trgm_ops`` indexes on
+inventory and recipe names, which serve the ``%`` similarity operator. SQLite has
+no trigram index type; it searches an in-process index instead (api/trigrams.py).
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e0c3d915b2'
+down_revision: Union[str, None] = 'a7d3f9e1c2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (('ix_inventory_name_trgm', 'inventory'), ('ix_recipes_name_trgm', 'recipes'))
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table_name in INDEXES:
+        op.create_index(
+            name, table_name, ['name'], unique=False,
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table_name in INDEXES:
+        op.drop_index(name, table_name=table_name)
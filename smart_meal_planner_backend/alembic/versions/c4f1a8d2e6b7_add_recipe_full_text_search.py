@@ -0,0 +1,70 @@
+"""Add recipe full-text search
+
+Revision ID: c4f1a8d2e6b7
+Revises: a7e0c3d915b2
+Create Date: 2026-10-20 00:41:26.804113
+
+SQLite: an FTS5 table ``recipes_fts`` (name, description, steps joined with " / ", and
+the owner's id as a token), filled from ``recipes`` and kept in sync by triggers.
+Postgres: a generated ``search_vector`` tsvector column on ``recipes`` weighting the
+name over the description over the steps, with a GIN index.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f1a8d2e6b7'
+down_revision: Union[str, None] = 'a7e0c3d915b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROW = """
+    ({0}.id, {0}.name, {0}.description,
+     CASE WHEN json_valid({0}.instructions)
+          THEN (SELECT group_concat(value, ' / ') FROM json_each({0}.instructions))
+          ELSE {0}.instructions END,
+     {0}.user_id)"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""ALTER TABLE recipes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(instructions, '[]'::json)), 'C')
+        ) STORED""")
+        op.execute('CREATE INDEX ix_recipes_search_vector ON recipes USING gin (search_vector)')
+        return
+
+    op.execute("""CREATE VIRTUAL TABLE recipes_fts USING fts5(
+        name, description, instructions, owner, tokenize = 'porter unicode61 remove_diacritics 2'
+    )""")
+    op.execute(f"""CREATE TRIGGER recipes_fts_insert AFTER INSERT ON recipes BEGIN
+        INSERT INTO recipes_fts (rowid, name, description, instructions, owner) VALUES {ROW.format('new')};
+    END""")
+    op.execute(f"""CREATE TRIGGER recipes_fts_update
+        AFTER UPDATE OF name, description, instructions, user_id ON recipes BEGIN
+        DELETE FROM recipes_fts WHERE rowid = old.id;
+        INSERT INTO recipes_fts (rowid, name, description, instructions, owner) VALUES {ROW.format('new')};
+    END""")
+    op.execute("""CREATE TRIGGER recipes_fts_delete AFTER DELETE ON recipes BEGIN
+        DELETE FROM recipes_fts WHERE rowid = old.id;
+    END""")
+    op.execute(
+        "INSERT INTO recipes_fts (rowid, name, description, instructions, owner) "
+        f"SELECT {ROW.format('recipes').strip()[1:-1]} FROM recipes"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX ix_recipes_search_vector')
+        op.execute('ALTER TABLE recipes DROP COLUMN search_vector')
+        return
+
+    for trigger in ('recipes_fts_delete', 'recipes_fts_update', 'recipes_fts_insert'):
+        op.execute(f'DROP TRIGGER {trigger}')
+    op.execute('DROP TABLE recipes_fts')
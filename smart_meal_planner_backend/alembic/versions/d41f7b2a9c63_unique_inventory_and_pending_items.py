@@ -0,0 +1,67 @@
+"""Unique inventory and pending shopping-list items
+
+Revision ID: d41f7b2a9c63
+Revises: 8c3e5a7d1f42
+Create Date: 2026-10-19 15:26:08.904417
+
+Quantities are now added with ``INSERT ... ON CONFLICT`` upserts, which need a
+unique index on the conflict target: (user_id, name, unit) for inventory, and the
+same for pending (unpurchased) shopping-list rows. Existing duplicates are merged
+into their oldest row first: quantities are summed and, for inventory, the
+earliest expiry date is kept.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7b2a9c63'
+down_revision: Union[str, None] = '8c3e5a7d1f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = "purchased = false"
+
+
+def _merge_duplicates(table: str, pending_only: bool = False) -> None:
+    """Fold rows sharing (user_id, name, unit) into the oldest one."""
+    scope = " AND purchased = false" if pending_only else ""
+    same_key = (
+        f"d.user_id = {table}.user_id AND d.name = {table}.name AND d.unit = {table}.unit"
+        + (" AND d.purchased = false" if pending_only else "")
+    )
+    merged = f"quantity = (SELECT SUM(d.quantity) FROM {table} d WHERE {same_key})"
+    if table == 'inventory':
+        merged += f", expiry_date = (SELECT MIN(d.expiry_date) FROM {table} d WHERE {same_key})"
+    keepers = (
+        f"SELECT MIN(id) FROM {table} WHERE user_id IS NOT NULL AND name IS NOT NULL AND unit IS NOT NULL"
+        f"{scope} GROUP BY user_id, name, unit"
+    )
+    op.execute(f"UPDATE {table} SET {merged} WHERE id IN ({keepers} HAVING COUNT(*) > 1)")
+    op.execute(
+        f"DELETE FROM {table} WHERE user_id IS NOT NULL AND name IS NOT NULL AND unit IS NOT NULL"
+        f"{scope} AND id NOT IN ({keepers})"
+    )
+
+
+def upgrade() -> None:
+    _merge_duplicates('inventory')
+    _merge_duplicates('shopping_list', pending_only=True)
+
+    op.drop_index('ix_inventory_user_id_name_unit', table_name='inventory')
+    op.create_index('uq_inventory_user_id_name_unit', 'inventory', ['user_id', 'name', 'unit'], unique=True)
+    op.drop_index('ix_shopping_list_user_id_name_unit', table_name='shopping_list')
+    op.create_index(
+        'uq_shopping_list_pending_user_id_name_unit', 'shopping_list', ['user_id', 'name', 'unit'], unique=True,
+        sqlite_where=sa.text(PENDING), postgresql_where=sa.text(PENDING)
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_shopping_list_pending_user_id_name_unit', table_name='shopping_list')
+    op.create_index('ix_shopping_list_user_id_name_unit', 'shopping_list', ['user_id', 'name', 'unit'], unique=False)
+    op.drop_index('uq_inventory_user_id_name_unit', table_name='inventory')
+    op.create_index('ix_inventory_user_id_name_unit', 'inventory', ['user_id', 'name', 'unit'], unique=False)
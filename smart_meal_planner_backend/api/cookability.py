@@ -0,0 +1,134 @@
+"""
+Quantity-aware "what can I cook right now" matching, without an LLM call.
+
+Every ingredient a user's recipes mention is keyed by its catalog name and base unit
+(see api.ingredients) and given a dense integer id. A recipe's requirements become a bitset (a Python int with
+bit ``i`` set for ingredient ``i``) plus its quantities per id; the user's stock
+becomes one bitset plus a quantity vector indexed by the same ids.
+
+``required & ~in_stock`` then counts a recipe's absent ingredients with one
+word-parallel AND and a popcount, so recipes that cannot come within
+``max_missing`` are dropped without looking at quantities. Only the survivors
+have their quantities compared to find what is short and by how much.
+
+Quantities are converted to their base unit, so 1 kg of rice covers 500 g; a unit
+without a conversion ("cloves") only matches itself.
+"""
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .ingredients import canonical_unit, normalize_name
+
+# (catalog name, base unit)
+IngredientKey = Tuple[str, str]
+
+def ingredient_key(name: str, unit: str) -> Tuple[IngredientKey, float]:
+    """The ingredient's key and the factor converting its quantity to the base unit"""
+    _, base, factor = canonical_unit(unit)
+    return (normalize_name(name), base), factor
+
+class CookabilityIndex:
+    """Recipe requirements over dense ingredient ids, built once per set of recipes."""
+
+    def __init__(self, recipes: Iterable[Tuple[int, List[dict]]]):
+        self.ingredient_ids: Dict[IngredientKey, int] = {}
+        # (display name as first written in a recipe, base unit) per ingredient id
+        self.ingredients: List[Tuple[str, str]] = []
+        self.recipe_ids: List[int] = []
+        self.required: List[int] = []
+        self.quantities: List[Dict[int, float]] = []
+        for recipe_id, ingredients in recipes:
+            required, quantities = 0, {}
+            for ingredient in ingredients:
+                ingredient_id, factor = self._id(ingredient["name"], ingredient["unit"])
+                required |= 1 << ingredient_id
+                quantities[ingredient_id] = quantities.get(ingredient_id, 0.0) + ingredient["quantity"] * factor
+            self.recipe_ids.append(recipe_id)
+            self.required.append(required)
+            self.quantities.append(quantities)
+
+    def _id(self, name: str, unit: str) -> Tuple[int, float]:
+        key, factor = ingredient_key(name, unit)
+        ingredient_id = self.ingredient_ids.get(key)
+        if ingredient_id is None:
+            ingredient_id = self.ingredient_ids[key] = len(self.ingredients)
+            self.ingredients.append((name, key[1]))
+        return ingredient_id, factor
+
+    def stock(self, items: Iterable[Tuple[str, str, float]]) -> Tuple[int, array]:
+        """
+        Bitset and quantity vector (in base units) of the (name, unit, quantity) items in
+        stock. Items no recipe uses are ignored.
+        """
+        available = array("d", bytes(8 * len(self.ingredients)))
+        in_stock = 0
+        for name, unit, quantity in items:
+            key, factor = ingredient_key(name, unit)
+            ingredient_id = self.ingredient_ids.get(key)
+            if ingredient_id is not None and quantity > 0:
+                available[ingredient_id] += quantity * factor
+                in_stock |= 1 << ingredient_id
+        return in_stock, available
+
+    def _missing(self, position: int, available: array, servings: float, max_missing: Optional[int]) -> List[dict]:
+        """Ingredients of one recipe that are absent or short, up to the first beyond ``max_missing``."""
+        missing = []
+        for ingredient_id, quantity in self.quantities[position].items():
+            needed = quantity * servings
+            if available[ingredient_id] < needed:
+                name, unit = self.ingredients[ingredient_id]
+                missing.append({
+                    "name": name,
+                    "unit": unit,
+                    "required": needed,
+                    "available": available[ingredient_id],
+                    "shortfall": needed - available[ingredient_id],
+                })
+                if max_missing is not None and len(missing) > max_missing:
+                    break
+        return missing
+
+    def _entry(self, position: int, missing: List[dict]) -> dict:
+        quantities = self.quantities[position]
+        return {
+            "recipe_id": self.recipe_ids[position],
+            "missing_count": len(missing),
+            "coverage": 1 - len(missing) / len(quantities) if quantities else 1.0,
+            "missing": missing,
+        }
+
+    def evaluate(self, items: Iterable[Tuple[str, str, float]], servings: float = 1.0) -> List[dict]:
+        """One entry per recipe, in index order, however much is missing."""
+        _, available = self.stock(items)
+        return [
+            self._entry(position, self._missing(position, available, servings, None))
+            for position in range(len(self.recipe_ids))
+        ]
+
+    def match(
+        self,
+        items: Iterable[Tuple[str, str, float]],
+        max_missing: int = 0,
+        servings: float = 1.0,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Recipes missing at most ``max_missing`` ingredients (absent, or short of the
+        quantity needed for ``servings``), fewest missing first, then highest coverage.
+        """
+        in_stock, available = self.stock(items)
+        matches = []
+        for position, required in enumerate(self.required):
+            if (required & ~in_stock).bit_count() > max_missing:
+                continue
+            missing = self._missing(position, available, servings, max_missing)
+            if len(missing) <= max_missing:
+                matches.append(self._entry(position, missing))
+
+        def rank(entry: dict) -> Tuple[int, float, int]:
+            return entry["missing_count"], -entry["coverage"], entry["recipe_id"]
+
+        if limit is None:
+            return sorted(matches, key=rank)
+        return heapq.nsmallest(limit, matches, key=rank)
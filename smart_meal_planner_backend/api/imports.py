@@ -0,0 +1,235 @@
+"""
+Incremental CSV / NDJSON import for ``POST /api/v1/import``.
+
+The request body is decoded and split into records as it arrives; each record is
+validated with a cached ``TypeAdapter`` and inserted ``batch_size`` at a time, one
+commit per batch. Memory is bounded by the batch size (plus the first
+``MAX_REPORTED_ERRORS`` errors), not by the upload: a line longer than
+``MAX_LINE_LENGTH`` or a CSV record longer than ``MAX_RECORD_LENGTH`` characters is
+reported as an error and dropped, and parsing resumes at the next line. A batch the
+database rejects is rolled back and each of its rows reported with the reason; the
+batches committed before it stay, and the import carries on with the next one.
+
+NDJSON lines use the ``{"type": ..., "data": {...}}`` records written by
+``GET /api/v1/export``; other record types (the export header, shopping-list rows)
+are skipped. Bare objects and CSV rows take their type from the ``kind`` parameter.
+"""
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from models import User
+from monitoring.logger import get_logger
+from . import schemas
+from .services import InventoryService, RecipeService
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+MAX_LINE_LENGTH = 1 << 20  # characters
+MAX_RECORD_LENGTH = 4 << 20  # characters of a CSV record, quoted line breaks included
+
+ADAPTERS: Dict[str, TypeAdapter] = {
+    "inventory": TypeAdapter(schemas.InventoryItemCreate),
+    "recipe": TypeAdapter(schemas.RecipeCreate),
+}
+INSERTERS: Dict[str, Callable[[Session, List[Any], User], int]] = {
+    "inventory": InventoryService.import_items,
+    "recipe": RecipeService.import_recipes,
+}
+# CSV cells holding JSON lists
+JSON_COLUMNS = {"ingredients", "instructions"}
+
+# (line number, record type, data); a record type of None means data is an error message
+Record = Tuple[int, Optional[str], Any]
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_length: int = MAX_LINE_LENGTH) -> AsyncIterator[Optional[str]]:
+    """
+    Decode a byte stream and yield complete lines without their terminator. A line
+    longer than ``max_length`` is discarded as it arrives and yields None.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    parts: List[str] = []  # the current line so far
+    size = 0
+    overlong = False
+    async for chunk in chunks:
+        *lines, tail = decoder.decode(chunk).split("\n")
+        for piece in lines:
+            line = "".join(parts) + piece
+            yield None if overlong or len(line) > max_length else line.rstrip("\r")
+            parts, size, overlong = [], 0, False
+        if not overlong:
+            parts.append(tail)
+            size += len(tail)
+            if size > max_length:
+                parts, size, overlong = [], 0, True
+    line = "".join(parts) + decoder.decode(b"", final=True)
+    if overlong or len(line) > max_length:
+        yield None
+    elif line:
+        yield line.rstrip("\r")
+
+def _too_long(limit: int, what: str = "line") -> str:
+    return f"{what} longer than {limit} characters"
+
+async def iter_ndjson(lines: AsyncIterator[Optional[str]], kind: Optional[str]) -> AsyncIterator[Record]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if line is None:
+            yield line_no, None, _too_long(MAX_LINE_LENGTH)
+            continue
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"invalid JSON: {e.msg}"
+            continue
+        if isinstance(value, dict) and "type" in value and "data" in value:
+            yield line_no, value["type"], value["data"]
+        elif kind is None:
+            yield line_no, None, 'expected a {"type": ..., "data": ...} record (or pass kind)'
+        else:
+            yield line_no, kind, value
+
+def _csv_row(header: List[str], values: List[str], kind: str) -> Tuple[Optional[str], Any]:
+    row: Dict[str, Any] = {}
+    for column, value in zip(header, values):
+        if value == "":
+            continue  # empty cell: field default
+        if column in JSON_COLUMNS:
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                return None, f"{column}: invalid JSON"
+        row[column] = value
+    return kind, row
+
+async def iter_csv(
+    lines: AsyncIterator[Optional[str]], kind: str, max_length: int = MAX_RECORD_LENGTH
+) -> AsyncIterator[Record]:
+    """
+    CSV with a header row; quoted fields may span lines. A record is complete once its
+    lines hold an even number of quote characters, and is then parsed by ``csv.reader``.
+    A record longer than ``max_length`` (or holding an overlong line) is reported at its
+    first line and dropped; the next line starts a new record.
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    size = start = line_no = 0
+    quoted = False  # inside a quoted field that continues on the next line
+    async for line in lines:
+        line_no += 1
+        if not record:
+            start = line_no
+        if line is None or size + len(line) > max_length:
+            error = _too_long(MAX_LINE_LENGTH) if line is None else _too_long(max_length, "record")
+            yield start, None, error
+            record, size, quoted = [], 0, False
+            continue
+        record.append(line + "\n")
+        size += len(line) + 1
+        quoted ^= line.count('"') % 2 == 1
+        if quoted:
+            continue
+        complete, record, size = record, [], 0
+        if not "".join(complete).strip():
+            continue
+        values = next(csv.reader(complete))
+        if header is None:
+            header = [column.strip() for column in values]
+        else:
+            yield (start, *_csv_row(header, values, kind))
+    if record:
+        yield start, None, "unterminated quoted field"
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'record'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+def _db_reason(error: SQLAlchemyError) -> str:
+    # The driver's message, without the statement and the whole batch's parameters
+    return str(error.orig if isinstance(error, DBAPIError) else error)
+
+async def import_records(
+    db: Session,
+    user: User,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    kind: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "format": fmt,
+        "processed": 0,
+        "imported": {record_type: 0 for record_type in ADAPTERS},
+        "skipped": 0,
+        "failed": 0,
+        "batches": 0,
+        "errors": [],
+        "errors_truncated": False,
+    }
+    # (line, validated record) per type
+    pending: Dict[str, List[Tuple[int, Any]]] = {record_type: [] for record_type in ADAPTERS}
+
+    def fail(line: int, error: str) -> None:
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line, "error": error})
+        else:
+            summary["errors_truncated"] = True
+
+    async def flush(record_type: str) -> None:
+        batch, pending[record_type] = pending[record_type], []
+        try:
+            # Sync session work stays off the event loop
+            imported = await run_in_threadpool(INSERTERS[record_type], db, [value for _, value in batch], user)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("import_batch_failed", user_id=user.id, record_type=record_type, error=_db_reason(e))
+            for line, _ in batch:
+                fail(line, f"batch not imported: {_db_reason(e)}")
+            return
+        summary["imported"][record_type] += imported
+        summary["batches"] += 1
+        logger.info(
+            "import_progress",
+            user_id=user.id,
+            processed=summary["processed"],
+            imported=summary["imported"],
+            failed=summary["failed"]
+        )
+
+    lines = iter_lines(chunks)
+    records = iter_csv(lines, kind) if fmt == "csv" else iter_ndjson(lines, kind)
+    async for line, record_type, data in records:
+        summary["processed"] += 1
+        if record_type is None:
+            fail(line, data)
+            continue
+        adapter = ADAPTERS.get(record_type)
+        if adapter is None:
+            summary["skipped"] += 1
+            continue
+        try:
+            pending[record_type].append((line, adapter.validate_python(data)))
+        except ValidationError as e:
+            fail(line, _describe(e))
+            continue
+        if len(pending[record_type]) >= batch_size:
+            await flush(record_type)
+
+    for record_type, batch in pending.items():
+        if batch:
+            await flush(record_type)
+    return summary
@@ -0,0 +1,110 @@
+"""
+Canonical ingredient names and units.
+
+``normalize_name`` maps free text to its key in the ``ingredients`` catalog:
+lowercased, punctuation and repeated whitespace removed, the last word made
+singular ("Cherry Tomatoes" -> "cherry tomato"), then resolved through ``ALIASES``
+("spring onions" -> "green onion").
+
+``canonical_unit`` maps a unit spelling to ``(unit, base unit, factor)``, where
+``quantity * factor`` is the amount in the base unit: "Kilograms" -> ("kg", "g", 1000).
+Units outside ``UNITS`` ("cloves", "bunch") are their own base unit.
+
+Both are pure and cached; every write path calls them, so rows, recipe ingredients
+and shopping-list items agree on ingredient identity.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Different names for the same ingredient, as singular normalized text
+ALIASES: Dict[str, str] = {
+    "all purpose flour": "flour",
+    "plain flour": "flour",
+    "aubergine": "eggplant",
+    "courgette": "zucchini",
+    "coriander": "cilantro",
+    "capsicum": "bell pepper",
+    "scallion": "green onion",
+    "spring onion": "green onion",
+    "garbanzo": "chickpea",
+    "garbanzo bean": "chickpea",
+    "rocket": "arugula",
+    "prawn": "shrimp",
+    "minced beef": "ground beef",
+    "beef mince": "ground beef",
+    "icing sugar": "powdered sugar",
+    "confectioners sugar": "powdered sugar",
+    "caster sugar": "superfine sugar",
+    "double cream": "heavy cream",
+    "bicarbonate of soda": "baking soda",
+}
+
+# Canonical unit -> (base unit, factor to the base unit); spoons and cups are metric
+UNITS: Dict[str, Tuple[str, float]] = {
+    "mg": ("g", 0.001),
+    "g": ("g", 1.0),
+    "kg": ("g", 1000.0),
+    "oz": ("g", 28.349523125),
+    "lb": ("g", 453.59237),
+    "ml": ("ml", 1.0),
+    "cl": ("ml", 10.0),
+    "dl": ("ml", 100.0),
+    "l": ("ml", 1000.0),
+    "tsp": ("ml", 5.0),
+    "tbsp": ("ml", 15.0),
+    "cup": ("ml", 240.0),
+    "pcs": ("pcs", 1.0),
+    "dozen": ("pcs", 12.0),
+}
+
+UNIT_SPELLINGS: Dict[str, str] = {
+    "milligram": "mg", "milligrams": "mg",
+    "gr": "g", "gram": "g", "grams": "g", "gramme": "g", "grammes": "g",
+    "kgs": "kg", "kilo": "kg", "kilos": "kg", "kilogram": "kg", "kilograms": "kg",
+    "ounce": "oz", "ounces": "oz",
+    "lbs": "lb", "pound": "lb", "pounds": "lb",
+    "milliliter": "ml", "milliliters": "ml", "millilitre": "ml", "millilitres": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l", "ltr": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbs": "tbsp",
+    "cups": "cup",
+    "pc": "pcs", "piece": "pcs", "pieces": "pcs", "each": "pcs", "whole": "pcs",
+}
+
+# Singular words that look plural
+INVARIANT = {"asparagus", "couscous", "hummus", "molasses", "swiss", "citrus", "bass", "grits", "oats"}
+IRREGULAR = {"leaves": "leaf", "loaves": "loaf", "halves": "half", "cookies": "cookie", "knives": "knife"}
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+def singular(word: str) -> str:
+    """Strip an English plural ending; deliberately simple, for ingredient nouns."""
+    if word in IRREGULAR:
+        return IRREGULAR[word]
+    if len(word) <= 3 or word in INVARIANT or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+@lru_cache(maxsize=8192)
+def normalize_name(name: str) -> str:
+    words = _PUNCTUATION.sub(" ", name.lower()).split()
+    if words:
+        words[-1] = singular(words[-1])
+    key = " ".join(words)
+    return ALIASES.get(key, key)
+
+@lru_cache(maxsize=1024)
+def canonical_unit(unit: str) -> Tuple[str, str, float]:
+    spelled = " ".join(unit.lower().replace(".", "").split())
+    canonical = UNIT_SPELLINGS.get(spelled, spelled)
+    if canonical not in UNITS:
+        canonical = singular(canonical)
+    base, factor = UNITS.get(canonical, (canonical, 1.0))
+    return canonical, base, factor
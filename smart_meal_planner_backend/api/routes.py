@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from database import get_db
-from . import schemas, services
+from . import imports, schemas, services
 from auth.utils import get_current_active_user
-from models import User
+from models import InventoryItem, Recipe, User
 
 router = APIRouter(prefix="/api/v1")
 inventory_service = services.InventoryService()
 recipe_service = services.RecipeService()
 shopping_list_service = services.ShoppingListService()
+export_service = services.ExportService()
+fuzzy_search_service = services.FuzzySearchService()
 
 # Inventory routes
 @router.get("/inventory/", response_model=List[schemas.InventoryItem])
@@ -35,6 +38,81 @@ def create_inventory_item(
     """
     return inventory_service.create_item(db, item, current_user)
 
+# Batch routes are declared before /inventory/{item_id} so "batch" is not read as an id
+@router.post("/inventory/batch", response_model=schemas.InventoryBatchResponse)
+def create_inventory_items(
+    batch: schemas.InventoryBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create or restock many inventory items (e.g. a grocery receipt) in one transaction.
+    Items matching an existing name and unit add to its quantity.
+    """
+    return inventory_service.create_items(db, batch.items, current_user)
+
+@router.patch("/inventory/batch", response_model=schemas.InventoryBatchResponse)
+def update_inventory_items(
+    batch: schemas.InventoryBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Partially update many inventory items in one transaction.
+    Unknown ids are reported as not_found.
+    """
+    return inventory_service.update_items(db, batch.items, current_user)
+
+@router.delete("/inventory/batch", response_model=schemas.InventoryBatchResponse)
+def delete_inventory_items(
+    batch: schemas.InventoryBatchDelete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Delete many inventory items in one transaction.
+    Unknown ids are reported as not_found.
+    """
+    return inventory_service.delete_items(db, batch.ids, current_user)
+
+@router.get("/inventory/expiring", response_model=List[schemas.InventoryItem])
+def get_expiring_inventory_items(
+    within_days: int = Query(7, ge=0, le=365),
+    include_expired: bool = True,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the current user's items expiring within the given number of days, soonest first.
+    """
+    return inventory_service.get_expiring(db, current_user, within_days, include_expired, limit)
+
+@router.get("/inventory/expiry-summary", response_model=schemas.ExpirySummary)
+def get_inventory_expiry_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Count the current user's inventory items per expiry bucket.
+    """
+    return inventory_service.get_expiry_summary(db, current_user)
+
+@router.get("/inventory/fuzzy", response_model=List[schemas.FuzzyInventoryMatch])
+def fuzzy_search_inventory_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    min_similarity: float = Query(0.3, gt=0, le=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Find the current user's inventory items whose names are most similar to q, tolerating
+    misspellings ("tomatoe", "chiken"), best match first.
+    """
+    matches = fuzzy_search_service.search(db, InventoryItem, current_user, q, limit, min_similarity)
+    return [{"item": item, "similarity": similarity} for item, similarity in matches]
+
 @router.get("/inventory/{item_id}", response_model=schemas.InventoryItem)
 def get_inventory_item(
     item_id: int,
@@ -93,6 +171,62 @@ def create_recipe(
     """
     return recipe_service.create_recipe(db, recipe, current_user)
 
+@router.get("/recipes/use-soon", response_model=List[schemas.ExpiringRecipeMatch])
+def get_recipes_using_expiring_items(
+    within_days: int = Query(7, ge=0, le=365),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Rank the current user's recipes by how much of the soon-to-expire inventory they use up.
+    """
+    return recipe_service.rank_by_expiring(db, current_user, within_days, limit)
+
+@router.get("/recipes/cookable", response_model=List[schemas.CookableRecipe])
+def get_cookable_recipes(
+    max_missing: int = Query(0, ge=0, le=20),
+    servings: float = Query(1.0, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the current user's recipes the inventory can cover right now, or that miss at most
+    max_missing ingredients, with what is missing and by how much.
+    """
+    return recipe_service.find_cookable(db, current_user, max_missing, servings, limit)
+
+@router.get("/recipes/search", response_model=schemas.RecipeSearchPage)
+def search_recipes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Full-text search over the current user's recipe names, descriptions and instructions,
+    most relevant first, with highlighted snippets. Pass next_cursor back as cursor for
+    the next page.
+    """
+    return recipe_service.search(db, current_user, q, limit, cursor)
+
+@router.get("/recipes/fuzzy", response_model=List[schemas.FuzzyRecipeMatch])
+def fuzzy_search_recipes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    min_similarity: float = Query(0.3, gt=0, le=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Find the current user's recipes whose names are most similar to q, tolerating
+    misspellings, best match first.
+    """
+    matches = fuzzy_search_service.search(db, Recipe, current_user, q, limit, min_similarity)
+    return [{"recipe": recipe, "similarity": similarity} for recipe, similarity in matches]
+
 @router.get("/recipes/{recipe_id}", response_model=schemas.Recipe)
 def get_recipe(
     recipe_id: int,
@@ -180,6 +314,19 @@ def generate_shopping_list_from_recipe(
         recipe_data.servings
     )
 
+@router.post("/shopping-list/purchase", response_model=schemas.ShoppingListPurchaseResponse)
+def purchase_shopping_list_items(
+    purchase: schemas.ShoppingListPurchase,
+    update_inventory: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Mark many shopping list items as purchased in one transaction for the current user.
+    Optionally add them to the inventory, merging items with the same name and unit.
+    """
+    return shopping_list_service.purchase_items(db, purchase.item_ids, current_user, update_inventory)
+
 @router.put("/shopping-list/{item_id}", response_model=schemas.ShoppingListItem)
 def update_shopping_list_item(
     item_id: int,
@@ -214,4 +361,50 @@ def mark_item_as_purchased(
     Mark a shopping list item as purchased for the current user.
     Optionally update the inventory with the purchased item.
     """
-    return shopping_list_service.mark_as_purchased(db, item_id, current_user, update_inventory) 
\ No newline at end of file
+    return shopping_list_service.mark_as_purchased(db, item_id, current_user, update_inventory) 
+
+# Export and import routes
+@router.get("/export")
+def export_data(
+    compress: bool = Query(False, description="Gzip the NDJSON stream"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream all of the current user's inventory, recipes and shopping list as NDJSON,
+    one {"type": ..., "data": {...}} record per line.
+    """
+    # The stream outlives the request's dependencies; it closes the session itself
+    chunks = export_service.stream_ndjson(db, current_user)
+    filename = "smart-meal-planner-export.ndjson"
+    media_type = "application/x-ndjson"
+    if compress:
+        chunks = services.gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/import", response_model=schemas.ImportSummary)
+async def import_data(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults from the Content-Type"),
+    kind: Optional[Literal["inventory", "recipe"]] = Query(
+        None, description="Type of CSV rows, or of NDJSON lines that are not {type, data} records"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Import inventory items and recipes from a CSV or NDJSON upload (e.g. a file from GET /export).
+    The body is parsed as it streams in and written in batches; invalid rows and batches the
+    database rejects are reported in the summary, not fatal.
+    """
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("csv" if "csv" in content_type else "ndjson" if "json" in content_type else None)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format")
+    if fmt == "csv" and kind is None:
+        raise HTTPException(status_code=400, detail="CSV imports need kind=inventory or kind=recipe")
+    return await imports.import_records(db, current_user, request.stream(), fmt, kind)
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import date
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Literal
+
+# Upper bound on items per batch request (a large grocery receipt is ~60 lines)
+MAX_BATCH_SIZE = 500
 
 class InventoryItemBase(BaseModel):
     name: str = Field(description="Name of the item")
@@ -27,6 +30,47 @@ class InventoryItem(InventoryItemBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class FuzzyInventoryMatch(BaseModel):
+    item: InventoryItem
+    similarity: float = Field(description="Trigram similarity of the item name to the query, 0 to 1")
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ExpirySummary(BaseModel):
+    expired: int
+    within_3_days: int
+    within_7_days: int = Field(description="Expiring in 4 to 7 days")
+    within_30_days: int = Field(description="Expiring in 8 to 30 days")
+    later: int
+    no_date: int
+
+class InventoryItemUpdate(BaseModel):
+    id: int = Field(description="ID of the item to update")
+    name: Optional[str] = Field(None, description="Name of the item")
+    quantity: Optional[float] = Field(None, description="Quantity of the item")
+    unit: Optional[str] = Field(None, description="Unit of measurement")
+    expiry_date: Optional[date] = Field(None, description="Expiry date of the item")
+
+class InventoryBatchCreate(BaseModel):
+    items: List[InventoryItemCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class InventoryBatchUpdate(BaseModel):
+    items: List[InventoryItemUpdate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class InventoryBatchDelete(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class InventoryBatchResult(BaseModel):
+    index: int = Field(description="Position of the entry in the request")
+    id: int
+    status: Literal["created", "updated", "deleted", "not_found"]
+    item: Optional[InventoryItem] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class InventoryBatchResponse(BaseModel):
+    results: List[InventoryBatchResult]
+
 class RecipeIngredient(BaseModel):
     name: str = Field(description="Name of the ingredient")
     quantity: float = Field(description="Quantity needed")
@@ -67,12 +111,51 @@ class Recipe(RecipeBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class FuzzyRecipeMatch(BaseModel):
+    recipe: Recipe
+    similarity: float = Field(description="Trigram similarity of the recipe name to the query, 0 to 1")
+
+    model_config = ConfigDict(from_attributes=True)
+
+class RecipeSearchHit(BaseModel):
+    recipe: Recipe
+    score: float = Field(description="Relevance, higher is better; BM25 on SQLite, ts_rank_cd on Postgres")
+    snippet: Optional[str] = Field(description="Best-matching passage with matches wrapped in <mark> tags")
+
+    model_config = ConfigDict(from_attributes=True)
+
+class RecipeSearchPage(BaseModel):
+    results: List[RecipeSearchHit]
+    next_cursor: Optional[str] = Field(description="Pass as cursor to get the next page; null on the last page")
+
 class RecipeMatch(BaseModel):
     recipe: Recipe
     match_percentage: float
 
     model_config = ConfigDict(from_attributes=True)
 
+class ExpiringRecipeMatch(BaseModel):
+    recipe: Recipe
+    score: float = Field(description="Urgency-weighted share of soon-to-expire stock the recipe uses")
+    expiring_ingredients: List[str]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class MissingIngredient(BaseModel):
+    name: str
+    unit: str
+    required: float
+    available: float
+    shortfall: float
+
+class CookableRecipe(BaseModel):
+    recipe: Recipe
+    missing_count: int = Field(description="Ingredients absent or short in the inventory")
+    coverage: float = Field(description="Share of the recipe's ingredients fully in stock")
+    missing: List[MissingIngredient]
+
+    model_config = ConfigDict(from_attributes=True)
+
 class ShoppingListItemBase(BaseModel):
     name: str = Field(description="Name of the item")
     quantity: float = Field(description="Quantity needed")
@@ -100,6 +183,18 @@ class ShoppingListItem(ShoppingListItemBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ShoppingListPurchase(BaseModel):
+    item_ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE, description="Shopping list items to check off")
+
+class ShoppingListPurchaseResult(BaseModel):
+    index: int = Field(description="Position of the id in the request")
+    id: int
+    status: Literal["purchased", "already_purchased", "not_found"]
+    item: Optional[ShoppingListItem] = None
+
+class ShoppingListPurchaseResponse(BaseModel):
+    results: List[ShoppingListPurchaseResult]
+
 class ShoppingListFromRecipe(BaseModel):
     recipe_id: int = Field(description="ID of the recipe to generate shopping list from")
     servings: float = Field(default=1.0, description="Number of servings to calculate quantities for")
@@ -117,4 +212,18 @@ class ShoppingListSummary(BaseModel):
             "pending_items": 3,
             "items": []
         }
-    }) 
\ No newline at end of file
+    }) 
+
+class ImportRowError(BaseModel):
+    line: int = Field(description="Line of the record in the upload (first line for multi-line CSV rows)")
+    error: str
+
+class ImportSummary(BaseModel):
+    format: Literal["csv", "ndjson"]
+    processed: int = Field(description="Records read")
+    imported: Dict[str, int] = Field(description="Records written, per type")
+    skipped: int = Field(description="Records of types that are not imported")
+    failed: int
+    batches: int = Field(description="Committed insert batches")
+    errors: List[ImportRowError] = Field(description="The first errors, in upload order")
+    errors_truncated: bool
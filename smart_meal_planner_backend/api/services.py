@@ -1,9 +1,327 @@
+import base64
+import heapq
+import json
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from sqlalchemy import (
+    and_, case, column, delete, func, insert, literal, literal_column, or_, select, table, tuple_, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from . import schemas
-from models import InventoryItem, Recipe, ShoppingListItem, User
+from .cookability import CookabilityIndex, ingredient_key
+from .ingredients import UNITS, canonical_unit, normalize_name
+from .trigrams import TrigramIndex
+from config import get_settings
+from models import (
+    SHOPPING_LIST_PENDING, Ingredient, InventoryItem, Recipe, RecipeCookability, RecipeIngredient,
+    ShoppingListItem, User
+)
 from fastapi import HTTPException, status
-from datetime import datetime, UTC
-from typing import List, Optional
+from datetime import date, datetime, timedelta, UTC
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+settings = get_settings()
+
+def _insert(db: Session, model):
+    """INSERT with ON CONFLICT support for the session's dialect."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+@contextmanager
+def _conflict_as_409(db: Session, detail: str):
+    """Run the block and commit, turning a collision on the per-user ingredient and unit key into a 409."""
+    try:
+        yield
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+# Words of a search query; anything else (quotes, operators) is dropped before it reaches MATCH or to_tsquery
+SEARCH_TERM = re.compile(r"\w+")
+# BM25 weights of the recipes_fts columns: name, description, instructions, owner
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 0.0)
+SNIPPET_OPTIONS = "StartSel=<mark>, StopSel=</mark>"
+
+def _encode_cursor(row_id: int, rank: float) -> str:
+    """Opaque keyset cursor; ``rank`` survives the JSON round trip exactly"""
+    return base64.urlsafe_b64encode(json.dumps([rank, row_id]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _unit_factor(unit):
+    """SQL factor from a canonical unit to its base unit; 1 for units without a conversion."""
+    return case({name: factor for name, (_, factor) in UNITS.items()}, value=unit, else_=1.0)
+
+def _converted(existing, excluded):
+    """``excluded.quantity`` in the unit of the ``existing`` row (same base unit)."""
+    return excluded.quantity * _unit_factor(excluded.unit) / _unit_factor(existing.unit)
+
+def _inventory_upsert(db: Session):
+    """
+    INSERT into inventory that adds to the existing item of the same ingredient and base
+    unit (converted to that item's unit), keeping the earlier expiry date.
+    """
+    stmt = _insert(db, InventoryItem)
+    return stmt.on_conflict_do_update(
+        index_elements=[InventoryItem.user_id, InventoryItem.ingredient_id, InventoryItem.base_unit],
+        set_={
+            "quantity": InventoryItem.quantity + _converted(InventoryItem, stmt.excluded),
+            "expiry_date": case(
+                (stmt.excluded.expiry_date < InventoryItem.expiry_date, stmt.excluded.expiry_date),
+                else_=func.coalesce(InventoryItem.expiry_date, stmt.excluded.expiry_date)
+            ),
+            "updated_at": datetime.now(UTC).date(),
+        }
+    )
+
+def _shopping_list_upsert(db: Session):
+    """
+    INSERT into the shopping list that adds to the pending item of the same ingredient and
+    base unit (converted to that item's unit).
+    """
+    stmt = _insert(db, ShoppingListItem)
+    return stmt.on_conflict_do_update(
+        index_elements=[ShoppingListItem.user_id, ShoppingListItem.ingredient_id, ShoppingListItem.base_unit],
+        index_where=SHOPPING_LIST_PENDING,
+        set_={
+            "quantity": ShoppingListItem.quantity + _converted(ShoppingListItem, stmt.excluded),
+            "updated_at": datetime.now(UTC).date(),
+        }
+    )
+
+class IngredientService:
+    @staticmethod
+    def resolve(db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """Catalog ids by normalized name, adding names not seen before. Does not commit."""
+        keys = {normalize_name(name) for name in names}
+        if not keys:
+            return {}
+        lookup = select(Ingredient.name, Ingredient.id).where(Ingredient.name.in_(keys))
+        ids = dict(db.execute(lookup).all())
+        if len(ids) < len(keys):
+            db.execute(
+                _insert(db, Ingredient).on_conflict_do_nothing(index_elements=[Ingredient.name]),
+                [{"name": key} for key in keys - ids.keys()]
+            )
+            ids = dict(db.execute(lookup).all())
+        return ids
+    
+    @staticmethod
+    def canonicalize(db: Session, rows: List[dict]) -> List[dict]:
+        """Set ``ingredient_id`` and ``base_unit`` on rows with a name and unit, and canonicalize the unit"""
+        ids = IngredientService.resolve(db, [row["name"] for row in rows])
+        for row in rows:
+            row["unit"], row["base_unit"], _ = canonical_unit(row["unit"])
+            row["ingredient_id"] = ids[normalize_name(row["name"])]
+        return rows
+
+class CookabilityService:
+    """
+    Keeps the ``recipe_cookability`` view current. An inventory write recomputes only the
+    recipes that use the changed (ingredient_id, base_unit) ingredients, found through
+    ``recipe_ingredients``. Reads refresh rows that are missing (recipes inserted in bulk)
+    or stale (counted stock has expired) first. Only ``refresh_stale`` commits.
+    """
+    @staticmethod
+    def refresh_recipes(db: Session, user_id: int, recipe_ids: Iterable[int], recipes_changed: bool = True) -> None:
+        """Rewrite the cookability (and, if the recipes changed, the ingredient rows) of the given recipes"""
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return
+        today = datetime.now(UTC).date()
+        index = CookabilityIndex(db.execute(select(Recipe.id, Recipe.ingredients).where(Recipe.id.in_(recipe_ids))))
+        keys = list(index.ingredient_ids)
+        catalog_ids = IngredientService.resolve(db, [name for name, _ in keys])
+        stock = db.execute(
+            select(InventoryItem.name, InventoryItem.unit, InventoryItem.quantity, InventoryItem.expiry_date).where(
+                InventoryItem.user_id == user_id,
+                InventoryItem.ingredient_id.in_(catalog_ids.values()),
+                or_(InventoryItem.expiry_date.is_(None), InventoryItem.expiry_date >= today)
+            )
+        ).all()
+        expires: Dict[int, date] = {}
+        for row in stock:
+            ingredient_id = index.ingredient_ids.get(ingredient_key(row.name, row.unit)[0])
+            if ingredient_id is not None and row.expiry_date is not None and row.quantity > 0:
+                expires[ingredient_id] = min(row.expiry_date, expires.get(ingredient_id, row.expiry_date))
+        entries = index.evaluate((row.name, row.unit, row.quantity) for row in stock)
+        
+        db.execute(delete(RecipeCookability).where(RecipeCookability.recipe_id.in_(recipe_ids)))
+        if recipes_changed:
+            db.execute(delete(RecipeIngredient).where(RecipeIngredient.recipe_id.in_(recipe_ids)))
+            ingredient_rows = []
+            for recipe_id, quantities in zip(index.recipe_ids, index.quantities):
+                for i, quantity in quantities.items():
+                    name, base_unit = keys[i]
+                    ingredient_rows.append({
+                        "recipe_id": recipe_id,
+                        "ingredient_id": catalog_ids[name],
+                        "base_unit": base_unit,
+                        "quantity": quantity,
+                        "user_id": user_id,
+                    })
+            if ingredient_rows:
+                db.execute(insert(RecipeIngredient), ingredient_rows)
+        if entries:
+            db.execute(insert(RecipeCookability), [
+                {**entry, "expires_on": min((expires[i] for i in quantities if i in expires), default=None),
+                 "user_id": user_id}
+                for entry, quantities in zip(entries, index.quantities)
+            ])
+    
+    @staticmethod
+    def ingredients_changed(db: Session, user_id: int, keys: Iterable[Tuple[int, str]]) -> None:
+        """Recompute the user's recipes that use any of the (ingredient_id, base_unit) ingredients"""
+        keys = list(set(keys))
+        if not keys:
+            return
+        recipe_ids = db.scalars(
+            select(RecipeIngredient.recipe_id).distinct().where(
+                RecipeIngredient.user_id == user_id,
+                tuple_(RecipeIngredient.ingredient_id, RecipeIngredient.base_unit).in_(keys)
+            )
+        ).all()
+        CookabilityService.refresh_recipes(db, user_id, recipe_ids, recipes_changed=False)
+    
+    @staticmethod
+    def refresh_stale(db: Session, user: User) -> None:
+        """Compute rows for recipes that have none and recompute those whose stock has expired"""
+        stale = db.scalars(
+            select(Recipe.id)
+            .outerjoin(RecipeCookability, RecipeCookability.recipe_id == Recipe.id)
+            .where(
+                Recipe.user_id == user.id,
+                or_(RecipeCookability.recipe_id.is_(None), RecipeCookability.expires_on < datetime.now(UTC).date())
+            )
+        ).all()
+        if stale:
+            CookabilityService.refresh_recipes(db, user.id, stale)
+            db.commit()
+    
+    @staticmethod
+    def forget_recipe(db: Session, recipe_id: int) -> None:
+        """Drop a recipe's rows, for databases that do not enforce ON DELETE CASCADE"""
+        db.execute(delete(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe_id))
+        db.execute(delete(RecipeCookability).where(RecipeCookability.recipe_id == recipe_id))
+
+class _NameIndex:
+    """One user's names in one table, as of ``last_id`` (the highest row id loaded)."""
+    def __init__(self):
+        self.trigrams = TrigramIndex()
+        self.last_id = 0
+        self.built_at = time.monotonic()
+
+# (table name, user id) -> _NameIndex, least recently searched first; per worker process
+_name_indexes: "OrderedDict[Tuple[str, int], _NameIndex]" = OrderedDict()
+_name_indexes_lock = threading.Lock()
+
+class FuzzySearchService:
+    """
+    Names most similar to a misspelled query, by trigram similarity. Postgres ranks them
+    in SQL with pg_trgm. Elsewhere each worker keeps a TrigramIndex per user and table:
+    built on the first search, extended with rows inserted since (any worker) on each
+    search, and updated by this worker's renames and deletes. Hits are re-read from the
+    table, so a rename or delete made by another worker never returns a stale name; such
+    rows are re-indexed, and the whole index is rebuilt after FUZZY_INDEX_TTL_SECONDS.
+    """
+    @staticmethod
+    def _index(db: Session, model, user_id: int) -> _NameIndex:
+        key = (model.__tablename__, user_id)
+        with _name_indexes_lock:
+            entry = _name_indexes.get(key)
+            if entry is not None and time.monotonic() - entry.built_at > settings.FUZZY_INDEX_TTL_SECONDS:
+                entry = None
+            last_id = entry.last_id if entry is not None else 0
+        # Loaded outside the lock; adding a name twice is harmless
+        rows = db.execute(
+            select(model.id, model.name).where(model.user_id == user_id, model.id > last_id).order_by(model.id)
+        ).all()
+        with _name_indexes_lock:
+            if entry is None:
+                entry = _NameIndex()
+            for row_id, name in rows:
+                if name is not None:
+                    entry.trigrams.add(row_id, name)
+            if rows:
+                entry.last_id = max(entry.last_id, rows[-1].id)
+            _name_indexes[key] = entry
+            _name_indexes.move_to_end(key)
+            while len(_name_indexes) > settings.FUZZY_INDEX_MAX_ENTRIES:
+                _name_indexes.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def clear() -> None:
+        """Drop every index this worker holds, e.g. after the database was replaced"""
+        with _name_indexes_lock:
+            _name_indexes.clear()
+
+    @staticmethod
+    def renamed(model, user_id: int, rows: Iterable[Tuple[int, str]]) -> None:
+        """Re-index committed (id, name) rows of an index this worker holds"""
+        with _name_indexes_lock:
+            entry = _name_indexes.get((model.__tablename__, user_id))
+            if entry is not None:
+                for row_id, name in rows:
+                    if name is None:
+                        entry.trigrams.remove(row_id)
+                    elif row_id <= entry.last_id:
+                        entry.trigrams.add(row_id, name)
+
+    @staticmethod
+    def forget(model, user_id: int, ids: Iterable[int]) -> None:
+        """Drop committed deletes from an index this worker holds"""
+        with _name_indexes_lock:
+            entry = _name_indexes.get((model.__tablename__, user_id))
+            if entry is not None:
+                ids = set(ids)
+                for row_id in ids:
+                    entry.trigrams.remove(row_id)
+                if entry.last_id in ids:
+                    # SQLite hands the highest rowid out again once it is deleted
+                    entry.last_id = max(entry.trigrams.names, default=0)
+
+    @staticmethod
+    def search(db: Session, model, user: User, query: str, limit: int = 10, min_similarity: float = 0.3):
+        """(row, similarity) of the user's ``limit`` rows whose names are most similar to ``query``, best first"""
+        if db.get_bind().dialect.name == "postgresql":
+            # The GIN gin_trgm_ops index serves ``%``, which filters at pg_trgm.similarity_threshold
+            db.execute(select(func.set_config("pg_trgm.similarity_threshold", str(min_similarity), True)))
+            score = func.similarity(model.name, query)
+            return db.execute(
+                select(model, score)
+                .where(model.user_id == user.id, model.name.op("%")(query))
+                .order_by(score.desc(), model.id)
+                .limit(limit)
+            ).tuples().all()
+
+        entry = FuzzySearchService._index(db, model, user.id)
+        while True:
+            with _name_indexes_lock:
+                hits = entry.trigrams.search(query, limit, min_similarity)
+            rows = {row.id: row for row in db.scalars(select(model).where(model.id.in_([hit for hit, _ in hits])))}
+            stale = [hit for hit, _ in hits if hit not in rows or rows[hit].name != entry.trigrams.names.get(hit)]
+            if not stale:
+                return [(rows[hit], score) for hit, score in hits]
+            # Renamed or deleted by another worker
+            with _name_indexes_lock:
+                for hit in stale:
+                    if hit in rows and rows[hit].name is not None:
+                        entry.trigrams.add(hit, rows[hit].name)
+                    else:
+                        entry.trigrams.remove(hit)
 
 class InventoryService:
     @staticmethod
@@ -20,10 +338,59 @@ class InventoryService:
             raise HTTPException(status_code=404, detail="Item not found")
         return item
     
+    @staticmethod
+    def get_expiring(
+        db: Session,
+        user: User,
+        within_days: int = 7,
+        include_expired: bool = True,
+        limit: int = 100
+    ):
+        """Items expiring in the next ``within_days`` days, soonest first (uses the (user_id, expiry_date) index)"""
+        today = datetime.now(UTC).date()
+        query = db.query(InventoryItem).filter(
+            InventoryItem.user_id == user.id,
+            InventoryItem.expiry_date <= today + timedelta(days=within_days)
+        )
+        if not include_expired:
+            query = query.filter(InventoryItem.expiry_date >= today)
+        return query.order_by(InventoryItem.expiry_date, InventoryItem.id).limit(limit).all()
+    
+    @staticmethod
+    def get_expiry_summary(db: Session, user: User):
+        """Count the user's items per expiry bucket in one aggregate query"""
+        today = datetime.now(UTC).date()
+        bucket = case(
+            (InventoryItem.expiry_date.is_(None), literal("no_date")),
+            (InventoryItem.expiry_date < today, literal("expired")),
+            (InventoryItem.expiry_date <= today + timedelta(days=3), literal("within_3_days")),
+            (InventoryItem.expiry_date <= today + timedelta(days=7), literal("within_7_days")),
+            (InventoryItem.expiry_date <= today + timedelta(days=30), literal("within_30_days")),
+            else_=literal("later")
+        ).label("bucket")
+        counts = dict(
+            db.execute(select(bucket, func.count()).where(InventoryItem.user_id == user.id).group_by(bucket)).all()
+        )
+        return {name: counts.get(name, 0) for name in schemas.ExpirySummary.model_fields}
+    
+    @staticmethod
+    def add_quantity(db: Session, user: User, name: str, quantity: float, unit: str, expiry_date=None):
+        """
+        Add ``quantity`` to the user's item of the same ingredient and base unit, creating it
+        if missing, in one INSERT ... ON CONFLICT statement; keeps the earlier expiry date.
+        Does not commit.
+        """
+        [row] = IngredientService.canonicalize(
+            db, [{"name": name, "quantity": quantity, "unit": unit, "expiry_date": expiry_date, "user_id": user.id}]
+        )
+        stmt = _inventory_upsert(db).values(**row).returning(InventoryItem)
+        return db.scalars(stmt, execution_options={"populate_existing": True}).one()
+    
     @staticmethod
     def create_item(db: Session, item: schemas.InventoryItemCreate, user: User):
-        db_item = InventoryItem(**item.model_dump(), user_id=user.id)
-        db.add(db_item)
+        """Create an item, or add to the quantity of an existing item of the same ingredient and unit dimension"""
+        db_item = InventoryService.add_quantity(db, user, **item.model_dump())
+        CookabilityService.ingredients_changed(db, user.id, [(db_item.ingredient_id, db_item.base_unit)])
         db.commit()
         db.refresh(db_item)
         return db_item
@@ -31,22 +398,148 @@ class InventoryService:
     @staticmethod
     def update_item(db: Session, item_id: int, item: schemas.InventoryItemCreate, user: User):
         db_item = InventoryService.get_item(db, item_id, user)
+        old_key = (db_item.ingredient_id, db_item.base_unit)
         update_data = item.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             setattr(db_item, field, value)
+        [identity] = IngredientService.canonicalize(db, [{"name": db_item.name, "unit": db_item.unit}])
+        for field, value in identity.items():
+            setattr(db_item, field, value)
         
         db_item.updated_at = datetime.now(UTC).date()
-        db.commit()
+        with _conflict_as_409(db, "An inventory item with this name and unit already exists"):
+            db.flush()
+            CookabilityService.ingredients_changed(db, user.id, [old_key, (db_item.ingredient_id, db_item.base_unit)])
         db.refresh(db_item)
+        FuzzySearchService.renamed(InventoryItem, user.id, [(db_item.id, db_item.name)])
         return db_item
     
     @staticmethod
     def delete_item(db: Session, item_id: int, user: User):
         db_item = InventoryService.get_item(db, item_id, user)
         db.delete(db_item)
+        db.flush()
+        CookabilityService.ingredients_changed(db, user.id, [(db_item.ingredient_id, db_item.base_unit)])
         db.commit()
+        FuzzySearchService.forget(InventoryItem, user.id, [item_id])
         return {"message": "Item deleted successfully"}
+    
+    @staticmethod
+    def _fold(
+        db: Session, items: List[schemas.InventoryItemCreate], user: User
+    ) -> Tuple[List[Tuple[int, str]], Dict[Tuple[int, str], dict]]:
+        """
+        Each item's (ingredient_id, base_unit) key, and one upsert row per key: quantities
+        summed in the first item's unit, earliest expiry date kept
+        """
+        keys, rows = [], {}
+        for item in IngredientService.canonicalize(db, [{**item.model_dump(), "user_id": user.id} for item in items]):
+            key = (item["ingredient_id"], item["base_unit"])
+            keys.append(key)
+            row = rows.get(key)
+            if row is None:
+                rows[key] = item
+                continue
+            row["quantity"] += item["quantity"] * canonical_unit(item["unit"])[2] / canonical_unit(row["unit"])[2]
+            if item["expiry_date"] and (row["expiry_date"] is None or item["expiry_date"] < row["expiry_date"]):
+                row["expiry_date"] = item["expiry_date"]
+        return keys, rows
+    
+    @staticmethod
+    def import_items(db: Session, items: List[schemas.InventoryItemCreate], user: User) -> int:
+        """Restock a batch of items with one executemany upsert and commit it"""
+        _, rows = InventoryService._fold(db, items, user)
+        db.execute(_inventory_upsert(db), list(rows.values()))
+        CookabilityService.ingredients_changed(db, user.id, rows)
+        db.commit()
+        return len(items)
+    
+    @staticmethod
+    def create_items(db: Session, items: List[schemas.InventoryItemCreate], user: User):
+        """Create or restock many items with one executemany upsert and one commit"""
+        keys, rows = InventoryService._fold(db, items, user)
+        same_keys = (
+            InventoryItem.user_id == user.id,
+            tuple_(InventoryItem.ingredient_id, InventoryItem.base_unit).in_(list(rows))
+        )
+        existing = set(
+            db.execute(select(InventoryItem.ingredient_id, InventoryItem.base_unit).where(*same_keys)).tuples()
+        )
+        # No RETURNING, so the driver runs it as a true executemany
+        db.execute(_inventory_upsert(db), list(rows.values()))
+        CookabilityService.ingredients_changed(db, user.id, rows)
+        db.commit()
+        
+        by_key = {
+            (item.ingredient_id, item.base_unit): item for item in db.scalars(select(InventoryItem).where(*same_keys))
+        }
+        return {"results": [
+            {
+                "index": index,
+                "id": by_key[key].id,
+                "status": "updated" if key in existing else "created",
+                "item": by_key[key],
+            }
+            for index, key in enumerate(keys)
+        ]}
+    
+    @staticmethod
+    def update_items(db: Session, items: List[schemas.InventoryItemUpdate], user: User):
+        """Apply partial updates to many items with one executemany UPDATE and one commit"""
+        owned = {
+            row.id: row for row in db.execute(
+                select(
+                    InventoryItem.id, InventoryItem.name, InventoryItem.unit,
+                    InventoryItem.ingredient_id, InventoryItem.base_unit
+                ).where(
+                    InventoryItem.user_id == user.id,
+                    InventoryItem.id.in_([item.id for item in items])
+                )
+            )
+        }
+        today = datetime.now(UTC).date()
+        rows = [{**item.model_dump(exclude_unset=True), "updated_at": today} for item in items if item.id in owned]
+        renamed = [row for row in rows if "name" in row or "unit" in row]
+        identities = IngredientService.canonicalize(db, [
+            {"name": row.get("name", owned[row["id"]].name), "unit": row.get("unit", owned[row["id"]].unit)}
+            for row in renamed
+        ])
+        for row, identity in zip(renamed, identities):
+            row.update(identity)
+        with _conflict_as_409(db, "An inventory item with this name and unit already exists"):
+            if rows:
+                # ORM bulk UPDATE by primary key: executemany per set of changed columns
+                db.execute(update(InventoryItem), rows)
+                changed = [(old.ingredient_id, old.base_unit) for old in owned.values()] + [
+                    (identity["ingredient_id"], identity["base_unit"]) for identity in identities
+                ]
+                CookabilityService.ingredients_changed(db, user.id, changed)
+        FuzzySearchService.renamed(InventoryItem, user.id, [(row["id"], row["name"]) for row in rows if "name" in row])
+        
+        updated = {item.id: item for item in db.scalars(select(InventoryItem).where(InventoryItem.id.in_(owned)))}
+        return {"results": [
+            {"index": index, "id": item.id, "status": "updated", "item": updated[item.id]}
+            if item.id in owned else {"index": index, "id": item.id, "status": "not_found"}
+            for index, item in enumerate(items)
+        ]}
+    
+    @staticmethod
+    def delete_items(db: Session, ids: List[int], user: User):
+        """Delete many items with one statement and one commit"""
+        deleted = db.execute(
+            delete(InventoryItem)
+            .where(InventoryItem.user_id == user.id, InventoryItem.id.in_(ids))
+            .returning(InventoryItem.id, InventoryItem.ingredient_id, InventoryItem.base_unit)
+        ).all()
+        CookabilityService.ingredients_changed(db, user.id, [(row.ingredient_id, row.base_unit) for row in deleted])
+        db.commit()
+        deleted = {row.id for row in deleted}
+        FuzzySearchService.forget(InventoryItem, user.id, deleted)
+        return {"results": [
+            {"index": index, "id": item_id, "status": "deleted" if item_id in deleted else "not_found"}
+            for index, item_id in enumerate(ids)
+        ]}
 
 class RecipeService:
     @staticmethod
@@ -70,10 +563,22 @@ class RecipeService:
             user_id=user.id
         )
         db.add(db_recipe)
+        db.flush()
+        CookabilityService.refresh_recipes(db, user.id, [db_recipe.id])
         db.commit()
         db.refresh(db_recipe)
         return db_recipe
     
+    @staticmethod
+    def import_recipes(db: Session, recipes: List[schemas.RecipeCreate], user: User) -> int:
+        """
+        Insert a batch of recipes with one executemany INSERT and commit it. Their
+        cookability is computed on the user's next read (CookabilityService.refresh_stale).
+        """
+        db.execute(insert(Recipe), [{**recipe.model_dump(), "user_id": user.id} for recipe in recipes])
+        db.commit()
+        return len(recipes)
+    
     @staticmethod
     def update_recipe(db: Session, recipe_id: int, recipe: schemas.RecipeCreate, user: User):
         db_recipe = RecipeService.get_recipe(db, recipe_id, user)
@@ -82,17 +587,70 @@ class RecipeService:
             setattr(db_recipe, field, value)
         
         db_recipe.updated_at = datetime.now(UTC).date()
+        db.flush()
+        CookabilityService.refresh_recipes(db, user.id, [db_recipe.id])
         db.commit()
         db.refresh(db_recipe)
+        FuzzySearchService.renamed(Recipe, user.id, [(db_recipe.id, db_recipe.name)])
         return db_recipe
     
     @staticmethod
     def delete_recipe(db: Session, recipe_id: int, user: User):
         db_recipe = RecipeService.get_recipe(db, recipe_id, user)
+        CookabilityService.forget_recipe(db, recipe_id)
+        # Shopping-list items generated from the recipe outlive it
+        db.execute(
+            update(ShoppingListItem).where(ShoppingListItem.recipe_id == recipe_id).values(recipe_id=None)
+        )
         db.delete(db_recipe)
         db.commit()
+        FuzzySearchService.forget(Recipe, user.id, [recipe_id])
         return {"message": "Recipe deleted successfully"}
     
+    @staticmethod
+    def rank_by_expiring(db: Session, user: User, within_days: int = 7, limit: int = 10):
+        """
+        Rank the user's recipes by how much soon-to-expire stock they use up. Each ingredient
+        matching an unexpired item scores urgency (1 / (1 + days left)) times the share of the
+        item it consumes (1 when the units do not convert); the top ``limit`` are kept with a heap.
+        """
+        today = datetime.now(UTC).date()
+        expiring: Dict[str, List[InventoryItem]] = {}
+        for item in InventoryService.get_expiring(db, user, within_days, include_expired=False, limit=None):
+            expiring.setdefault(normalize_name(item.name), []).append(item)
+        if not expiring:
+            return []
+        
+        def score(ingredients) -> Tuple[float, List[str]]:
+            total, uses = 0.0, []
+            for ingredient in ingredients:
+                best = 0.0
+                _, base, factor = canonical_unit(ingredient["unit"])
+                for item in expiring.get(normalize_name(ingredient["name"]), ()):
+                    share = 1.0
+                    _, item_base, item_factor = canonical_unit(item.unit)
+                    if base == item_base and item.quantity:
+                        share = min(1.0, ingredient["quantity"] * factor / (item.quantity * item_factor))
+                    best = max(best, share / (1 + (item.expiry_date - today).days))
+                if best:
+                    total += best
+                    uses.append(ingredient["name"])
+            return total, uses
+        
+        # Core rows: only the top recipes are loaded as entities
+        rows = db.execute(select(Recipe.id, Recipe.ingredients).where(Recipe.user_id == user.id))
+        top = heapq.nlargest(
+            limit,
+            ((*score(row.ingredients), row.id) for row in rows),
+            key=lambda entry: (entry[0], -entry[2])
+        )
+        top = [entry for entry in top if entry[0] > 0]
+        recipes = {recipe.id: recipe for recipe in db.query(Recipe).filter(Recipe.id.in_([e[2] for e in top]))}
+        return [
+            {"recipe": recipes[recipe_id], "score": total, "expiring_ingredients": uses}
+            for total, uses, recipe_id in top
+        ]
+    
     @staticmethod
     def find_recipes_by_ingredients(db: Session, ingredients: List[str], user: User, limit: int = 10):
         """Find recipes that can be made with given ingredients"""
@@ -100,8 +658,8 @@ class RecipeService:
         matching_recipes = []
         
         for recipe in recipes:
-            recipe_ingredients = {ing["name"].lower() for ing in recipe.ingredients}
-            available_ingredients = {ing.lower() for ing in ingredients}
+            recipe_ingredients = {normalize_name(ing["name"]) for ing in recipe.ingredients}
+            available_ingredients = {normalize_name(ing) for ing in ingredients}
             
             # Calculate how many ingredients match
             matching_count = len(recipe_ingredients.intersection(available_ingredients))
@@ -118,6 +676,102 @@ class RecipeService:
         matching_recipes.sort(key=lambda x: x["match_percentage"], reverse=True)
         return matching_recipes[:limit]
 
+    @staticmethod
+    def find_cookable(db: Session, user: User, max_missing: int = 0, servings: float = 1.0, limit: int = 20):
+        """
+        Recipes the user's unexpired inventory covers, in quantity, for ``servings``, or
+        covers all but ``max_missing`` ingredients of; each lists what is missing. One
+        serving is read from the recipe_cookability view; other amounts are computed.
+        """
+        if servings == 1:
+            CookabilityService.refresh_stale(db, user)
+            rows = db.execute(
+                select(Recipe, RecipeCookability)
+                .join(RecipeCookability, RecipeCookability.recipe_id == Recipe.id)
+                .where(RecipeCookability.user_id == user.id, RecipeCookability.missing_count <= max_missing)
+                .order_by(
+                    RecipeCookability.missing_count, RecipeCookability.coverage.desc(), RecipeCookability.recipe_id
+                )
+                .limit(limit)
+            )
+            return [
+                {
+                    "recipe": recipe,
+                    "missing_count": view.missing_count,
+                    "coverage": view.coverage,
+                    "missing": view.missing,
+                }
+                for recipe, view in rows
+            ]
+        
+        index = CookabilityIndex(db.execute(select(Recipe.id, Recipe.ingredients).where(Recipe.user_id == user.id)))
+        items = db.execute(
+            select(InventoryItem.name, InventoryItem.unit, InventoryItem.quantity).where(
+                InventoryItem.user_id == user.id,
+                or_(InventoryItem.expiry_date.is_(None), InventoryItem.expiry_date >= datetime.now(UTC).date())
+            )
+        )
+        matches = index.match(items, max_missing, servings, limit)
+        recipes = {
+            recipe.id: recipe
+            for recipe in db.query(Recipe).filter(Recipe.id.in_([match["recipe_id"] for match in matches]))
+        }
+        return [{"recipe": recipes[match.pop("recipe_id")], **match} for match in matches]
+
+    @staticmethod
+    def search(db: Session, user: User, query: str, limit: int = 20, cursor: Optional[str] = None):
+        """
+        Full-text search over the user's recipe names, descriptions and steps, best match
+        first, with a highlighted snippet per hit. The last query word also matches as a
+        prefix. Pages are keyset-paginated on (rank, id); ``next_cursor`` continues after
+        the last hit. SQLite ranks with FTS5 BM25, Postgres with ts_rank_cd, both weighting
+        the name over the description over the steps (see models.SEARCH_DDL).
+        """
+        terms = SEARCH_TERM.findall(query.lower())
+        if not terms:
+            return {"results": [], "next_cursor": None}
+        after = _decode_cursor(cursor) if cursor else None
+        
+        if db.get_bind().dialect.name == "postgresql":
+            tsquery = func.to_tsquery("english", " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+            vector = literal_column("recipes.search_vector")
+            # Negated so both backends page in ascending order
+            order, row_id = -func.ts_rank_cd(vector, tsquery), Recipe.id
+            hits = select(row_id, order).where(Recipe.user_id == user.id, vector.op("@@")(tsquery))
+            steps = func.json_array_elements_text(Recipe.instructions).table_valued("value")
+            document = func.concat_ws(
+                " / ", Recipe.name, Recipe.description,
+                select(func.string_agg(steps.c.value, " / ")).scalar_subquery()
+            )
+            snippet = func.ts_headline("english", document, tsquery, f"{SNIPPET_OPTIONS}, MaxWords=16, MinWords=6")
+            snippets = select(Recipe.id, snippet)
+        else:
+            fts = table("recipes_fts", column("rowid"))
+            match = literal_column("recipes_fts").op("MATCH")
+            # Limited to the text columns, so the terms never match the owner id
+            phrase = "{name description instructions}: (" + " AND ".join(f'"{term}"' for term in terms) + "*)"
+            order, row_id = func.bm25(literal_column("recipes_fts"), *SEARCH_WEIGHTS), fts.c.rowid
+            hits = select(row_id, order).where(match(f'owner:"{user.id}" AND {phrase}'))
+            snippet = func.snippet(literal_column("recipes_fts"), -1, "<mark>", "</mark>", "…", 16)
+            snippets = select(row_id, snippet).where(match(phrase))
+        
+        if after is not None:
+            hits = hits.where(or_(order > after[0], and_(order == after[0], row_id > after[1])))
+        page = db.execute(hits.order_by(order, row_id).limit(limit + 1)).all()
+        more = len(page) > limit
+        page = page[:limit]
+        # Snippets are built for this page only
+        ids = [hit_id for hit_id, _ in page]
+        highlighted = dict(db.execute(snippets.where(row_id.in_(ids))).all()) if ids else {}
+        recipes = {recipe.id: recipe for recipe in db.scalars(select(Recipe).where(Recipe.id.in_(ids)))}
+        return {
+            "results": [
+                {"recipe": recipes[hit_id], "score": -rank, "snippet": highlighted.get(hit_id)}
+                for hit_id, rank in page
+            ],
+            "next_cursor": _encode_cursor(*page[-1]) if more else None,
+        }
+
 class ShoppingListService:
     @staticmethod
     def get_items(db: Session, user: User, skip: int = 0, limit: int = 100):
@@ -133,10 +787,32 @@ class ShoppingListService:
             raise HTTPException(status_code=404, detail="Shopping list item not found")
         return item
     
+    @staticmethod
+    def add_quantity(
+        db: Session,
+        user: User,
+        name: str,
+        quantity: float,
+        unit: str,
+        recipe_id: Optional[int] = None,
+        purchased: bool = False
+    ):
+        """
+        Add ``quantity`` to the user's pending item of the same ingredient and base unit
+        (converted to that item's unit), creating it if missing, in one INSERT ... ON CONFLICT
+        statement. Does not commit.
+        """
+        [row] = IngredientService.canonicalize(db, [{
+            "name": name, "quantity": quantity, "unit": unit, "recipe_id": recipe_id, "purchased": purchased,
+            "user_id": user.id,
+        }])
+        stmt = _shopping_list_upsert(db).values(**row).returning(ShoppingListItem)
+        return db.scalars(stmt, execution_options={"populate_existing": True}).one()
+    
     @staticmethod
     def create_item(db: Session, item: schemas.ShoppingListItemCreate, user: User):
-        db_item = ShoppingListItem(**item.model_dump(), user_id=user.id)
-        db.add(db_item)
+        """Create an item, or add to the quantity of the pending item of the same ingredient and unit dimension"""
+        db_item = ShoppingListService.add_quantity(db, user, **item.model_dump())
         db.commit()
         db.refresh(db_item)
         return db_item
@@ -148,9 +824,13 @@ class ShoppingListService:
         
         for field, value in update_data.items():
             setattr(db_item, field, value)
+        [identity] = IngredientService.canonicalize(db, [{"name": db_item.name, "unit": db_item.unit}])
+        for field, value in identity.items():
+            setattr(db_item, field, value)
         
         db_item.updated_at = datetime.now(UTC).date()
-        db.commit()
+        with _conflict_as_409(db, "A pending shopping list item with this name and unit already exists"):
+            db.flush()
         db.refresh(db_item)
         return db_item
     
@@ -163,79 +843,125 @@ class ShoppingListService:
     
     @staticmethod
     def mark_as_purchased(db: Session, item_id: int, user: User, update_inventory: bool = True):
-        db_item = ShoppingListService.get_item(db, item_id, user)
-        db_item.purchased = True
-        db_item.updated_at = datetime.now(UTC).date()
+        # Conditional UPDATE: of two concurrent purchases only one flips the flag and restocks
+        db_item = db.scalars(
+            update(ShoppingListItem)
+            .where(
+                ShoppingListItem.id == item_id,
+                ShoppingListItem.user_id == user.id,
+                ShoppingListItem.purchased == False
+            )
+            .values(purchased=True, updated_at=datetime.now(UTC).date())
+            .returning(ShoppingListItem),
+            execution_options={"populate_existing": True}
+        ).one_or_none()
+        if db_item is None:
+            # Unknown (404) or already purchased, in which case the inventory was already updated
+            return ShoppingListService.get_item(db, item_id, user)
         
         if update_inventory:
-            # Check if item exists in inventory
-            inventory_item = db.query(InventoryItem).filter(
-                InventoryItem.name == db_item.name,
-                InventoryItem.unit == db_item.unit,
-                InventoryItem.user_id == user.id
-            ).first()
-            
-            if inventory_item:
-                # Update existing inventory item
-                inventory_item.quantity += db_item.quantity
-                inventory_item.updated_at = datetime.now(UTC).date()
-            else:
-                # Create new inventory item
-                inventory_item = InventoryItem(
-                    name=db_item.name,
-                    quantity=db_item.quantity,
-                    unit=db_item.unit,
-                    user_id=user.id
-                )
-                db.add(inventory_item)
+            InventoryService.add_quantity(db, user, db_item.name, db_item.quantity, db_item.unit)
+            CookabilityService.ingredients_changed(db, user.id, [(db_item.ingredient_id, db_item.base_unit)])
         
         db.commit()
         db.refresh(db_item)
         return db_item
     
+    @staticmethod
+    def purchase_items(db: Session, item_ids: List[int], user: User, update_inventory: bool = True):
+        """
+        Check off many items in one transaction: one UPDATE for the shopping list and one
+        executemany upsert for the inventory.
+        """
+        unique_ids = list(dict.fromkeys(item_ids))
+        # Only pending rows flip, so a repeated or concurrent purchase restocks once
+        flipped = db.execute(
+            update(ShoppingListItem)
+            .where(
+                ShoppingListItem.user_id == user.id,
+                ShoppingListItem.id.in_(unique_ids),
+                ShoppingListItem.purchased == False
+            )
+            .values(purchased=True, updated_at=datetime.now(UTC).date())
+            .returning(
+                ShoppingListItem.id, ShoppingListItem.name, ShoppingListItem.quantity, ShoppingListItem.unit,
+                ShoppingListItem.ingredient_id, ShoppingListItem.base_unit
+            )
+        ).all()
+        
+        if update_inventory and flipped:
+            # One row per (ingredient_id, base_unit), in the unit of its first item
+            restock: Dict[Tuple[int, str], dict] = {}
+            for row in flipped:
+                entry = restock.setdefault((row.ingredient_id, row.base_unit), {
+                    "name": row.name, "unit": row.unit, "quantity": 0.0, "user_id": user.id,
+                    "ingredient_id": row.ingredient_id, "base_unit": row.base_unit,
+                })
+                entry["quantity"] += row.quantity * canonical_unit(row.unit)[2] / canonical_unit(entry["unit"])[2]
+            db.execute(_inventory_upsert(db), list(restock.values()))
+            CookabilityService.ingredients_changed(db, user.id, restock)
+        db.commit()
+        
+        purchased = {row.id for row in flipped}
+        items = {
+            item.id: item for item in db.scalars(
+                select(ShoppingListItem).where(ShoppingListItem.user_id == user.id, ShoppingListItem.id.in_(unique_ids))
+            )
+        }
+        return {"results": [
+            {
+                "index": index,
+                "id": item_id,
+                "status": "not_found" if item_id not in items
+                else "purchased" if item_id in purchased else "already_purchased",
+                "item": items.get(item_id),
+            }
+            for index, item_id in enumerate(item_ids)
+        ]}
+    
     @staticmethod
     def generate_from_recipe(db: Session, recipe_id: int, user: User, servings: float = 1.0):
-        recipe = db.query(Recipe).filter(
-            Recipe.id == recipe_id,
-            Recipe.user_id == user.id
-        ).first()
-        if not recipe:
-            raise HTTPException(status_code=404, detail="Recipe not found")
+        """
+        Add the recipe's ingredients to the list with one catalog lookup and one executemany
+        upsert; quantities add to pending items already on the list. Returns the pending item
+        of each ingredient, in recipe order.
+        """
+        recipe = RecipeService.get_recipe(db, recipe_id, user)
+        ingredients = IngredientService.canonicalize(db, [
+            {
+                "name": ingredient["name"], "quantity": ingredient["quantity"] * servings, "unit": ingredient["unit"],
+                "recipe_id": recipe_id, "purchased": False, "user_id": user.id,
+            }
+            for ingredient in recipe.ingredients
+        ])
         
-        shopping_list_items = []
-        for ingredient in recipe.ingredients:
-            # Calculate quantity based on servings
-            quantity = ingredient["quantity"] * servings
-            
-            # Check if item already exists in shopping list
-            existing_item = db.query(ShoppingListItem).filter(
-                ShoppingListItem.name == ingredient["name"],
-                ShoppingListItem.unit == ingredient["unit"],
-                ShoppingListItem.purchased == False,
-                ShoppingListItem.user_id == user.id
-            ).first()
-            
-            if existing_item:
-                # Update quantity of existing item
-                existing_item.quantity += quantity
-                db.commit()
-                db.refresh(existing_item)
-                shopping_list_items.append(existing_item)
+        # One row per (ingredient_id, base_unit), in the unit of its first ingredient
+        keys, rows = [], {}
+        for ingredient in ingredients:
+            key = (ingredient["ingredient_id"], ingredient["base_unit"])
+            keys.append(key)
+            row = rows.get(key)
+            if row is None:
+                rows[key] = ingredient
             else:
-                # Create new shopping list item
-                shopping_item = ShoppingListItem(
-                    name=ingredient["name"],
-                    quantity=quantity,
-                    unit=ingredient["unit"],
-                    recipe_id=recipe_id,
-                    user_id=user.id
+                row["quantity"] += (
+                    ingredient["quantity"] * canonical_unit(ingredient["unit"])[2] / canonical_unit(row["unit"])[2]
                 )
-                db.add(shopping_item)
-                db.commit()
-                db.refresh(shopping_item)
-                shopping_list_items.append(shopping_item)
+        if not rows:
+            return []
+        db.execute(_shopping_list_upsert(db), list(rows.values()))
+        db.commit()
         
-        return shopping_list_items
+        by_key = {
+            (item.ingredient_id, item.base_unit): item for item in db.scalars(
+                select(ShoppingListItem).where(
+                    ShoppingListItem.user_id == user.id,
+                    ShoppingListItem.purchased == False,
+                    tuple_(ShoppingListItem.ingredient_id, ShoppingListItem.base_unit).in_(list(rows))
+                )
+            )
+        }
+        return [by_key[key] for key in keys]
     
     @staticmethod
     def get_summary(db: Session, user: User):
@@ -249,4 +975,47 @@ class ShoppingListService:
             "purchased_items": purchased_items,
             "pending_items": pending_items,
             "items": items
-        }
\ No newline at end of file
+        }
+
+# (record type, model) in export order; recipes precede the shopping-list rows that reference them
+EXPORT_TABLES = (("inventory", InventoryItem), ("recipe", Recipe), ("shopping_list", ShoppingListItem))
+# Owner and catalog columns; an import derives them again
+EXPORT_HIDDEN = {"user_id", "ingredient_id", "base_unit"}
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip-compress a stream of byte chunks incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+class ExportService:
+    @staticmethod
+    def stream_ndjson(db: Session, user: User, batch_size: int = 1000) -> Iterator[bytes]:
+        """
+        Yield the user's data as NDJSON, one ``{"type": ..., "data": {...}}`` record per line.
+        Rows are fetched as Core rows ``batch_size`` at a time and emitted one chunk per
+        batch, so memory does not grow with the account. Closes ``db`` when done.
+        """
+        header = {
+            "type": "export",
+            "data": {"version": 1, "exported_at": datetime.now(UTC).isoformat(), "username": user.username},
+        }
+        user_id = user.id
+        try:
+            yield (json.dumps(header) + "\n").encode()
+            for record_type, model in EXPORT_TABLES:
+                columns = [column for column in model.__table__.columns if column.name not in EXPORT_HIDDEN]
+                result = db.execute(
+                    select(*columns).where(model.user_id == user_id).order_by(model.id),
+                    execution_options={"yield_per": batch_size}
+                )
+                for rows in result.partitions():
+                    yield "".join(
+                        json.dumps({"type": record_type, "data": row._asdict()}, default=str) + "\n"
+                        for row in rows
+                    ).encode()
+        finally:
+            db.close()
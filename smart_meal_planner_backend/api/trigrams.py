@@ -0,0 +1,92 @@
+"""
+Trigram similarity for fuzzy name search, with the semantics of Postgres ``pg_trgm``.
+
+A name's trigrams are taken per alphanumeric word, lowercased and padded with two
+leading spaces and one trailing space ("egg" -> "  e", " eg", "egg", "gg "); the
+similarity of two names is shared trigrams over distinct trigrams of both. On
+Postgres the same ranking runs in SQL against a GIN ``gin_trgm_ops`` index; on
+SQLite ``TrigramIndex`` keeps an inverted index from trigram to name ids in memory.
+
+``TrigramIndex.search`` only takes candidates from the rarest of the query's posting
+lists: a name reaching ``threshold`` shares at least ``ceil(threshold * len(query
+trigrams))`` of them, so it is in one of the rarest ``len(query trigrams) - that + 1``
+lists. The long lists of common trigrams ("  s", "er ") are only probed for those
+candidates.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+_WORDS = re.compile(r"[^\W_]+")
+
+@lru_cache(maxsize=4096)
+def trigrams(text: str) -> FrozenSet[str]:
+    grams = set()
+    for word in _WORDS.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+def similarity(a: str, b: str) -> float:
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+class TrigramIndex:
+    """Inverted trigram index over (id, name) pairs, updated one name at a time."""
+
+    def __init__(self):
+        self.names: Dict[int, str] = {}
+        self.grams: Dict[int, FrozenSet[str]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name_id: int, name: str) -> None:
+        """Index ``name`` under ``name_id``, replacing the name it had"""
+        if self.names.get(name_id) == name:
+            return
+        self.remove(name_id)
+        self.names[name_id] = name
+        self.grams[name_id] = grams = trigrams(name)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(name_id)
+
+    def remove(self, name_id: int) -> None:
+        if self.names.pop(name_id, None) is None:
+            return
+        for gram in self.grams.pop(name_id):
+            posting = self.postings[gram]
+            posting.discard(name_id)
+            if not posting:
+                del self.postings[gram]
+
+    def search(self, query: str, limit: int = 10, threshold: float = 0.3) -> List[Tuple[int, float]]:
+        """(id, similarity) of the ``limit`` names most similar to ``query``, best first, ties by id"""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        needed = max(1, math.ceil(threshold * len(grams) - 1e-9))
+        prefix = len(grams) - needed + 1
+        shared: Counter = Counter()
+        for posting in postings[:prefix]:
+            shared.update(posting)
+        # Common trigrams only add to names already found
+        for posting in postings[prefix:]:
+            smaller, larger = sorted((posting, shared.keys()), key=len)
+            shared.update([name_id for name_id in smaller if name_id in larger])
+
+        scored = []
+        for name_id, count in shared.items():
+            if count >= needed:
+                score = count / (len(grams) + len(self.grams[name_id]) - count)
+                if score >= threshold:
+                    scored.append((-score, name_id))
+        return [(name_id, -score) for score, name_id in heapq.nsmallest(limit, scored)]
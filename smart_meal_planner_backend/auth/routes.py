@@ -12,7 +12,7 @@ from .utils import (
     create_access_token,
     get_current_active_user,
 )
-from config import ACCESS_TOKEN_EXPIRE_MINUTES
+from config import get_settings
 
 router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
@@ -64,7 +64,7 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_expires = timedelta(minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username},
         expires_delta=access_token_expires
@@ -84,7 +84,7 @@ async def login(user_login: schemas.UserLogin, db: Session = Depends(get_db)):
             detail="Incorrect username or password"
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_expires = timedelta(minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username},
         expires_delta=access_token_expires
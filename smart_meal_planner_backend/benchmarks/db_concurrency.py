@@ -0,0 +1,145 @@
+"""
+Compare SQLite under concurrent readers and writers with SQLAlchemy's default
+engine and with ``database.create_db_engine`` (WAL, ``synchronous=NORMAL``,
+busy timeout, larger page cache, mmap):
+
+    python -m benchmarks.db_concurrency --threads 16 --duration 10 --output benchmarks/results/db_concurrency.json
+
+Each thread runs one session per operation, like one request each: mostly
+``GET /inventory/`` reads with a share of inventory inserts. Lock errors
+("database is locked") are reported as errors.
+
+Compare two runs with ``python -m loadtest.compare baseline.json current.json``.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from api import schemas
+from api.services import InventoryService
+from benchmarks.seed import INGREDIENT_NAMES, migrate, seed_database
+from database import create_db_engine
+from loadtest.report import format_table, save_report, summarize
+from models import User
+
+ENGINES = ("default", "tuned")
+
+def make_engine(kind: str, path: str) -> Engine:
+    url = f"sqlite:///{path}"
+    if kind == "tuned":
+        return create_db_engine(url)
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+def _worker(
+    session_factory: sessionmaker,
+    user_id: int,
+    write_ratio: float,
+    deadline: float,
+    seed_value: int,
+    reads: List[float],
+    writes: List[float],
+    errors: Dict[str, int],
+    lock: threading.Lock
+) -> None:
+    rng = random.Random(seed_value)
+    while time.perf_counter() < deadline:
+        kind = "write" if rng.random() < write_ratio else "read"
+        start = time.perf_counter()
+        try:
+            with session_factory() as db:
+                user = db.get(User, user_id)
+                if kind == "write":
+                    InventoryService.create_item(db, schemas.InventoryItemCreate(
+                        name=rng.choice(INGREDIENT_NAMES), quantity=rng.randint(1, 5), unit="pieces"
+                    ), user)
+                else:
+                    InventoryService.get_items(db, user)
+        except OperationalError:
+            with lock:
+                errors[kind] += 1
+            continue
+        duration = time.perf_counter() - start
+        with lock:
+            (writes if kind == "write" else reads).append(duration)
+
+def run_benchmark(
+    kind: str,
+    threads: int,
+    duration: float,
+    write_ratio: float,
+    inventory: int,
+    seed_value: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(tempfile.mkdtemp(prefix="smp-bench-"), "concurrency.db")
+    engine = make_engine(kind, path)
+    migrate(engine)
+    user_id = seed_database(engine, 1, {"inventory": inventory, "recipes": 0, "shopping": 0},
+                            seed=seed_value, password_hash="x")[0]
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    reads: List[float] = []
+    writes: List[float] = []
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    workers = [
+        threading.Thread(target=_worker, args=(
+            session_factory, user_id, write_ratio, start + duration, seed_value + i, reads, writes, errors, lock
+        ))
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    return {
+        f"{kind} read": summarize(reads, errors["read"], elapsed),
+        f"{kind} write": summarize(writes, errors["write"], elapsed),
+        f"{kind} total": summarize(reads + writes, errors["read"] + errors["write"], elapsed),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SQLite engine settings under concurrency")
+    parser.add_argument("--engine", choices=ENGINES, action="append", help="Defaults to both")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per engine")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--inventory", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for kind in args.engine or ENGINES:
+        results.update(run_benchmark(kind, args.threads, args.duration, args.write_ratio, args.inventory, args.seed))
+    print(format_table(results))
+
+    if args.output:
+        save_report({
+            "meta": {
+                "threads": args.threads,
+                "duration": args.duration,
+                "write_ratio": args.write_ratio,
+                "inventory": args.inventory,
+                "seed": args.seed,
+            },
+            "benchmarks": results,
+        }, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Track the cold-start import cost of the API.
+
+Runs ``python -X importtime -c "import main"`` in fresh interpreters and reports
+the total plus the slowest modules imported directly by ``main``:
+
+    python -m benchmarks.importtime --runs 5 --output benchmarks/results/importtime.json
+
+Compare two runs with ``python -m loadtest.compare baseline.json current.json``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from loadtest.report import format_table, save_report, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class ImportTime(NamedTuple):
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    """Parse ``-X importtime`` output lines ("import time: self | cumulative | name")."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append(ImportTime(name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+def measure(module: str = "main") -> List[ImportTime]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+def run_benchmarks(module: str, runs: int, top: int) -> Dict[str, Dict[str, Any]]:
+    totals: List[float] = []
+    children: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(runs):
+        entries = measure(module)
+        root = next(entry for entry in entries if entry.module == module and entry.depth == 0)
+        totals.append(root.cumulative_us / 1e6)
+        # Direct imports of the module are the depth-1 entries
+        for entry in entries:
+            if entry.depth == 1:
+                children[entry.module].append(entry.cumulative_us / 1e6)
+
+    results = {f"import {module}": summarize(totals, 0, sum(totals))}
+    slowest = sorted(children.items(), key=lambda item: -sum(item[1]))[:top]
+    for name, durations in slowest:
+        results[f"import {module} > {name}"] = summarize(durations, 0, sum(durations))
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to report")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.module, args.runs, args.top)
+    print(format_table(results))
+
+    if args.output:
+        save_report({
+            "meta": {"module": args.module, "runs": args.runs, "python": sys.version.split()[0]},
+            "benchmarks": results,
+        }, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
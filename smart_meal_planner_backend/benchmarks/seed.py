@@ -0,0 +1,391 @@
+"""
+Synthetic large-dataset generator and seeding CLI.
+
+Generates realistic users, inventory (with expiry-date distributions), recipes
+(ingredient JSON shaped like ``RecipeCreate``) and shopping-list history, then
+bulk-inserts it with Core-compiled INSERTs through ``executemany``:
+
+    python -m benchmarks.seed --users 500 --inventory 500 --recipes 200 --shopping 1300 --workers 4
+
+Row generation runs in worker processes, one chunk of users per task. Every chunk
+is seeded from ``(--seed, chunk index)``, so the same arguments always produce
+the same data regardless of the worker count. The CLI first migrates the target
+to the latest revision (``alembic upgrade head``); ``seed_database`` refuses a
+database that is not migrated.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.engine import Engine
+
+from api.ingredients import canonical_unit, normalize_name
+from models import Ingredient, InventoryItem, Recipe, ShoppingListItem, User
+
+# (name, units, shelf life class)
+CATALOG: List[Tuple[str, Tuple[str, ...], str]] = [
+    ("Tomatoes", ("g", "kg", "pcs"), "fresh"),
+    ("Onion", ("pcs", "kg"), "cellar"),
+    ("Garlic", ("cloves", "pcs"), "cellar"),
+    ("Potatoes", ("kg", "g"), "cellar"),
+    ("Carrots", ("g", "kg"), "fridge"),
+    ("Bell Pepper", ("pcs",), "fresh"),
+    ("Spinach", ("g",), "fresh"),
+    ("Mushrooms", ("g",), "fresh"),
+    ("Lemon", ("pcs",), "fridge"),
+    ("Ginger", ("g",), "fridge"),
+    ("Basil", ("g", "bunch"), "fresh"),
+    ("Chicken Breast", ("g", "kg"), "fresh"),
+    ("Ground Beef", ("g", "kg"), "fresh"),
+    ("Salmon", ("g",), "fresh"),
+    ("Eggs", ("pcs",), "fridge"),
+    ("Milk", ("ml", "l"), "fridge"),
+    ("Butter", ("g",), "fridge"),
+    ("Yogurt", ("g", "ml"), "fridge"),
+    ("Cheddar", ("g",), "fridge"),
+    ("Spaghetti", ("g",), "pantry"),
+    ("Rice", ("g", "kg"), "pantry"),
+    ("Flour", ("g", "kg"), "pantry"),
+    ("Lentils", ("g",), "pantry"),
+    ("Olive Oil", ("ml", "l"), "pantry"),
+    ("Tomato Sauce", ("ml", "g"), "pantry"),
+    ("Canned Chickpeas", ("g", "pcs"), "pantry"),
+    ("Sugar", ("g", "kg"), "staple"),
+    ("Salt", ("g",), "staple"),
+    ("Black Pepper", ("g",), "staple"),
+    ("Cumin", ("g", "tsp"), "staple"),
+]
+INGREDIENT_NAMES = [name for name, _, _ in CATALOG]
+
+def _stockable() -> List[Tuple[str, Tuple[str, ...], str]]:
+    by_dimension: Dict[Tuple[str, str], List[str]] = {}
+    shelves = {}
+    for name, units, shelf in CATALOG:
+        shelves[name] = shelf
+        for unit in units:
+            by_dimension.setdefault((name, canonical_unit(unit)[1]), []).append(unit)
+    return [(name, tuple(units), shelves[name]) for (name, _), units in by_dimension.items()]
+
+# What a user can stock: one row per (ingredient, unit dimension), as inventory is unique on
+# (user, ingredient, base unit); each entry lists the units of that dimension
+STOCKABLE = _stockable()
+
+# Product lines of the catalog ingredients ("Organic Italian Rice"), each a distinct ingredient,
+# for inventories larger than the catalog
+QUALIFIERS = [
+    "Organic", "Fresh", "Frozen", "Dried", "Smoked", "Wholegrain", "Free-Range", "Wild", "Baby", "Heirloom",
+    "Premium", "Value", "Fine", "Coarse", "Roasted", "Pickled", "Low-Fat", "Unsalted", "Aged", "Sweet",
+]
+ORIGINS = [
+    "Italian", "Spanish", "Greek", "French", "Thai", "Indian", "Mexican", "Japanese", "Turkish", "Moroccan",
+    "Irish", "Scottish", "Welsh", "Dutch", "Polish", "Peruvian", "Korean", "Chinese", "Lebanese", "Cornish",
+]
+VARIETIES = [
+    (f"{variety} {name}", units, shelf)
+    for variety in ORIGINS + QUALIFIERS + [f"{qualifier} {origin}" for qualifier in QUALIFIERS for origin in ORIGINS]
+    for name, units, shelf in STOCKABLE
+]
+MAX_INVENTORY = len(STOCKABLE) + len(VARIETIES)
+
+# Days until expiry relative to the anchor date, as (low, high); negative means already expired
+SHELF_LIFE = {
+    "fresh": (-4, 7),
+    "fridge": (-2, 30),
+    "cellar": (5, 60),
+    "pantry": (30, 540),
+}
+
+DISHES = ["Pasta", "Curry", "Stew", "Salad", "Soup", "Stir Fry", "Bake", "Risotto", "Tacos", "Bowl"]
+STYLES = ["Quick", "Classic", "Spicy", "Creamy", "Rustic", "Weeknight", "Garden", "Smoky"]
+
+DEFAULT_BATCH_SIZE = 10_000
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rows are generated with values already in their database form (ISO dates, JSON
+# text), so the parent can hand them straight to the driver's executemany without
+# per-row bind processing. Inventory and shopping rows carry their catalog name under
+# "ingredient"; the parent swaps it for the ingredient id before inserting.
+
+def _expiry(rng: random.Random, shelf: str, anchor: date) -> Optional[str]:
+    if shelf == "staple" or rng.random() < 0.1:
+        return None  # no printed date, or the user didn't enter one
+    low, high = SHELF_LIFE[shelf]
+    return (anchor + timedelta(days=int(rng.triangular(low, high, low + (high - low) / 4)))).isoformat()
+
+def _history_date(rng: random.Random, anchor: date, max_days: int = 365) -> str:
+    # Recent activity is more common than old activity
+    return (anchor - timedelta(days=int(rng.expovariate(1 / 60)) % max_days)).isoformat()
+
+def generate_chunk(task: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate all rows for one contiguous block of users."""
+    rng = random.Random(f"{task['seed']}:{task['chunk']}")
+    anchor: date = task["anchor"]
+    sizes: Dict[str, int] = task["sizes"]
+    recent = (anchor - timedelta(days=7)).isoformat()
+    rows: Dict[str, List[Dict[str, Any]]] = {"users": [], "inventory": [], "recipes": [], "shopping": []}
+
+    for offset, user_id in enumerate(task["user_ids"]):
+        joined = _history_date(rng, anchor, 3 * 365)
+        rows["users"].append({
+            "id": user_id,
+            "username": f"seed{task['seed']}_user{user_id}",
+            "email": f"seed{task['seed']}_user{user_id}@example.com",
+            "hashed_password": task["password_hash"],
+            "is_active": rng.random() > 0.02,
+            "created_at": joined,
+            "updated_at": joined,
+        })
+
+        # Distinct ingredients, varied by unit and quantity: the catalog first, then product lines
+        stock = rng.sample(STOCKABLE, min(sizes["inventory"], len(STOCKABLE)))
+        stock += rng.sample(VARIETIES, min(max(sizes["inventory"] - len(STOCKABLE), 0), len(VARIETIES)))
+        for name, units, shelf in stock:
+            unit, base_unit, _ = canonical_unit(rng.choice(units))
+            added = _history_date(rng, anchor, 90)
+            rows["inventory"].append({
+                "name": name,
+                "quantity": round(rng.lognormvariate(4, 1), 2),
+                "unit": unit,
+                "expiry_date": _expiry(rng, shelf, anchor),
+                "created_at": added,
+                "updated_at": added,
+                "user_id": user_id,
+                "ingredient": normalize_name(name),
+                "base_unit": base_unit,
+            })
+
+        first_recipe_id = task["recipe_id_start"] + (task["first_index"] + offset) * sizes["recipes"]
+        recipe_ingredients = []
+        for i in range(sizes["recipes"]):
+            picks = rng.sample(CATALOG, rng.randint(3, 12))
+            ingredients = [
+                {"name": name, "quantity": float(rng.choice((1, 2, 50, 100, 200, 250, 400, 500))), "unit": units[0]}
+                for name, units, _ in picks
+            ]
+            recipe_ingredients.append(ingredients)
+            created = _history_date(rng, anchor)
+            rows["recipes"].append({
+                "id": first_recipe_id + i,
+                "name": f"{rng.choice(STYLES)} {picks[0][0]} {rng.choice(DISHES)}",
+                "description": f"A {rng.choice(STYLES).lower()} dish built around {picks[0][0].lower()}",
+                "ingredients": json.dumps(ingredients),
+                "instructions": json.dumps([f"Step {n}: prepare and cook" for n in range(1, rng.randint(3, 9))]),
+                "prep_time": rng.choice((10, 15, 20, 30, 45, 60, 90, 120)),
+                "created_at": created,
+                "updated_at": created,
+                "user_id": user_id,
+            })
+
+        pending = set()
+        for _ in range(sizes["shopping"]):
+            created = _history_date(rng, anchor)
+            recipe_id = None
+            if recipe_ingredients and rng.random() < 0.4:
+                index = rng.randrange(len(recipe_ingredients))
+                ingredient = rng.choice(recipe_ingredients[index])
+                recipe_id = first_recipe_id + index
+                name, unit = ingredient["name"], ingredient["unit"]
+            else:
+                name, units, _ = rng.choice(CATALOG)
+                unit = rng.choice(units)
+            unit, base_unit, _ = canonical_unit(unit)
+            # Older entries are almost always checked off; the recent list is still open
+            purchased = created < recent or rng.random() < 0.3
+            # Only one open row per (ingredient, base unit); a repeat is an earlier, checked-off purchase
+            purchased = purchased or (name, base_unit) in pending
+            if not purchased:
+                pending.add((name, base_unit))
+            rows["shopping"].append({
+                "name": name,
+                "quantity": float(rng.randint(1, 6)),
+                "unit": unit,
+                "recipe_id": recipe_id,
+                "purchased": purchased,
+                "created_at": created,
+                "updated_at": created,
+                "user_id": user_id,
+                "ingredient": normalize_name(name),
+                "base_unit": base_unit,
+            })
+    return rows
+
+def _insert_rows(conn, model, rows: List[Dict[str, Any]], batch_size: int) -> None:
+    """Core-compiled INSERT executed as a driver-level executemany, in batches."""
+    if not rows:
+        return
+    compiled = insert(model.__table__).compile(dialect=conn.dialect, column_keys=list(rows[0]))
+    if compiled.positional:
+        keys = compiled.positiontup
+        params = [tuple(row[key] for key in keys) for row in rows]
+    else:
+        params = rows
+    sql = str(compiled)
+    for start in range(0, len(params), batch_size):
+        conn.exec_driver_sql(sql, params[start:start + batch_size])
+
+def _resolve_ingredients(conn, rows: List[Dict[str, Any]], ids: Dict[str, int]) -> None:
+    """
+    Replace each row's catalog name with its ``ingredient_id``, adding names not in the
+    catalog. ``ids`` maps the names resolved so far and is shared across chunks.
+    """
+    names = {row["ingredient"] for row in rows}
+    if not names <= ids.keys():
+        ids.update(conn.execute(select(Ingredient.name, Ingredient.id)).all())
+        new = sorted(names - ids.keys())
+        if new:
+            conn.execute(insert(Ingredient), [{"name": name} for name in new])
+            ids.update(conn.execute(select(Ingredient.name, Ingredient.id)).all())
+    for row in rows:
+        row["ingredient_id"] = ids[row.pop("ingredient")]
+
+def _insert_chunk(
+    conn, rows: Dict[str, List[Dict[str, Any]]], batch_size: int, ingredient_ids: Dict[str, int]
+) -> None:
+    _resolve_ingredients(conn, rows["inventory"] + rows["shopping"], ingredient_ids)
+    tables = (("users", User), ("recipes", Recipe), ("inventory", InventoryItem), ("shopping", ShoppingListItem))
+    for key, model in tables:
+        _insert_rows(conn, model, rows[key], batch_size)
+
+def _alembic_config(connection=None) -> Config:
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+def migrate(engine: Engine) -> None:
+    """``alembic upgrade head`` on ``engine``'s database."""
+    with engine.begin() as conn:
+        command.upgrade(_alembic_config(conn), "head")
+
+def _require_migrated(conn) -> None:
+    heads = set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+    if set(MigrationContext.configure(conn).get_current_heads()) != heads:
+        raise RuntimeError("Database schema is not at the latest migration; run `alembic upgrade head` first")
+
+def _sync_sequences(conn) -> None:
+    """Explicit ids don't advance Postgres sequences; move them past the seeded rows."""
+    for table in ("users", "inventory", "recipes", "shopping_list"):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+def seed_database(
+    engine: Engine,
+    users: int,
+    sizes: Dict[str, int],
+    seed: int = 0,
+    workers: int = 1,
+    users_per_chunk: int = 10,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    anchor: Optional[date] = None,
+    password_hash: Optional[str] = None,
+) -> List[int]:
+    """Seed ``users`` users with ``sizes`` rows each per table; returns the new user ids."""
+    anchor = anchor or date.today()
+    if password_hash is None:
+        from auth.utils import get_password_hash
+        password_hash = get_password_hash("seeded-password")  # hashed once, shared by every user
+
+    with engine.connect() as conn:
+        _require_migrated(conn)
+        user_id_start = (conn.execute(select(func.max(User.id))).scalar() or 0) + 1
+        recipe_id_start = (conn.execute(select(func.max(Recipe.id))).scalar() or 0) + 1
+
+    user_ids = list(range(user_id_start, user_id_start + users))
+    tasks = [
+        {
+            "seed": seed,
+            "chunk": chunk,
+            "first_index": first,
+            "user_ids": user_ids[first:first + users_per_chunk],
+            "recipe_id_start": recipe_id_start,
+            "sizes": sizes,
+            "anchor": anchor,
+            "password_hash": password_hash,
+        }
+        for chunk, first in enumerate(range(0, users, users_per_chunk))
+    ]
+
+    ingredient_ids: Dict[str, int] = {}
+    with engine.begin() as conn:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # map() yields in task order, so inserts stay deterministic while
+                # later chunks are still being generated
+                for rows in pool.map(generate_chunk, tasks):
+                    _insert_chunk(conn, rows, batch_size, ingredient_ids)
+        else:
+            for task in tasks:
+                _insert_chunk(conn, generate_chunk(task), batch_size, ingredient_ids)
+        if engine.dialect.name == "postgresql":
+            _sync_sequences(conn)
+    return user_ids
+
+def _fast_sqlite_writes(engine: Engine) -> None:
+    """Trade durability for speed on the seeding connection only."""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fill the database with synthetic data")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from settings")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument(
+        "--inventory", type=int, default=200,
+        help=f"Inventory items per user, each a distinct ingredient (at most {MAX_INVENTORY})"
+    )
+    parser.add_argument("--recipes", type=int, default=100, help="Recipes per user")
+    parser.add_argument("--shopping", type=int, default=500, help="Shopping-list rows per user")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Generator processes")
+    parser.add_argument("--users-per-chunk", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--anchor-date", type=date.fromisoformat,
+                        help="Date expiry and history are relative to (default: today)")
+    args = parser.parse_args(argv)
+
+    url = args.database_url
+    if url is None:
+        from config import get_settings
+        url = get_settings().DATABASE_URL
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        _fast_sqlite_writes(engine)
+    migrate(engine)
+
+    sizes = {"inventory": args.inventory, "recipes": args.recipes, "shopping": args.shopping}
+    start = time.perf_counter()
+    seed_database(
+        engine, args.users, sizes,
+        seed=args.seed,
+        workers=args.workers,
+        users_per_chunk=args.users_per_chunk,
+        batch_size=args.batch_size,
+        anchor=args.anchor_date,
+    )
+    elapsed = time.perf_counter() - start
+
+    total = args.users * (1 + sum(sizes.values()))
+    print(f"Inserted {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
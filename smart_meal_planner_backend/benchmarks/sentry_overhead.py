@@ -0,0 +1,110 @@
+"""
+Measure Sentry tracing overhead on CRUD and health endpoints.
+
+Runs the same in-process requests with Sentry disabled, with every request
+traced and profiled (the old ``traces_sample_rate=1.0`` setup), and with the
+adaptive ``traces_sampler``. Events go to a no-op transport, so only the SDK's
+own cost is measured:
+
+    python -m benchmarks.sentry_overhead --requests 500 --output benchmarks/results/sentry.json
+"""
+import argparse
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import sentry_sdk
+from fastapi.testclient import TestClient
+from sentry_sdk.integrations.fastapi import FastApiIntegration
+from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+from sentry_sdk.transport import Transport
+from sqlalchemy.orm import sessionmaker
+
+from auth.utils import get_current_active_user
+from benchmarks.services import make_engine, seed
+from database import get_db
+from loadtest.report import format_table, save_report, summarize
+from main import create_app
+from models import User
+from monitoring.sentry import AdaptiveSampler
+
+ROUTES = ["/health", "/api/v1/inventory/", "/api/v1/recipes/"]
+
+class NullTransport(Transport):
+    """Drops everything; the benchmark measures SDK overhead, not network I/O."""
+
+    def capture_envelope(self, envelope: Any) -> None:
+        pass
+
+    def capture_event(self, event: Any) -> None:
+        pass
+
+def configure(mode: str) -> None:
+    if mode == "off":
+        sentry_sdk.init()
+        return
+    options: Dict[str, Any] = (
+        {"traces_sample_rate": 1.0, "profiles_sample_rate": 1.0}
+        if mode == "full"
+        else {"traces_sampler": AdaptiveSampler(), "profiles_sample_rate": 0.1}
+    )
+    sentry_sdk.init(
+        dsn="https://public@sentry.invalid/1",
+        transport=NullTransport,
+        integrations=[FastApiIntegration(transaction_style="endpoint"), SqlalchemyIntegration()],
+        **options,
+    )
+
+def run(client: TestClient, mode: str, requests: int) -> Dict[str, Dict[str, Any]]:
+    configure(mode)
+    results = {}
+    for route in ROUTES:
+        client.get(route)  # warm up
+        durations: List[float] = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(route)
+            durations.append(time.perf_counter() - start)
+        results[f"{mode} GET {route}"] = summarize(durations, 0, sum(durations))
+    sentry_sdk.flush()
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Sentry tracing overhead")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per route and mode")
+    parser.add_argument("--rows", type=int, default=200, help="Inventory items and recipes to seed")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    engine = make_engine("sqlite")
+    user_id = seed(engine, {"inventory": args.rows, "recipes": args.rows, "shopping": args.rows})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    def override_user():
+        with session_factory() as db:
+            return db.get(User, user_id)
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = override_user
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with TestClient(app) as client:
+        for mode in ("off", "full", "adaptive"):
+            results.update(run(client, mode, args.requests))
+    print(format_table(results))
+
+    if args.output:
+        save_report({
+            "meta": {"requests": args.requests, "rows": args.rows},
+            "benchmarks": results,
+        }, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Microbenchmarks for the api.services hot paths at realistic data sizes.
+
+Seeds one user with 10k inventory items, 5k recipes and 50k shopping-list rows
+(by default), then times the service calls behind the busiest endpoints:
+
+    python -m benchmarks.services --backend sqlite --output benchmarks/results/sqlite.json
+    python -m benchmarks.services --backend postgres --postgres-url postgresql://localhost/bench
+
+Compare two runs with ``python -m loadtest.compare baseline.json current.json``.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api import schemas
+from api.services import FuzzySearchService, InventoryService, RecipeService, ShoppingListService
+from benchmarks.seed import INGREDIENT_NAMES, migrate, seed_database
+from database import Base, create_db_engine
+from loadtest.report import format_table, save_report, summarize
+from models import InventoryItem, Recipe, ShoppingListItem, User
+
+DEFAULT_SIZES = {"inventory": 10_000, "recipes": 5_000, "shopping": 50_000}
+
+inventory_list = TypeAdapter(List[schemas.InventoryItem])
+recipe_list = TypeAdapter(List[schemas.Recipe])
+recipe_matches = TypeAdapter(List[schemas.RecipeMatch])
+cookable_recipes = TypeAdapter(List[schemas.CookableRecipe])
+fuzzy_inventory = TypeAdapter(List[schemas.FuzzyInventoryMatch])
+recipe_search_page = TypeAdapter(schemas.RecipeSearchPage)
+shopping_summary = TypeAdapter(schemas.ShoppingListSummary)
+shopping_items = TypeAdapter(List[schemas.ShoppingListItem])
+
+def make_engine(backend: str, postgres_url: Optional[str] = None) -> Engine:
+    if backend == "postgres":
+        url = postgres_url or os.environ.get("BENCH_POSTGRES_URL")
+        if not url:
+            raise SystemExit("Postgres backend needs --postgres-url or BENCH_POSTGRES_URL")
+        engine = create_db_engine(url)
+        Base.metadata.drop_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix="smp-bench-"), "bench.db")
+        engine = create_db_engine(f"sqlite:///{path}")
+    migrate(engine)
+    return engine
+
+def seed(engine: Engine, sizes: Dict[str, int], seed_value: int = 0) -> int:
+    """Seed one benchmark user with ``sizes`` rows per table; returns the user id."""
+    return seed_database(engine, 1, sizes, seed=seed_value, password_hash="x")[0]
+
+def _render(adapter: TypeAdapter, value: Any) -> bytes:
+    """Serialize like the endpoint's response_model does."""
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+def _misspelled(rng: random.Random) -> str:
+    """An ingredient name with one letter dropped, as typed in a hurry"""
+    name = rng.choice(INGREDIENT_NAMES)
+    position = rng.randrange(len(name))
+    return name[:position] + name[position + 1:]
+
+def _time(
+    fn: Callable[[Session, User], Any],
+    session_factory: sessionmaker,
+    user_id: int,
+    iterations: int
+) -> List[float]:
+    """Run ``fn`` in a fresh session per iteration, like one request each."""
+    durations = []
+    for _ in range(iterations):
+        with session_factory() as db:
+            user = db.get(User, user_id)
+            start = time.perf_counter()
+            fn(db, user)
+            durations.append(time.perf_counter() - start)
+    return durations
+
+def run_benchmarks(engine: Engine, user_id: int, iterations: int, seed_value: int = 0) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed_value)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with session_factory() as db:
+        recipe_ids = list(db.scalars(select(Recipe.id).where(Recipe.user_id == user_id).limit(1000)))
+        pending_ids = list(db.scalars(
+            select(ShoppingListItem.id).where(
+                ShoppingListItem.user_id == user_id,
+                ShoppingListItem.purchased == False
+            ).limit(iterations)
+        ))
+
+    benchmarks: Dict[str, Callable[[Session, User], Any]] = {
+        "RecipeService.find_recipes_by_ingredients": lambda db, user: _render(
+            recipe_matches,
+            RecipeService.find_recipes_by_ingredients(db, rng.sample(INGREDIENT_NAMES, 4), user, 10)
+        ),
+        "RecipeService.find_cookable": lambda db, user: _render(
+            cookable_recipes, RecipeService.find_cookable(db, user, max_missing=2)
+        ),
+        # The first call builds the in-process index on SQLite; later ones only add new rows
+        "FuzzySearchService.search inventory": lambda db, user: _render(
+            fuzzy_inventory, [
+                {"item": item, "similarity": similarity}
+                for item, similarity in FuzzySearchService.search(db, InventoryItem, user, _misspelled(rng))
+            ]
+        ),
+        "RecipeService.search": lambda db, user: _render(
+            recipe_search_page, RecipeService.search(db, user, rng.choice(INGREDIENT_NAMES))
+        ),
+        "ShoppingListService.get_summary": lambda db, user: _render(
+            shopping_summary, ShoppingListService.get_summary(db, user)
+        ),
+        "ShoppingListService.generate_from_recipe": lambda db, user: _render(
+            shopping_items, ShoppingListService.generate_from_recipe(db, rng.choice(recipe_ids), user, 2.0)
+        ),
+        "ShoppingListService.mark_as_purchased": lambda db, user: ShoppingListService.mark_as_purchased(
+            db, pending_ids.pop(), user
+        ),
+        "GET /inventory/": lambda db, user: _render(inventory_list, InventoryService.get_items(db, user)),
+        "GET /recipes/": lambda db, user: _render(recipe_list, RecipeService.get_recipes(db, user)),
+        "GET /shopping-list/items": lambda db, user: _render(
+            shopping_items, ShoppingListService.get_items(db, user)
+        ),
+    }
+
+    results = {}
+    for name, fn in benchmarks.items():
+        runs = min(iterations, len(pending_ids)) if name.endswith("mark_as_purchased") else iterations
+        durations = _time(fn, session_factory, user_id, runs)
+        results[name] = summarize(durations, 0, sum(durations))
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark api.services hot paths")
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--postgres-url", help="Defaults to BENCH_POSTGRES_URL")
+    parser.add_argument("--inventory", type=int, default=DEFAULT_SIZES["inventory"])
+    parser.add_argument("--recipes", type=int, default=DEFAULT_SIZES["recipes"])
+    parser.add_argument("--shopping", type=int, default=DEFAULT_SIZES["shopping"])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    sizes = {"inventory": args.inventory, "recipes": args.recipes, "shopping": args.shopping}
+    engine = make_engine(args.backend, args.postgres_url)
+
+    start = time.perf_counter()
+    user_id = seed(engine, sizes, args.seed)
+    print(f"Seeded {sum(sizes.values())} rows in {time.perf_counter() - start:.1f}s")
+
+    results = run_benchmarks(engine, user_id, args.iterations, args.seed)
+    print(format_table(results))
+
+    if args.output:
+        save_report({
+            "meta": {"backend": args.backend, "sizes": sizes, "iterations": args.iterations, "seed": args.seed},
+            "benchmarks": results,
+        }, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
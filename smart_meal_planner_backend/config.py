@@ -6,10 +6,25 @@ class Settings(BaseSettings):
     # Base settings
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
+    TESTING: bool = False
     API_V1_PREFIX: str = "/api/v1"
     
     # Database settings
     DATABASE_URL: str = "sqlite:///./smart_meal_planner.db"
+    DB_POOL_SIZE: int = 10  # persistent connections per worker process
+    DB_MAX_OVERFLOW: int = 20  # extra connections allowed under bursts
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a server connection is replaced
+    DB_POOL_PRE_PING: bool = True  # detect connections dropped by the server
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers don't block on the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # safe with WAL, fsyncs only at checkpoints
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait for the write lock instead of failing
+    SQLITE_CACHE_SIZE_KB: int = 65536  # page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes of the database file to memory-map
+    
+    # Fuzzy name search on SQLite (in-process trigram index per user and table, see api/trigrams.py)
+    FUZZY_INDEX_TTL_SECONDS: int = 300  # rebuild after this long, picking up renames made by other workers
+    FUZZY_INDEX_MAX_ENTRIES: int = 256  # least recently searched (user, table) indexes are dropped beyond this
     
     # Security settings
     SECRET_KEY: str
@@ -18,14 +33,45 @@ class Settings(BaseSettings):
     
     # OpenAI settings
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None  # e.g. http://127.0.0.1:8001/v1 for loadtest/fake_openai.py
     
     # Monitoring settings
     SENTRY_DSN: Optional[str] = None
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.01  # CRUD and auth routes
+    SENTRY_AI_TRACES_SAMPLE_RATE: float = 1.0
+    SENTRY_HEALTH_TRACES_SAMPLE_RATE: float = 0.0
+    SENTRY_BOOSTED_TRACES_SAMPLE_RATE: float = 0.5  # slow route classes or high error rate
+    SENTRY_ERROR_RATE_THRESHOLD: float = 0.05  # share of recent 5xx responses that triggers boosting
+    SENTRY_PROFILES_SAMPLE_RATE: float = 0.1  # fraction of sampled transactions that are profiled
     ENABLE_METRICS: bool = True
-    METRICS_PORT: int = 9090
+    METRICS_PORT: int = 9090  # dedicated /metrics listener, separate from the API port
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None  # shared metric files when running several workers
     LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000  # records buffered for the writer thread; overflow is dropped
+    LOG_SAMPLE_RATE: float = 1.0  # fraction of fast, successful request logs to keep
+    SLOW_REQUEST_THRESHOLD: float = 1.0  # seconds; slower requests are always logged
     ENABLE_REQUEST_LOGGING: bool = True
     ENABLE_API_LOGGING: bool = True
+    ENABLE_QUERY_METRICS: bool = True
+    QUERY_REPEAT_THRESHOLD: int = 10  # warn when one statement shape runs more often per request
+    ENABLE_SERVER_TIMING: bool = True  # Server-Timing header with db/auth/ai/render breakdown
+    
+    # Server settings (serve.py)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: Optional[int] = None  # defaults to one per CPU core
+    PRELOAD_APP: bool = True  # import the app once in the master; workers share it copy-on-write
+    WORKER_MAX_REQUESTS: int = 10000  # recycle a worker after this many requests (0 disables)
+    WORKER_MAX_REQUESTS_JITTER: int = 1000  # spread recycling so workers don't restart together
+    WORKER_MAX_RSS_MB: Optional[int] = None  # recycle a worker whose resident memory exceeds this
+    WORKER_TIMEOUT: int = 60  # seconds a worker may go silent before the master restarts it
+    GRACEFUL_TIMEOUT: int = 30  # seconds to drain in-flight requests on SIGTERM
+    KEEPALIVE: int = 5
+    
+    # Runtime settings
+    THREADPOOL_SIZE: int = 40  # concurrent sync endpoints/dependencies (Starlette's default is 40)
+    ENABLE_RUNTIME_MONITOR: bool = True
+    RUNTIME_MONITOR_INTERVAL: float = 0.5  # seconds between event loop / threadpool samples
     
     # Rate limiting settings
     RATE_LIMIT_WINDOW: int = 3600  # 1 hour
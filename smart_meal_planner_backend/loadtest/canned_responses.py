@@ -0,0 +1,337 @@
+from typing import Any, Dict, List, Tuple
+
+# Canned completions returned by the fake OpenAI provider. Each payload is the
+# JSON document AIService expects the model to produce for one endpoint, and
+# must validate against the matching response model in ai/schemas.py.
+
+RECIPE_NUTRITION = {
+    "calories": 520.0,
+    "protein": 32.0,
+    "carbs": 48.0,
+    "fat": 18.0
+}
+
+AI_RECIPE = {
+    "name": "Tomato Basil Chicken",
+    "description": "Pan-seared chicken in a quick tomato and basil sauce",
+    "ingredients": [
+        {"name": "chicken breast", "quantity": 400, "unit": "g"},
+        {"name": "tomatoes", "quantity": 300, "unit": "g"},
+        {"name": "basil", "quantity": 10, "unit": "g"}
+    ],
+    "instructions": [
+        "Season and sear the chicken",
+        "Add chopped tomatoes and simmer for 10 minutes",
+        "Finish with torn basil"
+    ],
+    "prep_time": 30,
+    "difficulty": "Easy",
+    "nutrition": RECIPE_NUTRITION
+}
+
+RECIPE_SUGGESTIONS = {
+    "recipes": [AI_RECIPE, {**AI_RECIPE, "name": "Chicken Rice Bowl", "prep_time": 25}]
+}
+
+MEAL_PLAN = {
+    "meal_plan": {
+        "days": [
+            {
+                "day": 1,
+                "meals": [
+                    {"type": "lunch", "recipe": AI_RECIPE},
+                    {"type": "dinner", "recipe": {**AI_RECIPE, "name": "Chicken Rice Bowl"}}
+                ],
+                "total_nutrition": {
+                    "calories": 1040.0,
+                    "protein": 64.0,
+                    "carbs": 96.0,
+                    "fat": 36.0
+                }
+            }
+        ],
+        "shopping_list": [
+            {"name": "chicken breast", "quantity": 800, "unit": "g", "estimated_cost": 9.5},
+            {"name": "tomatoes", "quantity": 600, "unit": "g", "estimated_cost": 3.2}
+        ],
+        "total_cost": 12.7
+    }
+}
+
+NUTRITION_ANALYSIS = {
+    "nutrition": {
+        "macronutrients": {
+            "calories": 520.0,
+            "protein": 32.0,
+            "carbs": 48.0,
+            "fat": 18.0,
+            "fiber": 6.0
+        },
+        "micronutrients": {
+            "vitamins": {
+                "A": 820.0, "C": 35.0, "D": 0.4, "E": 2.1, "K": 48.0, "B1": 0.3,
+                "B2": 0.4, "B3": 18.0, "B6": 1.2, "B12": 0.6, "folate": 60.0
+            },
+            "minerals": {
+                "calcium": 80.0,
+                "iron": 2.4,
+                "magnesium": 70.0,
+                "zinc": 2.0,
+                "potassium": 950.0,
+                "sodium": 420.0
+            }
+        },
+        "dietary_analysis": {
+            "protein_quality": "Complete protein from poultry",
+            "carb_quality": "Mostly from vegetables",
+            "fat_quality": "Moderate, mainly unsaturated",
+            "fiber_adequacy": "Below daily target for a single meal",
+            "vitamin_adequacy": "Good vitamin A and C coverage",
+            "mineral_adequacy": "Adequate potassium, moderate sodium",
+            "recommendations": ["Add a whole grain side", "Use less added salt"]
+        }
+    }
+}
+
+SUBSTITUTIONS = {
+    "substitutions": [
+        {
+            "original_ingredient": {"name": "chicken breast", "quantity": 400, "unit": "g"},
+            "substitutes": [
+                {
+                    "name": "firm tofu",
+                    "quantity": 400,
+                    "unit": "g",
+                    "conversion_ratio": 1.0,
+                    "flavor_impact": "Milder, absorbs the sauce",
+                    "texture_impact": "Softer unless pressed",
+                    "nutrition_impact": "Less protein, more calcium",
+                    "cooking_adjustments": ["Press for 15 minutes", "Sear until golden"]
+                }
+            ],
+            "notes": "Works well in tomato-based sauces"
+        }
+    ]
+}
+
+FUSION = {
+    "fusion_recipe": {
+        "name": "Thai Basil Pizza",
+        "description": "Crisp pizza base topped with green curry chicken",
+        "cuisine_influences": ["Italian", "Thai"],
+        "ingredients": [
+            {"name": "pizza dough", "quantity": 300, "unit": "g", "cuisine_origin": "Italian"},
+            {"name": "green curry paste", "quantity": 40, "unit": "g", "cuisine_origin": "Thai"}
+        ],
+        "instructions": ["Stretch the dough", "Spread curry sauce", "Bake at 250C"],
+        "cooking_techniques": [
+            {
+                "name": "Stone baking",
+                "cuisine_origin": "Italian",
+                "description": "High heat baking on a preheated stone"
+            }
+        ],
+        "prep_time": 45,
+        "difficulty": "Medium",
+        "nutrition": RECIPE_NUTRITION,
+        "fusion_notes": ["Coconut milk replaces mozzarella moisture"],
+        "pairing_suggestions": ["Lime soda", "Riesling"]
+    }
+}
+
+TUTORIAL = {
+    "tutorial": {
+        "technique": {
+            "name": "Julienne",
+            "difficulty": "Intermediate",
+            "equipment_needed": ["chef's knife", "cutting board"],
+            "safety_tips": ["Curl your fingertips", "Keep the board stable"]
+        },
+        "steps": [
+            {
+                "order": 1,
+                "title": "Square the vegetable",
+                "description": "Trim the sides to get flat, stable faces",
+                "tips": ["Keep trimmings for stock"],
+                "common_mistakes": ["Rolling vegetable on the board"],
+                "visual_cues": ["Flat rectangular block"]
+            }
+        ],
+        "variations": [
+            {
+                "name": "Fine julienne",
+                "description": "Cut to 1mm matchsticks",
+                "when_to_use": "Garnishes and salads"
+            }
+        ],
+        "practice_exercises": [
+            {
+                "name": "Carrot drill",
+                "description": "Julienne two carrots evenly",
+                "difficulty": "Beginner",
+                "learning_objectives": ["Consistent width"]
+            }
+        ],
+        "troubleshooting": [
+            {
+                "problem": "Uneven sticks",
+                "causes": ["Uneven planks"],
+                "solutions": ["Slice planks to equal thickness first"]
+            }
+        ]
+    }
+}
+
+SEASONAL_RECIPE = {
+    "name": "Chilled Tomato Soup",
+    "description": "Gazpacho with summer tomatoes",
+    "seasonal_ingredients": [
+        {"name": "tomatoes", "peak_season": "summer", "substitutes": ["canned tomatoes"]}
+    ],
+    "preparation_timing": "Day before",
+    "can_make_ahead": True,
+    "plating_suggestions": ["Serve in chilled glasses"]
+}
+
+SEASONAL_MENU = {
+    "seasonal_menu": {
+        "season": "summer",
+        "theme": "Mediterranean garden",
+        "occasion": "garden party",
+        "menu_sections": [
+            {"name": "Starters", "dishes": [{"starter": SEASONAL_RECIPE}]}
+        ],
+        "wine_pairings": [
+            {
+                "wine": "Provence rose",
+                "pairing_notes": "Fresh acidity matches tomatoes",
+                "alternatives": ["Sparkling water with citrus"]
+            }
+        ],
+        "timing_guide": {
+            "preparation_schedule": [{"time": "Day before", "tasks": ["Make soup"]}],
+            "day_of_schedule": [{"time": "1 hour before", "tasks": ["Chill glasses"]}]
+        },
+        "presentation_tips": ["Garnish with basil oil"],
+        "estimated_costs": {
+            "per_person": 18.0,
+            "total": 144.0,
+            "budget_alternatives": ["Use canned tomatoes"]
+        }
+    }
+}
+
+OPTIMIZED_MEAL_PLAN = {
+    "optimized_meal_plan": {
+        "goal": "weight_loss",
+        "daily_targets": {
+            "calories": 2000.0,
+            "protein": 150.0,
+            "carbs": 200.0,
+            "fat": 67.0,
+            "fiber": 30.0
+        },
+        "meals": [
+            {
+                "meal_type": "lunch",
+                "timing": "12:30",
+                "recipes": [
+                    {
+                        "recipe": AI_RECIPE,
+                        "portion_size": 1.0,
+                        "contribution_to_goals": {
+                            "calories": 520.0,
+                            "protein": 32.0,
+                            "carbs": 48.0,
+                            "fat": 18.0
+                        },
+                        "timing_notes": "Eat after training",
+                        "pre_post_workout": True
+                    }
+                ],
+                "nutritional_balance": "High protein, moderate carbs",
+                "meal_synergy": "Vitamin C from tomatoes aids iron absorption"
+            }
+        ],
+        "supplements": [
+            {
+                "name": "Vitamin D",
+                "timing": "Morning",
+                "dosage": "1000 IU",
+                "purpose": "Bone health",
+                "notes": "Take with food"
+            }
+        ],
+        "hydration_plan": {
+            "daily_water": 2.5,
+            "electrolytes": False,
+            "timing_guidelines": ["Drink a glass with every meal"]
+        },
+        "progress_tracking": {
+            "metrics": ["weight", "waist circumference"],
+            "measurement_frequency": "weekly",
+            "expected_progress": "0.5 kg per week"
+        }
+    }
+}
+
+ADAPTED_RECIPE = {
+    "adapted_recipe": {
+        "original_difficulty": "advanced",
+        "adapted_difficulty": "beginner",
+        "simplifications": [
+            {
+                "original_step": "Wrap the beef in puff pastry and lattice",
+                "simplified_step": "Top the beef with a pastry sheet",
+                "reason": "Avoids delicate pastry work",
+                "tips": ["Keep pastry cold"]
+            }
+        ],
+        "equipment_substitutions": [
+            {
+                "original_equipment": "cast iron skillet",
+                "alternative": "heavy frying pan",
+                "usage_instructions": ["Preheat for 5 minutes"]
+            }
+        ],
+        "technique_breakdown": [
+            {
+                "technique": "searing",
+                "difficulty_level": "Easy",
+                "detailed_steps": ["Pat dry", "Sear each side for 2 minutes"],
+                "practice_suggestions": ["Practice on cheaper cuts"]
+            }
+        ],
+        "timing_adjustments": {
+            "original_time": 120,
+            "adjusted_time": 60,
+            "explanation": "Skips chilling and lattice steps"
+        },
+        "recipe": AI_RECIPE,
+        "confidence_building_steps": ["Read the recipe twice before starting"],
+        "common_mistakes_prevention": ["Use a thermometer"]
+    }
+}
+
+# (prompt marker, payload) pairs matched in order against the user prompt that
+# AIService builds. More specific markers must come before generic ones.
+PROMPT_ROUTES: List[Tuple[str, Dict[str, Any]]] = [
+    ("optimized meal plan", OPTIMIZED_MEAL_PLAN),
+    ("-day meal plan", MEAL_PLAN),
+    ("scale this recipe", AI_RECIPE),
+    ("nutritional analysis", NUTRITION_ANALYSIS),
+    ("suggest substitutions", SUBSTITUTIONS),
+    ("create a fusion recipe", FUSION),
+    ("cooking tutorial", TUTORIAL),
+    ("create a seasonal menu", SEASONAL_MENU),
+    ("adapt this recipe", ADAPTED_RECIPE),
+    ("suggest 3 recipes", RECIPE_SUGGESTIONS),
+]
+
+def match_prompt(prompt: str) -> Dict[str, Any]:
+    """Return the canned payload for an AIService prompt, defaulting to recipe suggestions."""
+    lowered = prompt.lower()
+    for marker, payload in PROMPT_ROUTES:
+        if marker in lowered:
+            return payload
+    return RECIPE_SUGGESTIONS
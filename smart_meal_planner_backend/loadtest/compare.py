@@ -0,0 +1,70 @@
+"""
+Compare a load or benchmark result file against a stored baseline.
+
+    python -m loadtest.compare baseline.json current.json --tolerance 0.10
+
+Exits with status 1 when any route's p99 latency grows, or its throughput drops,
+by more than the tolerance.
+"""
+import argparse
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from .report import load_report
+
+def _results(report: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Load reports key results by route, benchmark reports by benchmark name."""
+    return report.get("routes") or report.get("benchmarks") or {}
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.10,
+    metric: str = "p99_ms",
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Return per-route deltas and whether any route regressed beyond ``tolerance``."""
+    rows = []
+    regressed = False
+    current_results = _results(current)
+    for route, base in _results(baseline).items():
+        cur = current_results.get(route)
+        if cur is None:
+            continue
+        latency_change = (cur[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+        throughput_change = 0.0
+        if "throughput_rps" in base and base["throughput_rps"]:
+            throughput_change = (cur["throughput_rps"] - base["throughput_rps"]) / base["throughput_rps"]
+        is_regression = latency_change > tolerance or throughput_change < -tolerance
+        regressed = regressed or is_regression
+        rows.append({
+            "route": route,
+            "baseline": base[metric],
+            "current": cur[metric],
+            "latency_change": latency_change,
+            "throughput_change": throughput_change,
+            "regression": is_regression,
+        })
+    return rows, regressed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare results against a baseline")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative change")
+    parser.add_argument("--metric", default="p99_ms", help="Latency field to compare")
+    args = parser.parse_args(argv)
+
+    rows, regressed = compare_reports(
+        load_report(args.baseline), load_report(args.current), args.tolerance, args.metric
+    )
+    print(f"{'route':<55} {'baseline':>10} {'current':>10} {'latency':>9} {'rps':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['route'][:55]:<55} {row['baseline']:>10.2f} {row['current']:>10.2f} "
+            f"{row['latency_change'] * 100:>+8.1f}% {row['throughput_change'] * 100:>+8.1f}%{flag}"
+        )
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
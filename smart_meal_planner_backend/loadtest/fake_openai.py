@@ -0,0 +1,225 @@
+"""
+Local OpenAI-compatible stand-in for offline load and latency testing.
+
+Serves ``/v1/chat/completions`` with canned payloads that validate against the
+response models in ``ai/schemas.py``. Point the API at it with
+``OPENAI_BASE_URL=http://127.0.0.1:8001/v1`` and run:
+
+    python -m loadtest.fake_openai --port 8001 --latency lognormal --latency-mean-ms 800
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic_settings import BaseSettings
+
+from .canned_responses import match_prompt
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+
+class FakeProviderSettings(BaseSettings):
+    # Time to first token
+    LATENCY_DISTRIBUTION: str = "constant"
+    LATENCY_MEAN_MS: float = 0.0
+    LATENCY_STDDEV_MS: float = 0.0
+
+    # Generation speed; 0 disables the per-token delay
+    TOKENS_PER_SECOND: float = 0.0
+
+    # Fault injection, as probabilities per request
+    ERROR_RATE: float = 0.0
+    RATE_LIMIT_RATE: float = 0.0
+    RETRY_AFTER_SECONDS: int = 1
+
+    SEED: Optional[int] = None
+
+    class Config:
+        env_prefix = "FAKE_OPENAI_"
+        case_sensitive = True
+
+class LatencyModel:
+    """Samples response latencies (in seconds) from a configured distribution."""
+
+    def __init__(self, distribution: str, mean_ms: float, stddev_ms: float, rng: random.Random):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{distribution}', "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self.distribution = distribution
+        self.mean = mean_ms / 1000
+        self.stddev = stddev_ms / 1000
+        self.rng = rng
+
+    def sample(self) -> float:
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == "constant":
+            value = self.mean
+        elif self.distribution == "uniform":
+            value = self.rng.uniform(self.mean - self.stddev, self.mean + self.stddev)
+        elif self.distribution == "normal":
+            value = self.rng.gauss(self.mean, self.stddev)
+        elif self.distribution == "exponential":
+            value = self.rng.expovariate(1 / self.mean)
+        else:
+            # Parameterise the underlying normal so the lognormal has the requested mean/stddev
+            sigma_sq = math.log(1 + (self.stddev / self.mean) ** 2)
+            mu = math.log(self.mean) - sigma_sq / 2
+            value = self.rng.lognormvariate(mu, math.sqrt(sigma_sq))
+        return max(value, 0.0)
+
+def _tokenize(content: str) -> List[str]:
+    """Split content into roughly token-sized chunks (~4 characters each)."""
+    return [content[i:i + 4] for i in range(0, len(content), 4)]
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        message.get("content") or ""
+        for message in messages
+        if message.get("role") == "user"
+    )
+
+def _error_body(message: str, error_type: str, code: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": error_type, "param": None, "code": code}}
+
+def create_app(settings: Optional[FakeProviderSettings] = None) -> FastAPI:
+    """Build the fake provider application."""
+    settings = settings or FakeProviderSettings()
+    rng = random.Random(settings.SEED)
+    latency = LatencyModel(
+        settings.LATENCY_DISTRIBUTION,
+        settings.LATENCY_MEAN_MS,
+        settings.LATENCY_STDDEV_MS,
+        rng
+    )
+    token_delay = 1 / settings.TOKENS_PER_SECOND if settings.TOKENS_PER_SECOND > 0 else 0.0
+
+    app = FastAPI(title="Fake OpenAI provider", docs_url=None, redoc_url=None)
+    app.state.settings = settings
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {
+            "object": "list",
+            "data": [{"id": "gpt-4", "object": "model", "created": 0, "owned_by": "fake-openai"}]
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "gpt-4")
+
+        roll = rng.random()
+        if roll < settings.RATE_LIMIT_RATE:
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(settings.RETRY_AFTER_SECONDS)},
+                content=_error_body("Rate limit reached (injected)", "requests", "rate_limit_exceeded")
+            )
+        if roll < settings.RATE_LIMIT_RATE + settings.ERROR_RATE:
+            return JSONResponse(
+                status_code=500,
+                content=_error_body("The server had an error (injected)", "server_error", "server_error")
+            )
+
+        content = json.dumps(match_prompt(_prompt_text(body.get("messages", []))))
+        tokens = _tokenize(content)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        await asyncio.sleep(latency.sample())
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(tokens, completion_id, created, model, token_delay),
+                media_type="text/event-stream"
+            )
+
+        if token_delay:
+            await asyncio.sleep(token_delay * len(tokens))
+
+        prompt_tokens = len(_tokenize(_prompt_text(body.get("messages", []))))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(tokens),
+                "total_tokens": prompt_tokens + len(tokens)
+            }
+        }
+
+    return app
+
+async def _stream_chunks(
+    tokens: List[str],
+    completion_id: str,
+    created: int,
+    model: str,
+    token_delay: float
+) -> AsyncIterator[str]:
+    """Yield server-sent events in the chat.completion.chunk format."""
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for token in tokens:
+        if token_delay:
+            await asyncio.sleep(token_delay)
+        yield chunk({"content": token})
+    yield chunk({}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS)
+    parser.add_argument("--latency-mean-ms", type=float)
+    parser.add_argument("--latency-stddev-ms", type=float)
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--rate-limit-rate", type=float)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    # CLI flags override FAKE_OPENAI_* environment variables
+    overrides = {
+        "LATENCY_DISTRIBUTION": args.latency,
+        "LATENCY_MEAN_MS": args.latency_mean_ms,
+        "LATENCY_STDDEV_MS": args.latency_stddev_ms,
+        "TOKENS_PER_SECOND": args.tokens_per_second,
+        "ERROR_RATE": args.error_rate,
+        "RATE_LIMIT_RATE": args.rate_limit_rate,
+        "SEED": args.seed,
+    }
+    settings = FakeProviderSettings(**{k: v for k, v in overrides.items() if v is not None})
+    uvicorn.run(create_app(settings), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
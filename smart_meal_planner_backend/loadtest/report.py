@@ -0,0 +1,88 @@
+import json
+import math
+import os
+import platform
+from collections import defaultdict
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional
+
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank - 1, 0), len(sorted_values) - 1)]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Summarize latencies (in seconds) as milliseconds plus throughput."""
+    values = sorted(latencies)
+    count = len(values)
+    summary = {
+        "count": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "throughput_rps": count / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(values) / count * 1000 if count else 0.0,
+        "max_ms": values[-1] * 1000 if values else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(values, pct) * 1000
+    return summary
+
+class Recorder:
+    """Collects per-route latency samples during a load run."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, status: int, duration: float) -> None:
+        self.latencies[route].append(duration)
+        self.statuses[route][status] += 1
+        if status >= 400:
+            self.errors[route] += 1
+
+    def report(self, elapsed: float, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        routes = {
+            route: {
+                **summarize(samples, self.errors[route], elapsed),
+                "statuses": {str(k): v for k, v in sorted(self.statuses[route].items())},
+            }
+            for route, samples in sorted(self.latencies.items())
+        }
+        all_samples = [sample for samples in self.latencies.values() for sample in samples]
+        return {
+            "meta": {
+                "created_at": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "host": platform.node(),
+                "elapsed_s": elapsed,
+                **(meta or {}),
+            },
+            "total": summarize(all_samples, sum(self.errors.values()), elapsed),
+            "routes": routes,
+        }
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+def format_table(results: Dict[str, Dict[str, Any]]) -> str:
+    """Render per-route summaries as a fixed-width text table."""
+    header = f"{'route':<55} {'count':>7} {'err%':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    lines = [header, "-" * len(header)]
+    for route, stats in results.items():
+        lines.append(
+            f"{route[:55]:<55} {stats['count']:>7} {stats['error_rate'] * 100:>5.1f}% "
+            f"{stats['throughput_rps']:>8.1f} {stats['p50_ms']:>8.1f} "
+            f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,99 @@
+"""
+Asyncio/httpx load generator for the Smart Meal Planner API.
+
+    python -m loadtest.runner --base-url http://127.0.0.1:8000 --profile household \\
+        --users 50 --duration 60 --output results/household.json
+
+Per-route throughput and latency percentiles are printed and saved as JSON, which
+``python -m loadtest.compare`` checks against a stored baseline.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .report import Recorder, format_table, save_report
+from .scenarios import SCENARIOS, Scenario, UserSession, provision_user
+
+async def _virtual_user(session: UserSession, scenario: Scenario, deadline: float, rng: random.Random) -> None:
+    while time.perf_counter() < deadline:
+        await scenario.pick(rng)(session)
+        if scenario.think_time:
+            await asyncio.sleep(rng.expovariate(1 / scenario.think_time))
+
+async def run_load(
+    base_url: str,
+    scenario: Scenario,
+    users: int,
+    duration: float,
+    seed: int = 0,
+    timeout: float = 30.0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, Any]:
+    """Provision ``users`` synthetic accounts, then drive ``scenario`` for ``duration`` seconds."""
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits, transport=transport
+    ) as client:
+        # Provisioning traffic is recorded separately so it does not skew the run
+        setup = Recorder()
+        sessions: List[UserSession] = await asyncio.gather(*[
+            provision_user(client, setup, i, run_id) for i in range(users)
+        ])
+
+        recorder = Recorder()
+        for session in sessions:
+            session.recorder = recorder
+
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[
+            _virtual_user(session, scenario, deadline, random.Random(seed + i))
+            for i, session in enumerate(sessions)
+        ])
+        elapsed = time.perf_counter() - start
+
+    return recorder.report(elapsed, meta={
+        "profile": scenario.name,
+        "base_url": base_url,
+        "users": users,
+        "duration_s": duration,
+        "seed": seed,
+    })
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Smart Meal Planner API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--profile", choices=sorted(SCENARIOS), default="household")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Run time in seconds")
+    parser.add_argument("--think-time", type=float, help="Mean pause between actions in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    scenario = SCENARIOS[args.profile]
+    if args.think_time is not None:
+        scenario = replace(scenario, think_time=args.think_time)
+
+    report = asyncio.run(run_load(
+        args.base_url, scenario, args.users, args.duration, seed=args.seed, timeout=args.timeout
+    ))
+
+    print(f"Profile: {scenario.name} - {scenario.description}")
+    print(format_table({**report["routes"], "TOTAL": report["total"]}))
+    if args.output:
+        save_report(report, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .report import Recorder
+
+API = "/api/v1"
+
+INGREDIENTS = [
+    ("Tomatoes", "g"), ("Onion", "pcs"), ("Garlic", "cloves"), ("Spaghetti", "g"),
+    ("Rice", "g"), ("Chicken Breast", "g"), ("Milk", "ml"), ("Eggs", "pcs"),
+    ("Butter", "g"), ("Flour", "g"), ("Carrots", "g"), ("Potatoes", "g"),
+    ("Basil", "g"), ("Olive Oil", "ml"), ("Cheddar", "g"), ("Lentils", "g"),
+]
+
+SAMPLE_AI_RECIPE = {
+    "name": "Tomato Basil Chicken",
+    "description": "Pan-seared chicken in a quick tomato sauce",
+    "ingredients": [{"name": "chicken breast", "quantity": 400, "unit": "g"}],
+    "instructions": ["Sear the chicken", "Simmer in sauce"],
+    "prep_time": 30,
+    "difficulty": "Easy",
+    "nutrition": {"calories": 520, "protein": 32, "carbs": 48, "fat": 18},
+}
+
+class UserSession:
+    """A provisioned synthetic user plus the ids it has created during the run."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, username: str, password: str):
+        self.client = client
+        self.recorder = recorder
+        self.username = username
+        self.password = password
+        self.token: Optional[str] = None
+        self.rng = random.Random(username)
+        # id -> (name, unit); creates of an ingredient the user already stocks merge into the same id
+        self.inventory: Dict[int, Tuple[str, str]] = {}
+        self.recipe_ids: List[int] = []
+        self.shopping_ids: List[int] = []
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    async def request(self, method: str, route: str, path: str, **kwargs: Any) -> Optional[httpx.Response]:
+        """Send a request and record its latency under the route template."""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(f"{method} {route}", 599, time.perf_counter() - start)
+            return None
+        self.recorder.record(f"{method} {route}", response.status_code, time.perf_counter() - start)
+        return response
+
+    async def login(self) -> bool:
+        response = await self.request(
+            "POST", f"{API}/auth/login", f"{API}/auth/login",
+            json={"username": self.username, "password": self.password}
+        )
+        if response is not None and response.status_code == 200:
+            self.token = response.json()["access_token"]
+            return True
+        return False
+
+    def ingredient(self) -> Tuple[str, str]:
+        return self.rng.choice(INGREDIENTS)
+
+async def provision_user(client: httpx.AsyncClient, recorder: Recorder, index: int, run_id: str) -> UserSession:
+    """Register (or reuse) a synthetic user through /auth/register and log in."""
+    username = f"load_{run_id}_{index}"
+    session = UserSession(client, recorder, username, "loadtest-password")
+    await session.request(
+        "POST", f"{API}/auth/register", f"{API}/auth/register",
+        json={"username": username, "email": f"{username}@loadtest.example.com", "password": session.password}
+    )
+    if not await session.login():
+        raise RuntimeError(f"Could not log in synthetic user {username}")
+    return session
+
+# Household CRUD actions
+
+async def list_inventory(s: UserSession) -> None:
+    await s.request("GET", f"{API}/inventory/", f"{API}/inventory/")
+
+async def create_inventory_item(s: UserSession) -> None:
+    name, unit = s.ingredient()
+    response = await s.request("POST", f"{API}/inventory/", f"{API}/inventory/", json={
+        "name": name,
+        "quantity": round(s.rng.uniform(1, 500), 1),
+        "unit": unit,
+        "expiry_date": None,
+    })
+    if response is not None and response.status_code == 200:
+        item = response.json()
+        s.inventory[item["id"]] = (item["name"], item["unit"])
+
+async def update_inventory_item(s: UserSession) -> None:
+    if not s.inventory:
+        return await create_inventory_item(s)
+    item_id = s.rng.choice(list(s.inventory))
+    name, unit = s.inventory[item_id]
+    # Renaming would mostly collide with another stocked ingredient (409); only restock
+    await s.request("PUT", f"{API}/inventory/{{item_id}}", f"{API}/inventory/{item_id}", json={
+        "name": name,
+        "quantity": round(s.rng.uniform(1, 500), 1),
+        "unit": unit,
+        "expiry_date": (date.today() + timedelta(days=s.rng.randint(1, 30))).isoformat(),
+    })
+
+async def get_inventory_item(s: UserSession) -> None:
+    if not s.inventory:
+        return await create_inventory_item(s)
+    item_id = s.rng.choice(list(s.inventory))
+    await s.request("GET", f"{API}/inventory/{{item_id}}", f"{API}/inventory/{item_id}")
+
+async def create_recipe(s: UserSession) -> None:
+    picks = s.rng.sample(INGREDIENTS, 4)
+    response = await s.request("POST", f"{API}/recipes/", f"{API}/recipes/", json={
+        "name": f"Recipe {s.rng.randint(1, 10_000)}",
+        "description": "Synthetic load-test recipe",
+        "ingredients": [{"name": n, "quantity": s.rng.randint(1, 400), "unit": u} for n, u in picks],
+        "instructions": ["Prepare", "Cook", "Serve"],
+        "prep_time": s.rng.randint(5, 90),
+    })
+    if response is not None and response.status_code == 200:
+        s.recipe_ids.append(response.json()["id"])
+
+async def list_recipes(s: UserSession) -> None:
+    await s.request("GET", f"{API}/recipes/", f"{API}/recipes/")
+
+async def find_recipes_by_ingredients(s: UserSession) -> None:
+    names = [name for name, _ in s.rng.sample(INGREDIENTS, 3)]
+    await s.request(
+        "GET", f"{API}/recipes/by-ingredients/", f"{API}/recipes/by-ingredients/",
+        params=[("ingredients", name) for name in names]
+    )
+
+async def get_shopping_list(s: UserSession) -> None:
+    await s.request("GET", f"{API}/shopping-list/", f"{API}/shopping-list/")
+
+async def add_shopping_item(s: UserSession) -> None:
+    name, unit = s.ingredient()
+    response = await s.request("POST", f"{API}/shopping-list/", f"{API}/shopping-list/", json={
+        "name": name, "quantity": s.rng.randint(1, 5), "unit": unit
+    })
+    if response is not None and response.status_code == 200:
+        item_id = response.json()["id"]
+        # Adding to a pending item of the same ingredient returns its id again
+        if item_id not in s.shopping_ids:
+            s.shopping_ids.append(item_id)
+
+async def shopping_list_from_recipe(s: UserSession) -> None:
+    if not s.recipe_ids:
+        return await create_recipe(s)
+    await s.request("POST", f"{API}/shopping-list/recipe/", f"{API}/shopping-list/recipe/", json={
+        "recipe_id": s.rng.choice(s.recipe_ids), "servings": s.rng.choice([1, 2, 4])
+    })
+
+async def purchase_shopping_item(s: UserSession) -> None:
+    if not s.shopping_ids:
+        return await add_shopping_item(s)
+    item_id = s.shopping_ids.pop(s.rng.randrange(len(s.shopping_ids)))
+    await s.request(
+        "POST", f"{API}/shopping-list/{{item_id}}/purchase", f"{API}/shopping-list/{item_id}/purchase"
+    )
+
+# Auth actions
+
+async def relogin(s: UserSession) -> None:
+    await s.login()
+
+async def read_me(s: UserSession) -> None:
+    await s.request("GET", f"{API}/auth/me", f"{API}/auth/me")
+
+# AI actions (run against loadtest/fake_openai.py unless you want a real bill)
+
+async def ai_suggest_recipes(s: UserSession) -> None:
+    await s.request("POST", f"{API}/ai/recipes/suggest", f"{API}/ai/recipes/suggest", json={
+        "ingredients": [name for name, _ in s.rng.sample(INGREDIENTS, 3)]
+    })
+
+async def ai_meal_plan(s: UserSession) -> None:
+    await s.request("POST", f"{API}/ai/meal-plan", f"{API}/ai/meal-plan", json={"days": 3})
+
+async def ai_scale_recipe(s: UserSession) -> None:
+    await s.request("POST", f"{API}/ai/recipes/scale", f"{API}/ai/recipes/scale", json={
+        "recipe": SAMPLE_AI_RECIPE, "target_servings": 4
+    })
+
+async def ai_analyze_recipe(s: UserSession) -> None:
+    await s.request("POST", f"{API}/ai/recipes/analyze", f"{API}/ai/recipes/analyze", json={
+        "recipe": SAMPLE_AI_RECIPE
+    })
+
+Action = Callable[[UserSession], Awaitable[None]]
+
+@dataclass(frozen=True)
+class Scenario:
+    """A weighted mix of actions executed in a loop by every virtual user."""
+
+    name: str
+    description: str
+    actions: Tuple[Tuple[Action, int], ...]
+    think_time: float = 0.0
+
+    def pick(self, rng: random.Random) -> Action:
+        return rng.choices([action for action, _ in self.actions], weights=[weight for _, weight in self.actions])[0]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "household": Scenario(
+        "household",
+        "CRUD-heavy household use: pantry, recipes and shopping list",
+        (
+            (list_inventory, 20),
+            (create_inventory_item, 10),
+            (update_inventory_item, 6),
+            (get_inventory_item, 6),
+            (list_recipes, 10),
+            (create_recipe, 4),
+            (find_recipes_by_ingredients, 8),
+            (get_shopping_list, 15),
+            (add_shopping_item, 8),
+            (shopping_list_from_recipe, 5),
+            (purchase_shopping_item, 6),
+            (read_me, 2),
+        ),
+    ),
+    "login_storm": Scenario(
+        "login_storm",
+        "Many users logging in at once (bcrypt-bound)",
+        ((relogin, 8), (read_me, 2)),
+    ),
+    "ai_burst": Scenario(
+        "ai_burst",
+        "Bursts of AI calls mixed with light browsing",
+        (
+            (ai_suggest_recipes, 6),
+            (ai_meal_plan, 2),
+            (ai_scale_recipe, 3),
+            (ai_analyze_recipe, 3),
+            (list_recipes, 3),
+        ),
+    ),
+}
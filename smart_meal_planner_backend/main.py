@@ -1,66 +1,29 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from prometheus_client import make_asgi_app
-import uvicorn
-import openai
-from config import get_settings
+from config import Settings, get_settings
 from database import engine
-import models
 from api.routes import router as api_router
 from auth.routes import router as auth_router
 from ai.routes import router as ai_router
+from monitoring.logger import configure_logging, get_logger
+from monitoring.metrics import served_by_supervisor, start_metrics_server
 from monitoring.middleware import RequestTracingMiddleware, ResponseTimeMiddleware
+from monitoring.queries import instrument_engine
+from monitoring.runtime import RuntimeMonitor, configure_threadpool
 from monitoring.sentry import init_sentry
-from monitoring.logger import get_logger
-import logging
+from monitoring.timing import TimedJSONResponse
 
-# Get settings
-settings = get_settings()
+# The schema is managed by alembic (`alembic upgrade head`); nothing here touches the database.
+# Importing this module builds no app; servers call the factory (`uvicorn --factory main:create_app`).
 
-# Configure logging
-logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = get_logger(__name__)
 
-# Initialize Sentry
-init_sentry()
-
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
-# Create FastAPI app
-app = FastAPI(
-    title="Smart Meal Planner API",
-    description="API for managing inventory, recipes, and shopping lists with AI-powered suggestions",
-    version="1.0.0",
-    docs_url="/docs" if settings.DEBUG else None,
-    redoc_url="/redoc" if settings.DEBUG else None,
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Add monitoring middleware
-app.add_middleware(RequestTracingMiddleware)
-app.add_middleware(ResponseTimeMiddleware)
-
-# Mount metrics endpoint
-if settings.ENABLE_METRICS:
-    metrics_app = make_asgi_app()
-    app.mount("/metrics", metrics_app)
-
-# Include API routes
-app.include_router(api_router)
-app.include_router(auth_router)
-app.include_router(ai_router)
-
-@app.get("/")
+router = APIRouter()
+
+@router.get("/")
 async def root():
     return {
         "message": "Welcome to Smart Meal Planner API",
@@ -74,19 +37,10 @@ async def root():
         ]
     }
 
-@app.get("/health")
+@router.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
-@app.exception_handler(openai.RateLimitError)
-async def rate_limit_handler(request, exc):
-    logger.error(f"Rate limit error: {exc}")
-    return JSONResponse(
-        status_code=429,
-        content={"detail": str(exc) or "Rate limit exceeded. Please try again later."}
-    )
-
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     logger.error(f"HTTP error: {exc}")
     return JSONResponse(
@@ -94,11 +48,77 @@ async def http_exception_handler(request, exc):
         content={"detail": exc.detail}
     )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-process startup and shutdown; runs in each worker after fork."""
+    settings = app.state.settings
+    configure_threadpool(settings.THREADPOOL_SIZE)
+    # Under serve.py the gunicorn master serves all workers' metrics (serve.when_ready); otherwise
+    # the first worker to bind the port does, aggregated when PROMETHEUS_MULTIPROC_DIR is set
+    if settings.ENABLE_METRICS and not served_by_supervisor() and not start_metrics_server(settings.METRICS_PORT):
+        logger.info("metrics_port_in_use", port=settings.METRICS_PORT)
+
+    # Event loop / threadpool / DB pool saturation gauges
+    runtime_monitor = RuntimeMonitor(engine, interval=settings.RUNTIME_MONITOR_INTERVAL)
+    if settings.ENABLE_RUNTIME_MONITOR:
+        runtime_monitor.start()
+    yield
+    await runtime_monitor.stop()
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the API application."""
+    settings = settings or get_settings()
+
+    configure_logging()
+    # Before the app is built so the integration can instrument its routes
+    init_sentry()
+    # Per-request query metrics and DB timing; hooks every Engine so test and script engines are covered too
+    if settings.ENABLE_QUERY_METRICS or settings.ENABLE_SERVER_TIMING:
+        instrument_engine()
+
+    app = FastAPI(
+        title="Smart Meal Planner API",
+        description="API for managing inventory, recipes, and shopping lists with AI-powered suggestions",
+        version="1.0.0",
+        docs_url="/docs" if settings.DEBUG else None,
+        redoc_url="/redoc" if settings.DEBUG else None,
+        default_response_class=TimedJSONResponse,
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Add monitoring middleware
+    app.add_middleware(RequestTracingMiddleware)
+    app.add_middleware(ResponseTimeMiddleware)
+
+    # Include API routes
+    app.include_router(router)
+    app.include_router(api_router)
+    app.include_router(auth_router)
+    app.include_router(ai_router)
+
+    # Upstream AI rate limits surface as HTTPException(429) from ai.services
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    return app
+
 if __name__ == "__main__":
+    import uvicorn
+
+    settings = get_settings()
     uvicorn.run(
-        "main:app",
+        "main:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower()
-    ) 
\ No newline at end of file
+    )
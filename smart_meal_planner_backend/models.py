@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Boolean, JSON, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, Float, Date, Boolean, JSON, ForeignKey, Index, event, text
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime, UTC
@@ -19,26 +19,48 @@ class User(Base):
     recipes = relationship("Recipe", back_populates="user")
     shopping_list_items = relationship("ShoppingListItem", back_populates="user")
 
+class Ingredient(Base):
+    """Canonical ingredient; ``name`` is the key produced by api.ingredients.normalize_name"""
+    __tablename__ = "ingredients"
+    __table_args__ = (
+        Index("uq_ingredients_name", "name", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+
 class InventoryItem(Base):
     __tablename__ = "inventory"
+    # Every service query is scoped to one user; see tests/test_query_plans.py
+    __table_args__ = (
+        # One row per ingredient and unit dimension; quantities are added (converted to the
+        # row's unit) with an upsert in api/services.py
+        Index("uq_inventory_user_id_ingredient_id_base_unit", "user_id", "ingredient_id", "base_unit", unique=True),
+        Index("ix_inventory_user_id_expiry_date", "user_id", "expiry_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, index=True)  # plus ix_inventory_name_trgm on Postgres, see SEARCH_DDL below
     quantity = Column(Float)
-    unit = Column(String)
+    unit = Column(String)  # Canonical spelling, see api.ingredients.canonical_unit
     expiry_date = Column(Date)
     created_at = Column(Date, default=lambda: datetime.now(UTC).date())
     updated_at = Column(Date, default=lambda: datetime.now(UTC).date(), onupdate=lambda: datetime.now(UTC).date())
     user_id = Column(Integer, ForeignKey("users.id"))
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"))
+    base_unit = Column(String)  # "g", "ml", "pcs", or the unit itself when it has no conversion
     
     # Relationship
     user = relationship("User", back_populates="inventory_items")
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        Index("ix_recipes_user_id_id", "user_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, index=True)  # plus ix_recipes_name_trgm on Postgres, see SEARCH_DDL below
     description = Column(String)
     ingredients = Column(JSON)  # List of ingredients with quantities
     instructions = Column(JSON)  # List of steps
@@ -50,19 +72,129 @@ class Recipe(Base):
     # Relationship
     user = relationship("User", back_populates="recipes")
 
+class RecipeIngredient(Base):
+    """
+    One row per (recipe, ingredient, unit dimension), with the quantity in the base unit:
+    the reverse index from an inventory change to the recipes it affects. Kept by
+    CookabilityService.
+    """
+    __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        Index("ix_recipe_ingredients_user_id_ingredient_id_base_unit", "user_id", "ingredient_id", "base_unit"),
+    )
+    
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), primary_key=True)
+    base_unit = Column(String, primary_key=True)
+    quantity = Column(Float)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+class RecipeCookability(Base):
+    """
+    Materialized "what can I cook" result for one serving of a recipe against the owner's
+    unexpired inventory. Kept by CookabilityService.
+    """
+    __tablename__ = "recipe_cookability"
+    
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    missing_count = Column(Integer)
+    coverage = Column(Float)
+    missing = Column(JSON)  # Absent or short ingredients with required, available and shortfall
+    # Earliest expiry date of the stock counted; the row is stale after it
+    expires_on = Column(Date)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    
+    # Declared after the columns so the index can sort coverage descending, as the reads do
+    __table_args__ = (
+        Index("ix_recipe_cookability_user_id_rank", "user_id", "missing_count", coverage.desc(), "recipe_id"),
+        Index("ix_recipe_cookability_user_id_expires_on", "user_id", "expires_on"),
+    )
+
+# Predicate of the partial unique index on pending shopping-list rows; ON CONFLICT must repeat it
+SHOPPING_LIST_PENDING = text("purchased = false")
+
 class ShoppingListItem(Base):
     __tablename__ = "shopping_list"
+    __table_args__ = (
+        # At most one pending row per ingredient and unit dimension; purchased rows are history
+        Index(
+            "uq_shopping_list_pending_user_id_ingredient_id_base_unit", "user_id", "ingredient_id", "base_unit",
+            unique=True, sqlite_where=SHOPPING_LIST_PENDING, postgresql_where=SHOPPING_LIST_PENDING
+        ),
+        Index("ix_shopping_list_user_id_purchased", "user_id", "purchased"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     quantity = Column(Float)
-    unit = Column(String)
+    unit = Column(String)  # Canonical spelling, see api.ingredients.canonical_unit
     recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=True)
     purchased = Column(Boolean, default=False)
     created_at = Column(Date, default=lambda: datetime.now(UTC).date())
     updated_at = Column(Date, default=lambda: datetime.now(UTC).date(), onupdate=lambda: datetime.now(UTC).date())
     user_id = Column(Integer, ForeignKey("users.id"))
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"))
+    base_unit = Column(String)
     
     # Relationships
     recipe = relationship("Recipe")
-    user = relationship("User", back_populates="shopping_list_items")
\ No newline at end of file
+    user = relationship("User", back_populates="shopping_list_items")
+# Search structures the ORM does not model, created with their tables (and by migrations
+# a7e0c3d915b2 and c4f1a8d2e6b7). Postgres: pg_trgm GIN indexes for fuzzy name search and a
+# generated, weighted tsvector with a GIN index for full-text recipe search. SQLite: an FTS5
+# table holding each recipe's name, description, steps and owner (as a token, so MATCH does
+# the per-user filtering), kept in sync by triggers so bulk inserts and raw SQL are covered.
+RECIPE_FTS_ROW = """
+    (new.id, new.name, new.description,
+     CASE WHEN json_valid(new.instructions)
+          THEN (SELECT group_concat(value, ' / ') FROM json_each(new.instructions))
+          ELSE new.instructions END,
+     new.user_id)"""
+SEARCH_DDL = {
+    ("inventory", "postgresql"): (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_inventory_name_trgm ON inventory USING gin (name gin_trgm_ops)",
+    ),
+    ("recipes", "postgresql"): (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_recipes_name_trgm ON recipes USING gin (name gin_trgm_ops)",
+        """ALTER TABLE recipes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(instructions, '[]'::json)), 'C')
+        ) STORED""",
+        "CREATE INDEX ix_recipes_search_vector ON recipes USING gin (search_vector)",
+    ),
+    ("recipes", "sqlite"): (
+        """CREATE VIRTUAL TABLE recipes_fts USING fts5(
+            name, description, instructions, owner, tokenize = 'porter unicode61 remove_diacritics 2'
+        )""",
+        f"""CREATE TRIGGER recipes_fts_insert AFTER INSERT ON recipes BEGIN
+            INSERT INTO recipes_fts (rowid, name, description, instructions, owner) VALUES {RECIPE_FTS_ROW};
+        END""",
+        f"""CREATE TRIGGER recipes_fts_update AFTER UPDATE OF name, description, instructions, user_id ON recipes BEGIN
+            DELETE FROM recipes_fts WHERE rowid = old.id;
+            INSERT INTO recipes_fts (rowid, name, description, instructions, owner) VALUES {RECIPE_FTS_ROW};
+        END""",
+        """CREATE TRIGGER recipes_fts_delete AFTER DELETE ON recipes BEGIN
+            DELETE FROM recipes_fts WHERE rowid = old.id;
+        END""",
+    ),
+}
+for (table_name, dialect), statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(
+            Base.metadata.tables[table_name], "after_create", DDL(statement).execute_if(dialect=dialect)
+        )
+# The triggers go with the table; the FTS5 table does not
+event.listen(Recipe.__table__, "before_drop", DDL("DROP TABLE IF EXISTS recipes_fts").execute_if(dialect="sqlite"))
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Autogenerate filter: leave the SEARCH_DDL structures (and FTS5 shadow tables) alone"""
+    if type_ == "table":
+        return not (name == "recipes_fts" or name.startswith("recipes_fts_"))
+    if type_ == "index":
+        return name not in {"ix_inventory_name_trgm", "ix_recipes_name_trgm", "ix_recipes_search_vector"}
+    if type_ == "column":
+        return name != "search_vector"
+    return True
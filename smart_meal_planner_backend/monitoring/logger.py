@@ -1,60 +1,130 @@
+import os
 import sys
+import atexit
+import queue
+import random
 import logging
+import logging.handlers
 import structlog
-from pythonjsonlogger import jsonlogger
-from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+from config import get_settings
+from .metrics import log_records_dropped_total
 
-# Configure standard logging
-json_handler = logging.StreamHandler(sys.stdout)
-json_handler.setFormatter(jsonlogger.JsonFormatter())
+settings = get_settings()
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread; never blocks or formats on the caller's thread."""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in-process, so records need no pickling or pre-formatting
+        return record
 
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=[json_handler]
-)
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+            log_records_dropped_total.inc()
 
-# Configure structlog pre-processors
+# Processors shared by structlog events and records from plain `logging` loggers
 pre_chain = [
     structlog.contextvars.merge_contextvars,
-    structlog.processors.add_log_level,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.add_logger_name,
     structlog.processors.TimeStamper(fmt="iso", utc=True),
+    # Resolved on the calling thread, where sys.exc_info() is still set
     structlog.processors.StackInfoRenderer(),
     structlog.processors.format_exc_info,
 ]
 
-# Configure structlog
-structlog.configure(
-    processors=pre_chain + [
-        structlog.processors.JSONRenderer(serializer=lambda obj: obj)
+# JSON rendering happens once, in the writer thread
+json_handler = logging.StreamHandler(sys.stdout)
+json_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+    foreign_pre_chain=pre_chain,
+    processors=[
+        structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+        structlog.processors.JSONRenderer(),
     ],
-    logger_factory=structlog.PrintLoggerFactory(),
-    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
-    cache_logger_on_first_use=True,
-)
+))
+
+queue_handler = _NonBlockingQueueHandler(None)  # queue is attached by _start_writer()
+log_queue: Optional[queue.Queue] = None
+listener: Optional[logging.handlers.QueueListener] = None
+_configured = False
+
+def _start_writer() -> None:
+    """Start the writer thread on a fresh queue; also run in fork()ed children, where threads don't survive."""
+    global log_queue, listener
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler.queue = log_queue
+    listener = logging.handlers.QueueListener(log_queue, json_handler, respect_handler_level=True)
+    listener.start()
+
+def _stop_writer() -> None:
+    """Flush the queue, then report records dropped over the process's lifetime."""
+    listener.stop()
+    if queue_handler.dropped:
+        json_handler.handle(logging.makeLogRecord({
+            "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+            "msg": "log_records_dropped: %d records dropped because the log queue was full",
+            "args": (queue_handler.dropped,),
+        }))
+
+def configure_logging() -> None:
+    """Route stdlib logging and structlog through the background JSON writer. Idempotent."""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    _start_writer()
+    atexit.register(_stop_writer)
+    os.register_at_fork(after_in_child=_start_writer)
+
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL),
+        handlers=[queue_handler],
+        force=True
+    )
+    structlog.configure(
+        processors=pre_chain + [
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, settings.LOG_LEVEL)),
+        cache_logger_on_first_use=True,
+    )
 
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a structured logger instance."""
     return structlog.get_logger(name)
 
+def _sampled_out(status_code: int, duration: float) -> bool:
+    """Whether to skip a request log line; errors and slow requests are always kept."""
+    if settings.LOG_SAMPLE_RATE >= 1.0:
+        return False
+    if status_code >= 400 or duration >= settings.SLOW_REQUEST_THRESHOLD:
+        return False
+    return random.random() >= settings.LOG_SAMPLE_RATE
+
 def log_request_info(logger: structlog.BoundLogger, request_id: str, **kwargs: Any) -> None:
-    """Log request information with structured data."""
-    log_data = {
-        "request_id": request_id,
-        "timestamp": datetime.utcnow().isoformat(),
-        **kwargs
-    }
-    logger.info("request_processed", **log_data)
+    """Log request information with structured data, sampling fast successful requests."""
+    if _sampled_out(kwargs.get("status_code", 500), kwargs.get("duration", 0.0)):
+        return
+    if settings.LOG_SAMPLE_RATE < 1.0:
+        kwargs["sample_rate"] = settings.LOG_SAMPLE_RATE
+    logger.info("request_processed", request_id=request_id, **kwargs)
 
 def log_error(logger: structlog.BoundLogger, error: Exception, context: Dict[str, Any]) -> None:
     """Log error information with structured data."""
-    log_data = {
-        "error_type": type(error).__name__,
-        "error_message": str(error),
-        "timestamp": datetime.utcnow().isoformat(),
+    logger.error(
+        "error_occurred",
+        error_type=type(error).__name__,
+        error_message=str(error),
         **context
-    }
-    logger.error("error_occurred", **log_data)
+    )
 
 def log_api_call(
     logger: structlog.BoundLogger,
@@ -65,12 +135,11 @@ def log_api_call(
     **kwargs: Any
 ) -> None:
     """Log external API call information."""
-    log_data = {
-        "service": service,
-        "operation": operation,
-        "duration_ms": duration_ms,
-        "success": success,
-        "timestamp": datetime.utcnow().isoformat(),
+    logger.info(
+        "api_call",
+        service=service,
+        operation=operation,
+        duration_ms=duration_ms,
+        success=success,
         **kwargs
-    }
-    logger.info("api_call", **log_data) 
\ No newline at end of file
+    )
@@ -1,5 +1,19 @@
-from prometheus_client import Counter, Histogram, Gauge
+import os
+import re
 from typing import Dict, Optional
+from config import get_settings
+
+settings = get_settings()
+API_PREFIX = settings.API_V1_PREFIX
+
+# prometheus_client picks its value backend from the environment when first imported,
+# so a directory configured through .env has to be exported before that import.
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, Gauge, REGISTRY, multiprocess, start_http_server
+
+_LIVE_GAUGE_FILE = re.compile(r"^gauge_live\w+_(\d+)\.db$")
 
 # Request metrics
 http_requests_total = Counter(
@@ -15,6 +29,21 @@ http_request_duration_seconds = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
 )
 
+# Database metrics, per request and labelled by route template
+db_queries_per_request = Histogram(
+    'db_queries_per_request',
+    'Number of SQL statements executed per HTTP request',
+    ['method', 'endpoint'],
+    buckets=[0, 1, 2, 5, 10, 20, 50, 100, 250, 500]
+)
+
+db_duration_per_request_seconds = Histogram(
+    'db_duration_per_request_seconds',
+    'Total time spent executing SQL statements per HTTP request',
+    ['method', 'endpoint'],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+
 # API metrics
 api_calls_total = Counter(
     'api_calls_total',
@@ -29,10 +58,55 @@ api_call_duration_seconds = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
 )
 
+# Logging pipeline
+log_records_dropped_total = Counter(
+    'log_records_dropped_total',
+    'Log records dropped because the writer queue was full'
+)
+
+# Runtime saturation metrics, sampled by monitoring.runtime.RuntimeMonitor
+event_loop_lag_seconds = Gauge(
+    'event_loop_lag_seconds',
+    'Delay between when the monitor callback was scheduled and when it ran',
+    multiprocess_mode='livemax'
+)
+
+threadpool_workers_active = Gauge(
+    'threadpool_workers_active',
+    'Worker threads running sync endpoints and dependencies',
+    multiprocess_mode='livesum'
+)
+
+threadpool_workers_limit = Gauge(
+    'threadpool_workers_limit',
+    'Maximum number of threadpool workers',
+    multiprocess_mode='livesum'
+)
+
+threadpool_tasks_queued = Gauge(
+    'threadpool_tasks_queued',
+    'Sync calls waiting for a free threadpool worker',
+    multiprocess_mode='livesum'
+)
+
+http_requests_in_progress = Gauge(
+    'http_requests_in_progress',
+    'HTTP requests currently being handled',
+    ['route_class'],
+    multiprocess_mode='livesum'
+)
+
+db_pool_connections_checked_out = Gauge(
+    'db_pool_connections_checked_out',
+    'Database connections currently checked out of the pool',
+    multiprocess_mode='livesum'
+)
+
 # Business metrics
 active_users_total = Gauge(
     'active_users_total',
-    'Total number of active users'
+    'Total number of active users',
+    multiprocess_mode='mostrecent'
 )
 
 recipes_created_total = Counter(
@@ -51,9 +125,71 @@ meal_plans_generated_total = Counter(
 rate_limit_remaining = Gauge(
     'rate_limit_remaining',
     'Number of API calls remaining before rate limit',
-    ['service']
+    ['service'],
+    multiprocess_mode='mostrecent'
 )
 
+# Set by serve.py for its workers; other supervisors (uvicorn --workers) leave it to the first worker to bind
+SUPERVISOR_ENV = "METRICS_SERVED_BY_SUPERVISOR"
+
+class _LiveMultiProcessCollector(multiprocess.MultiProcessCollector):
+    """Drops the live-gauge files of workers that have exited before each scrape."""
+
+    def collect(self):
+        reap_dead_workers(self._path)
+        return super().collect()
+
+def multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+def served_by_supervisor() -> bool:
+    """True under serve.py in multiprocess mode, where the gunicorn master serves the metrics."""
+    return os.environ.get(SUPERVISOR_ENV) == "1"
+
+def reap_dead_workers(path: str) -> None:
+    """Mark workers whose pid no longer exists as dead so their live gauges stop counting."""
+    for name in os.listdir(path):
+        match = _LIVE_GAUGE_FILE.match(name)
+        if not match:
+            continue
+        pid = int(match.group(1))
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            multiprocess.mark_process_dead(pid, path)
+        except PermissionError:
+            pass
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: aggregated over all workers in multiprocess mode, else this process."""
+    path = multiprocess_dir()
+    if not path:
+        return REGISTRY
+    registry = CollectorRegistry()
+    _LiveMultiProcessCollector(registry, path)
+    return registry
+
+def start_metrics_server(port: int) -> bool:
+    """
+    Serve metrics on a dedicated port, away from API traffic. Returns False if the
+    port is taken, e.g. by another worker that already serves the aggregated view.
+    """
+    try:
+        start_http_server(port, registry=metrics_registry())
+    except OSError:
+        return False
+    return True
+
+def route_class(path: str) -> str:
+    """Coarse, low-cardinality class of a request path: health, ai, auth or crud."""
+    if path in ("/", "/health") or path.startswith("/metrics"):
+        return "health"
+    if path.startswith(f"{API_PREFIX}/ai/"):
+        return "ai"
+    if path.startswith(f"{API_PREFIX}/auth/"):
+        return "auth"
+    return "crud"
+
 def track_request_duration(duration: float, method: str, endpoint: str) -> None:
     """Track HTTP request duration."""
     http_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration)
@@ -62,6 +198,30 @@ def track_request(method: str, endpoint: str, status: int) -> None:
     """Track HTTP request."""
     http_requests_total.labels(method=method, endpoint=endpoint, status=status).inc()
 
+def track_db_queries(query_count: int, duration: float, method: str, endpoint: str) -> None:
+    """Track SQL statements executed by a single HTTP request."""
+    db_queries_per_request.labels(method=method, endpoint=endpoint).observe(query_count)
+    db_duration_per_request_seconds.labels(method=method, endpoint=endpoint).observe(duration)
+
+def track_in_progress(path: str):
+    """Context manager counting a request as in flight for its route class."""
+    return http_requests_in_progress.labels(route_class=route_class(path)).track_inprogress()
+
+def track_runtime(
+    loop_lag: float,
+    threads_active: int,
+    threads_limit: int,
+    threads_queued: int,
+    db_checked_out: Optional[int] = None
+) -> None:
+    """Track event loop, threadpool and DB pool saturation."""
+    event_loop_lag_seconds.set(loop_lag)
+    threadpool_workers_active.set(threads_active)
+    threadpool_workers_limit.set(threads_limit)
+    threadpool_tasks_queued.set(threads_queued)
+    if db_checked_out is not None:
+        db_pool_connections_checked_out.set(db_checked_out)
+
 def track_api_call(
     duration: float,
     service: str,
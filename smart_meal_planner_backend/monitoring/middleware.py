@@ -4,10 +4,38 @@ from typing import Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
-from . import metrics
+from config import get_settings
+from . import metrics, queries, timing
 from .logger import get_logger, log_request_info
+from .sentry import sampler
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+def route_template(request: Request) -> str:
+    """Path template of the matched route (e.g. /api/v1/recipes/{recipe_id}), set once routing has run."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+def record_query_stats(request: Request, stats: queries.QueryStats, request_id: str) -> None:
+    """Export the request's SQL stats and warn about statements repeated in a loop (N+1)."""
+    endpoint = route_template(request)
+    metrics.track_db_queries(
+        query_count=stats.count,
+        duration=stats.duration,
+        method=request.method,
+        endpoint=endpoint
+    )
+    for statement, count in stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+        logger.warning(
+            "repeated_query",
+            request_id=request_id,
+            method=request.method,
+            endpoint=endpoint,
+            statement=statement,
+            count=count,
+            threshold=settings.QUERY_REPEAT_THRESHOLD
+        )
 
 class RequestTracingMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp) -> None:
@@ -16,13 +44,16 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
+        query_stats = queries.start_request() if settings.ENABLE_QUERY_METRICS else None
+        request_timing = timing.start_request() if settings.ENABLE_SERVER_TIMING else None
         
         # Start timing
         start_time = time.time()
         
         # Process request
         try:
-            response = await call_next(request)
+            with metrics.track_in_progress(request.url.path):
+                response = await call_next(request)
             duration = time.time() - start_time
             
             # Track metrics
@@ -36,6 +67,17 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 endpoint=request.url.path
             )
+            if query_stats is not None:
+                record_query_stats(request, query_stats, request_id)
+            if settings.SENTRY_DSN:
+                sampler.observe(request.url.path, duration, response.status_code >= 500)
+            
+            # Per-request breakdown for the log line
+            breakdown = {}
+            if query_stats is not None:
+                breakdown.update(db_queries=query_stats.count, db_duration=query_stats.duration)
+            if request_timing is not None:
+                breakdown.update(request_timing.log_fields())
             
             # Log request info
             log_request_info(
@@ -46,11 +88,14 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
                 status_code=response.status_code,
                 duration=duration,
                 user_agent=request.headers.get("user-agent"),
-                client_host=request.client.host if request.client else None
+                client_host=request.client.host if request.client else None,
+                **breakdown
             )
             
-            # Add request ID to response headers
+            # Add request ID and timing breakdown to response headers
             response.headers["X-Request-ID"] = request_id
+            if request_timing is not None:
+                response.headers["Server-Timing"] = request_timing.server_timing()
             return response
             
         except Exception as e:
@@ -66,6 +111,10 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 endpoint=request.url.path
             )
+            if query_stats is not None:
+                record_query_stats(request, query_stats, request_id)
+            if settings.SENTRY_DSN:
+                sampler.observe(request.url.path, duration, True)
             
             # Log error
             logger.error(
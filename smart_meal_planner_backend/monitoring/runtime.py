@@ -0,0 +1,59 @@
+import asyncio
+from typing import Optional
+
+from anyio import to_thread
+from sqlalchemy.engine import Engine
+
+from . import metrics
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+def configure_threadpool(size: int) -> None:
+    """Set how many sync endpoints/dependencies may run at once; call from the event loop."""
+    to_thread.current_default_thread_limiter().total_tokens = size
+
+class RuntimeMonitor:
+    """
+    Background task sampling event-loop lag (how late a scheduled wake-up runs),
+    threadpool usage and DB pool checkouts into Prometheus gauges.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, interval: float = 0.5) -> None:
+        self.engine = engine
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def sample(self, loop_lag: float) -> None:
+        limiter = to_thread.current_default_thread_limiter()
+        checkedout = getattr(self.engine.pool, "checkedout", None) if self.engine is not None else None
+        metrics.track_runtime(
+            loop_lag=loop_lag,
+            threads_active=limiter.borrowed_tokens,
+            threads_limit=int(limiter.total_tokens),
+            threads_queued=limiter.statistics().tasks_waiting,
+            db_checked_out=checkedout() if checkedout else None
+        )
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            try:
+                self.sample(max(0.0, loop.time() - expected))
+            except Exception as e:
+                logger.warning("runtime_monitor_failed", error=str(e))
@@ -1,26 +1,77 @@
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
-from typing import Optional
+from collections import deque
+from typing import Any, Dict, Optional
 from config import get_settings
+from .metrics import route_class
 
 settings = get_settings()
 
+class AdaptiveSampler:
+    """
+    Sentry traces_sampler that picks a rate per route class (AI routes high, health
+    checks and CRUD low) and boosts it for slow route classes or a rising error rate.
+    """
+
+    def __init__(self, window: int = 200, smoothing: float = 0.1) -> None:
+        self.outcomes: deque = deque(maxlen=window)
+        self.failures = 0
+        self.smoothing = smoothing
+        self.latency: Dict[str, float] = {}  # route class -> smoothed duration in seconds
+
+    def observe(self, path: str, duration: float, failed: bool) -> None:
+        """Feed back a finished request."""
+        if len(self.outcomes) == self.outcomes.maxlen:
+            self.failures -= self.outcomes[0]
+        self.outcomes.append(failed)
+        self.failures += failed
+
+        cls = route_class(path)
+        previous = self.latency.get(cls)
+        self.latency[cls] = duration if previous is None else previous + self.smoothing * (duration - previous)
+
+    def error_rate(self) -> float:
+        return self.failures / len(self.outcomes) if self.outcomes else 0.0
+
+    def rate_for(self, path: str) -> float:
+        cls = route_class(path)
+        if cls == "health":
+            return settings.SENTRY_HEALTH_TRACES_SAMPLE_RATE
+        rate = settings.SENTRY_AI_TRACES_SAMPLE_RATE if cls == "ai" else settings.SENTRY_TRACES_SAMPLE_RATE
+        if (
+            self.latency.get(cls, 0.0) >= settings.SLOW_REQUEST_THRESHOLD
+            or self.error_rate() >= settings.SENTRY_ERROR_RATE_THRESHOLD
+        ):
+            rate = max(rate, settings.SENTRY_BOOSTED_TRACES_SAMPLE_RATE)
+        return rate
+
+    def __call__(self, sampling_context: Dict[str, Any]) -> float:
+        # Keep distributed traces whole
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return float(parent_sampled)
+        scope = sampling_context.get("asgi_scope") or {}
+        return self.rate_for(scope.get("path", ""))
+
+sampler = AdaptiveSampler()
+
 def init_sentry(environment: Optional[str] = None) -> None:
     """Initialize Sentry SDK with FastAPI and SQLAlchemy integrations."""
     if settings.SENTRY_DSN:
+        # Imported here so the SDK is only loaded when Sentry is configured
+        import sentry_sdk
+        from sentry_sdk.integrations.fastapi import FastApiIntegration
+        from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+
         sentry_sdk.init(
             dsn=settings.SENTRY_DSN,
             environment=environment or settings.ENVIRONMENT,
             integrations=[
                 FastApiIntegration(
                     transaction_style="endpoint",
-                    middleware_spans=True,
                 ),
                 SqlalchemyIntegration(),
             ],
-            traces_sample_rate=1.0,
-            profiles_sample_rate=1.0,
+            traces_sampler=sampler,
+            profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
             send_default_pii=False,
             before_send=before_send,
             before_breadcrumb=before_breadcrumb,
@@ -0,0 +1,71 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+class RequestTiming:
+    """Time spent per phase (db, auth, ai, render) while handling a single request."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, phase: str, duration: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def server_timing(self) -> str:
+        """Render as a Server-Timing header value, durations in milliseconds."""
+        entries = [f"{phase};dur={duration * 1000:.2f}" for phase, duration in self.phases.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.2f}")
+        return ", ".join(entries)
+
+    def log_fields(self) -> Dict[str, float]:
+        return {f"{phase}_duration": duration for phase, duration in self.phases.items()}
+
+class _PhaseTimer:
+    __slots__ = ("timing", "phase", "start")
+
+    def __init__(self, timing: RequestTiming, phase: str) -> None:
+        self.timing = timing
+        self.phase = phase
+
+    def __enter__(self) -> "_PhaseTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timing.add(self.phase, time.perf_counter() - self.start)
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+_NOT_TIMED = nullcontext()
+
+def start_request() -> RequestTiming:
+    """Begin collecting phase timings for the current request context."""
+    timing = RequestTiming()
+    _current_timing.set(timing)
+    return timing
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current_timing.get()
+
+def record(phase: str, duration: float) -> None:
+    """Add an already measured duration to the current request, if it is being timed."""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(phase, duration)
+
+def timed(phase: str):
+    """Context manager timing a block into ``phase``; a no-op outside a timed request."""
+    timing = _current_timing.get()
+    if timing is None:
+        return _NOT_TIMED
+    return _PhaseTimer(timing, phase)
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records body encoding under the ``render`` phase."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("render"):
+            return super().render(content)
@@ -0,0 +1,122 @@
+"""
+Production entry point: gunicorn supervising uvicorn workers.
+
+    python serve.py
+
+Runs one worker per core by default (``WORKERS``), preloads the app in the master
+so workers share imported code copy-on-write, uses uvloop/httptools when they are
+installed, recycles workers after ``WORKER_MAX_REQUESTS`` requests or past
+``WORKER_MAX_RSS_MB`` of resident memory, and drains in-flight requests for up to
+``GRACEFUL_TIMEOUT`` seconds on SIGTERM. ``python main.py`` remains the
+single-process development server.
+"""
+import os
+import resource
+import signal
+import tempfile
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from config import Settings, get_settings
+
+settings = get_settings()
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # No procfs (macOS): fall back to the peak, reported in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+
+class RecyclingUvicornWorker(UvicornWorker):
+    """UvicornWorker that restarts itself gracefully once it grows past WORKER_MAX_RSS_MB."""
+
+    CONFIG_KWARGS = {
+        "loop": "auto",  # uvloop when installed
+        "http": "auto",  # httptools when installed
+        "timeout_graceful_shutdown": settings.GRACEFUL_TIMEOUT,
+    }
+
+    async def callback_notify(self) -> None:
+        await super().callback_notify()
+        if settings.WORKER_MAX_RSS_MB and rss_mb() > settings.WORKER_MAX_RSS_MB:
+            self.log.info("Worker %s above %s MB RSS, recycling", self.pid, settings.WORKER_MAX_RSS_MB)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+def prepare_multiprocess_dir(path: str) -> None:
+    """
+    Create ``path`` or clear metric files left by a previous run. Runs before
+    prometheus_client is imported, which opens this process's files in it.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+def when_ready(server: Any) -> None:
+    # In multiprocess mode the master serves the metrics aggregated over all workers, which
+    # skip it; a single worker without a multiprocess dir serves its own
+    from monitoring.metrics import served_by_supervisor, start_metrics_server
+    if settings.ENABLE_METRICS and served_by_supervisor():
+        if not start_metrics_server(settings.METRICS_PORT):
+            server.log.warning("Metrics port %s is in use", settings.METRICS_PORT)
+
+def post_fork(server: Any, worker: Any) -> None:
+    # Connections opened in the master must not be shared with the children
+    from database import engine
+    engine.dispose(close=False)
+
+def child_exit(server: Any, worker: Any) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+def gunicorn_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": settings.WORKERS or os.cpu_count() or 1,
+        "worker_class": "serve.RecyclingUvicornWorker",
+        "preload_app": settings.PRELOAD_APP,
+        "max_requests": settings.WORKER_MAX_REQUESTS,
+        "max_requests_jitter": settings.WORKER_MAX_REQUESTS_JITTER,
+        "timeout": settings.WORKER_TIMEOUT,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+        "keepalive": settings.KEEPALIVE,
+        "loglevel": settings.LOG_LEVEL.lower(),
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }
+
+class Application(BaseApplication):
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        from main import create_app
+        return create_app()
+
+def main() -> None:
+    options = gunicorn_options(settings)
+    path = settings.PROMETHEUS_MULTIPROC_DIR
+    if not path and options["workers"] > 1:
+        path = os.path.join(tempfile.gettempdir(), f"smp-metrics-{settings.PORT}")
+    if path:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+        prepare_multiprocess_dir(path)
+        # The master serves the aggregated metrics, so the workers' lifespans skip it
+        from monitoring.metrics import SUPERVISOR_ENV
+        os.environ[SUPERVISOR_ENV] = "1"
+    Application(options).run()
+
+if __name__ == "__main__":
+    main()
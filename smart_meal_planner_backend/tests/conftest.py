@@ -1,25 +1,24 @@
 import pytest
+from fastapi import Depends
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
-from database import Base, get_db
-from main import app
+from api.services import FuzzySearchService
+from auth.utils import get_current_active_user
+from database import Base, create_db_engine, get_db
+from main import create_app
+from models import User
 
-# Create in-memory SQLite database for testing
+# Create in-memory SQLite database for testing, with the production connection pragmas
 SQLALCHEMY_DATABASE_URL = "sqlite://"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @pytest.fixture
 def db_session():
     Base.metadata.create_all(bind=engine)
+    FuzzySearchService.clear()  # ids restart with every database
     db = TestingSessionLocal()
     try:
         yield db
@@ -27,8 +26,12 @@ def db_session():
         db.close()
         Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
 @pytest.fixture
-def client(db_session):
+def client(app, db_session):
     def override_get_db():
         try:
             yield db_session
@@ -39,6 +42,23 @@ def client(db_session):
     yield TestClient(app)
     del app.dependency_overrides[get_db]
 
+@pytest.fixture
+def current_user(db_session):
+    user = User(username="cook", email="cook@example.com", hashed_password="not-a-real-hash")
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+@pytest.fixture
+def auth_client(app, client, current_user):
+    """``client`` signed in as ``current_user``, loaded through the request's session"""
+    def override_get_current_active_user(db=Depends(get_db)):
+        return db.get(User, current_user)
+
+    app.dependency_overrides[get_current_active_user] = override_get_current_active_user
+    yield client
+    del app.dependency_overrides[get_current_active_user]
+
 @pytest.fixture
 def sample_recipe():
     return {
@@ -1,12 +1,9 @@
 import pytest
 from unittest.mock import patch, AsyncMock
 import json
-from fastapi.testclient import TestClient
-from main import app
 import openai
 from fastapi import HTTPException
 
-client = TestClient(app)
 
 @pytest.fixture
 def test_user():
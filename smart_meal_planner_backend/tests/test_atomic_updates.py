@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from api import schemas
+from api.services import InventoryService, RecipeService, ShoppingListService
+from database import Base, create_db_engine
+from models import InventoryItem, ShoppingListItem, User
+
+THREADS = 8
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'atomic.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def user_id(session_factory):
+    with session_factory() as db:
+        user = User(username="household", email="household@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        return user.id
+
+def run_concurrently(session_factory, user_id, fn, times=THREADS):
+    """Run ``fn(db, user)`` from ``times`` threads at once, each with its own session."""
+    barrier = threading.Barrier(times)
+    errors = []
+
+    def worker():
+        with session_factory() as db:
+            user = db.get(User, user_id)
+            barrier.wait()
+            try:
+                fn(db, user)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(times)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_concurrent_restocks_are_all_counted(session_factory, user_id):
+    item = schemas.InventoryItemCreate(name="Rice", quantity=1, unit="kg")
+    run_concurrently(session_factory, user_id, lambda db, user: InventoryService.create_item(db, item, user))
+
+    with session_factory() as db:
+        assert db.scalars(select(InventoryItem.quantity)).all() == [THREADS]
+
+def test_concurrent_recipe_lists_add_up(session_factory, user_id):
+    with session_factory() as db:
+        recipe = RecipeService.create_recipe(db, schemas.RecipeCreate(
+            name="Omelette", description="Eggs", prep_time=5, instructions=["Whisk", "Fry"],
+            ingredients=[{"name": "Eggs", "quantity": 2, "unit": "pcs"}]
+        ), db.get(User, user_id))
+        recipe_id = recipe.id
+
+    run_concurrently(
+        session_factory, user_id, lambda db, user: ShoppingListService.generate_from_recipe(db, recipe_id, user)
+    )
+
+    with session_factory() as db:
+        assert db.scalars(select(ShoppingListItem.quantity)).all() == [2 * THREADS]
+
+def test_concurrent_purchases_restock_once(session_factory, user_id):
+    with session_factory() as db:
+        item = ShoppingListService.create_item(
+            db, schemas.ShoppingListItemCreate(name="Milk", quantity=1, unit="l"), db.get(User, user_id)
+        )
+        item_id = item.id
+
+    run_concurrently(
+        session_factory, user_id, lambda db, user: ShoppingListService.mark_as_purchased(db, item_id, user)
+    )
+
+    with session_factory() as db:
+        assert db.scalars(select(InventoryItem.quantity)).all() == [1]
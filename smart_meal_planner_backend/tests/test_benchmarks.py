@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.importtime import ROOT, parse_importtime
+from benchmarks.services import make_engine, run_benchmarks, seed
+
+def test_service_benchmarks_smoke():
+    engine = make_engine("sqlite")
+    user_id = seed(engine, {"inventory": 50, "recipes": 20, "shopping": 100})
+
+    results = run_benchmarks(engine, user_id, iterations=2)
+
+    assert "RecipeService.find_recipes_by_ingredients" in results
+    assert "ShoppingListService.mark_as_purchased" in results
+    for stats in results.values():
+        assert stats["errors"] == 0
+        assert stats["p99_ms"] >= stats["p50_ms"]
+
+IMPORTTIME_SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     config
+import time:      2000 |       5000 |   database
+import time:       300 |       8000 | main
+"""
+
+def test_parse_importtime():
+    entries = parse_importtime(IMPORTTIME_SAMPLE)
+    assert [(e.module, e.depth, e.cumulative_us) for e in entries] == [
+        ("config", 2, 120), ("database", 1, 5000), ("main", 0, 8000)
+    ]
+
+def test_main_import_has_no_heavy_side_effects():
+    code = "import sys, main; print(sorted({'openai', 'sentry_sdk', 'uvicorn'} & set(sys.modules)))"
+    env = {**os.environ, "SENTRY_DSN": ""}  # Sentry is only imported when configured
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+def test_db_concurrency_benchmark_smoke():
+    from benchmarks.db_concurrency import run_benchmark
+
+    results = run_benchmark("tuned", threads=4, duration=0.5, write_ratio=0.5, inventory=20)
+
+    assert set(results) == {"tuned read", "tuned write", "tuned total"}
+    assert results["tuned total"]["count"] > 0
+    assert results["tuned total"]["errors"] == 0
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from api import schemas
+from api.cookability import CookabilityIndex
+from api.services import CookabilityService, InventoryService, RecipeService, ShoppingListService
+from benchmarks.seed import migrate, seed_database
+from database import Base
+from models import InventoryItem, Recipe, RecipeCookability, User
+
+RECIPES = [
+    (1, [{"name": "Rice", "quantity": 200, "unit": "g"}, {"name": "Eggs", "quantity": 2, "unit": "pcs"}]),
+    (2, [{"name": "Rice", "quantity": 100, "unit": "g"}, {"name": "rice", "quantity": 100, "unit": "g"}]),
+    (3, [{"name": "Rice", "quantity": 1, "unit": "kg"}]),
+    (4, []),
+]
+
+def test_ingredients_get_dense_ids_per_name_and_base_unit():
+    index = CookabilityIndex(RECIPES)
+
+    assert index.ingredients == [("Rice", "g"), ("Eggs", "pcs")]
+    assert index.required == [0b11, 0b01, 0b01, 0]
+    # repeated ingredients add up, in the base unit
+    assert index.quantities[1] == {0: 200}
+    assert index.quantities[2] == {0: 1000}
+
+def test_stock_ignores_unused_and_empty_items():
+    index = CookabilityIndex(RECIPES)
+
+    in_stock, available = index.stock([
+        ("RICE", "g", 150), ("rice", "Grams", 50), ("Rice", "kg", 0.5), ("Eggs", "pcs", 0), ("Tea", "g", 10)
+    ])
+
+    assert in_stock == 0b01
+    assert list(available) == [700, 0]
+
+def test_match_ranks_by_missing_then_coverage():
+    index = CookabilityIndex(RECIPES)
+    stock = [("Rice", "g", 200), ("Eggs", "pcs", 1)]
+
+    assert [m["recipe_id"] for m in index.match(stock)] == [2, 4]
+    matches = index.match(stock, max_missing=1)
+    assert [(m["recipe_id"], m["missing_count"], m["coverage"]) for m in matches] == [
+        (2, 0, 1.0), (4, 0, 1.0), (1, 1, 0.5), (3, 1, 0.0)
+    ]
+    assert matches[2]["missing"] == [
+        {"name": "Eggs", "unit": "pcs", "required": 2, "available": 1, "shortfall": 1}
+    ]
+    assert [m["recipe_id"] for m in index.match(stock, servings=2, limit=1)] == [4]
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cookability.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.add(User(username="cook", email="cook@example.com", hashed_password="x"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+def add_recipe(db, name, ingredients):
+    return RecipeService.create_recipe(db, schemas.RecipeCreate(
+        name=name, description=name, instructions=["Cook"], prep_time=10,
+        ingredients=[{"name": n, "quantity": q, "unit": u} for n, q, u in ingredients]
+    ), db.scalar(select(User))).id
+
+def view(db):
+    return {row.recipe_id: row.missing_count for row in db.scalars(select(RecipeCookability))}
+
+def test_inventory_writes_refresh_only_affected_recipes(db, monkeypatch):
+    user = db.scalar(select(User))
+    omelette = add_recipe(db, "Omelette", [("Eggs", 2, "pcs"), ("Milk", 50, "ml")])
+    toast = add_recipe(db, "Toast", [("Bread", 2, "slices")])
+    assert view(db) == {omelette: 2, toast: 1}
+
+    refreshed = []
+    original = CookabilityService.refresh_recipes
+    monkeypatch.setattr(CookabilityService, "refresh_recipes", staticmethod(
+        lambda db, user_id, recipe_ids, **kwargs: refreshed.append(sorted(recipe_ids))
+        or original(db, user_id, recipe_ids, **kwargs)
+    ))
+
+    eggs = InventoryService.create_item(db, schemas.InventoryItemCreate(name="eggs", quantity=6, unit="pcs"), user)
+    assert refreshed == [[omelette]]
+    assert view(db) == {omelette: 1, toast: 1}
+
+    milk = ShoppingListService.create_item(
+        db, schemas.ShoppingListItemCreate(name="Milk", quantity=1000, unit="ml"), user
+    )
+    ShoppingListService.mark_as_purchased(db, milk.id, user)
+    assert view(db) == {omelette: 0, toast: 1}
+
+    InventoryService.update_item(db, eggs.id, schemas.InventoryItemCreate(name="Eggs", quantity=1, unit="pcs"), user)
+    assert view(db) == {omelette: 1, toast: 1}
+
+    InventoryService.create_item(db, schemas.InventoryItemCreate(name="Tea", quantity=1, unit="box"), user)
+    InventoryService.delete_item(db, eggs.id, user)
+    assert refreshed[-2:] == [[], [omelette]]
+    assert view(db) == {omelette: 1, toast: 1}
+
+    RecipeService.delete_recipe(db, toast, user)
+    assert view(db) == {omelette: 1}
+
+def test_reads_fill_missing_and_expired_rows(db):
+    user = db.scalar(select(User))
+    tomorrow = date.today() + timedelta(days=1)
+    InventoryService.create_item(
+        db, schemas.InventoryItemCreate(name="Spinach", quantity=200, unit="g", expiry_date=tomorrow), user
+    )
+    salad = add_recipe(db, "Salad", [("Spinach", 100, "g")])
+    # bulk-imported recipes get their rows on the next read
+    RecipeService.import_recipes(db, [schemas.RecipeCreate(
+        name="Soup", description="Soup", instructions=["Cook"], prep_time=20,
+        ingredients=[{"name": "Spinach", "quantity": 200, "unit": "g"}]
+    )], user)
+    soup = db.scalar(select(Recipe.id).where(Recipe.name == "Soup"))
+    assert view(db) == {salad: 0}
+
+    assert [m["recipe"].id for m in RecipeService.find_cookable(db, user)] == [salad, soup]
+    assert db.get(RecipeCookability, salad).expires_on == tomorrow
+
+    # two days on: the spinach has expired without any write
+    yesterday = date.today() - timedelta(days=1)
+    db.execute(update(InventoryItem).values(expiry_date=yesterday))
+    db.execute(update(RecipeCookability).values(expires_on=yesterday))
+    db.commit()
+    assert RecipeService.find_cookable(db, user) == []
+    assert view(db) == {salad: 1, soup: 1}
+
+def test_view_matches_computed_ranking(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seeded.db'}")
+    migrate(engine)
+    [user_id] = seed_database(engine, 1, {"inventory": 60, "recipes": 80, "shopping": 0}, password_hash="x")
+    with Session(engine) as db:
+        user = db.get(User, user_id)
+        index = CookabilityIndex(db.execute(select(Recipe.id, Recipe.ingredients)))
+        stock = db.execute(
+            select(InventoryItem.name, InventoryItem.unit, InventoryItem.quantity)
+            .where(InventoryItem.expiry_date.is_(None) | (InventoryItem.expiry_date >= date.today()))
+        ).all()
+        for max_missing in (0, 1, 3):
+            from_view = RecipeService.find_cookable(db, user, max_missing, limit=100)
+            computed = index.match(stock, max_missing, limit=100)
+            assert [(m["recipe"].id, m["missing_count"]) for m in from_view] == [
+                (m["recipe_id"], m["missing_count"]) for m in computed
+            ]
@@ -0,0 +1,42 @@
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from config import get_settings
+from database import create_db_engine
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+def test_sqlite_file_engine_applies_pragmas(tmp_path):
+    settings = get_settings()
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+    assert _pragma(engine, "cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+    assert _pragma(engine, "foreign_keys") == 1
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    engine.dispose()
+
+def test_sqlite_memory_engine_skips_wal():
+    engine = create_db_engine("sqlite://")
+    assert _pragma(engine, "journal_mode") == "memory"
+    assert _pragma(engine, "busy_timeout") == get_settings().SQLITE_BUSY_TIMEOUT_MS
+
+def test_server_engine_pool_from_settings(monkeypatch):
+    settings = get_settings().model_copy(update={
+        "DB_POOL_SIZE": 7, "DB_MAX_OVERFLOW": 3, "DB_POOL_TIMEOUT": 12, "DB_POOL_PRE_PING": True
+    })
+    captured = {}
+    monkeypatch.setattr("database.create_engine", lambda url, **kwargs: captured.update(kwargs))
+
+    create_db_engine("postgresql://user@localhost/app", settings)
+
+    assert captured["pool_size"] == 7
+    assert captured["max_overflow"] == 3
+    assert captured["pool_timeout"] == 12
+    assert captured["pool_pre_ping"] is True
+    assert captured["pool_recycle"] == settings.DB_POOL_RECYCLE
@@ -0,0 +1,54 @@
+import gzip
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from api.services import ExportService
+from benchmarks.seed import migrate, seed_database
+from models import User
+
+def parse_ndjson(body: bytes):
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+def test_export_streams_ndjson(auth_client, sample_inventory_item, sample_recipe):
+    auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
+    recipe = auth_client.post("/api/v1/recipes/", json=sample_recipe).json()
+    auth_client.post("/api/v1/shopping-list/", json={"name": "Basil", "quantity": 1, "unit": "bunch"})
+
+    response = auth_client.get("/api/v1/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+
+    records = parse_ndjson(response.content)
+    assert [r["type"] for r in records] == ["export", "inventory", "recipe", "shopping_list"]
+    assert records[1]["data"]["name"] == sample_inventory_item["name"]
+    assert records[1]["data"]["expiry_date"] == sample_inventory_item["expiry_date"]
+    assert records[2]["data"]["id"] == recipe["id"]
+    assert records[2]["data"]["ingredients"] == sample_recipe["ingredients"]
+    assert "user_id" not in records[3]["data"]
+
+def test_export_gzip(auth_client, sample_inventory_item):
+    auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
+
+    response = auth_client.get("/api/v1/export", params={"compress": True})
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.ndjson.gz"')
+
+    records = parse_ndjson(gzip.decompress(response.content))
+    assert [r["type"] for r in records] == ["export", "inventory"]
+
+def test_export_emits_one_chunk_per_batch(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    migrate(engine)
+    user_id, _ = seed_database(
+        engine, 2, {"inventory": 25, "recipes": 0, "shopping": 0}, password_hash="x"
+    )
+    db = Session(engine)
+
+    chunks = list(ExportService.stream_ndjson(db, db.get(User, user_id), batch_size=10))
+
+    # header, then inventory in batches of 10, 10 and 5; only this user's rows
+    assert [chunk.count(b"\n") for chunk in chunks] == [1, 10, 10, 5]
+    assert b'"type": "recipe"' not in b"".join(chunks)
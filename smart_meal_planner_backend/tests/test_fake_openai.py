@@ -0,0 +1,110 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+from ai import schemas
+from ai.services import _client
+from config import get_settings
+from loadtest import canned_responses
+from loadtest.fake_openai import FakeProviderSettings, LatencyModel, create_app
+
+@pytest.fixture
+def fake_client():
+    return TestClient(create_app(FakeProviderSettings(SEED=1)))
+
+@pytest.fixture
+def fake_server():
+    """The fake provider served over HTTP on a free port; yields its OpenAI base URL"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(create_app(FakeProviderSettings(SEED=1)), log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}/v1"
+    server.should_exit = True
+    thread.join()
+
+def chat(client, prompt, **kwargs):
+    return client.post("/v1/chat/completions", json={
+        "model": "gpt-4",
+        "messages": [
+            {"role": "system", "content": "You are a professional chef."},
+            {"role": "user", "content": prompt}
+        ],
+        **kwargs
+    })
+
+@pytest.mark.parametrize("payload,model", [
+    (canned_responses.RECIPE_SUGGESTIONS, schemas.RecipeSuggestionResponse),
+    (canned_responses.MEAL_PLAN, schemas.MealPlanResponse),
+    ({"scaled_recipe": canned_responses.AI_RECIPE}, schemas.RecipeScalingResponse),
+    (canned_responses.NUTRITION_ANALYSIS, schemas.NutritionAnalysisResponse),
+    (canned_responses.SUBSTITUTIONS, schemas.SubstitutionResponse),
+    (canned_responses.FUSION, schemas.FusionResponse),
+    (canned_responses.TUTORIAL, schemas.TutorialResponse),
+    (canned_responses.SEASONAL_MENU, schemas.SeasonalMenuResponse),
+    (canned_responses.OPTIMIZED_MEAL_PLAN, schemas.OptimizationResponse),
+    (canned_responses.ADAPTED_RECIPE, schemas.AdaptationResponse),
+])
+def test_canned_responses_match_schemas(payload, model):
+    model.model_validate(payload)
+
+def test_chat_completion_routes_prompt(fake_client):
+    response = chat(fake_client, "Create an optimized meal plan for weight_loss")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["object"] == "chat.completion"
+    content = json.loads(data["choices"][0]["message"]["content"])
+    schemas.OptimizationResponse.model_validate(content)
+    assert data["usage"]["completion_tokens"] > 0
+
+def test_streaming_chunks(fake_client):
+    response = chat(fake_client, "Create a 7-day meal plan with 3 meals per day.", stream=True)
+    assert response.status_code == 200
+    events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    content = "".join(
+        json.loads(event)["choices"][0]["delta"].get("content", "")
+        for event in events[:-1]
+    )
+    schemas.MealPlanResponse.model_validate(json.loads(content))
+
+def test_rate_limit_injection():
+    client = TestClient(create_app(FakeProviderSettings(RATE_LIMIT_RATE=1.0, RETRY_AFTER_SECONDS=3)))
+    response = chat(client, "suggest 3 recipes")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+    assert response.json()["error"]["code"] == "rate_limit_exceeded"
+
+def test_error_injection():
+    client = TestClient(create_app(FakeProviderSettings(ERROR_RATE=1.0)))
+    response = chat(client, "suggest 3 recipes")
+    assert response.status_code == 500
+
+def test_latency_model_distributions():
+    import random
+    for distribution in ("constant", "uniform", "normal", "lognormal", "exponential"):
+        model = LatencyModel(distribution, 100, 20, random.Random(0))
+        samples = [model.sample() for _ in range(2000)]
+        assert all(sample >= 0 for sample in samples)
+        assert 0.08 < sum(samples) / len(samples) < 0.12
+
+    with pytest.raises(ValueError):
+        LatencyModel("bimodal", 100, 20, random.Random(0))
+
+def test_ai_route_end_to_end(fake_server, auth_client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "OPENAI_BASE_URL", fake_server)
+    _client.cache_clear()
+    try:
+        response = auth_client.post("/api/v1/ai/recipes/suggest", json={"ingredients": ["chicken", "rice"]})
+    finally:
+        _client.cache_clear()
+    assert response.status_code == 200
+    assert response.json() == canned_responses.RECIPE_SUGGESTIONS
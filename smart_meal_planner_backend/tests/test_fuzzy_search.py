@@ -0,0 +1,67 @@
+import random
+
+from sqlalchemy import text
+
+from api.trigrams import TrigramIndex, similarity, trigrams
+
+WORDS = ["tomato", "potato", "onion", "garlic", "chicken", "breast", "rice", "flour", "milk", "butter", "cheddar"]
+
+def test_trigrams_follow_pg_trgm():
+    assert trigrams("Egg!") == {"  e", " eg", "egg", "gg "}
+    assert similarity("tomato", "Tomatoe") == 6 / 9
+    assert similarity("rice", "") == 0.0
+
+def test_index_search_matches_brute_force():
+    rng = random.Random(3)
+    names = {i: " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) for i in range(2000)}
+    index = TrigramIndex()
+    for name_id, name in names.items():
+        index.add(name_id, name)
+    for name_id in range(0, 2000, 5):
+        index.remove(name_id)
+        del names[name_id]
+    index.add(1, "chicken stock")
+    names[1] = "chicken stock"
+
+    for query in ["chiken", "tomatoe onoin", "rice", "stock", "xyz"]:
+        for threshold in (0.1, 0.3, 0.6):
+            expected = sorted(
+                (-similarity(query, name), name_id) for name_id, name in names.items()
+                if similarity(query, name) >= threshold
+            )[:10]
+            assert index.search(query, 10, threshold) == [(name_id, -score) for score, name_id in expected]
+
+def test_fuzzy_inventory_search(auth_client):
+    for name in ["Tomatoes", "Potatoes", "Chicken Breast"]:
+        auth_client.post("/api/v1/inventory/", json={"name": name, "quantity": 1, "unit": "pcs"})
+
+    response = auth_client.get("/api/v1/inventory/fuzzy", params={"q": "tomatos"})
+    assert response.status_code == 200
+    matches = response.json()
+    assert [match["item"]["name"] for match in matches] == ["Tomatoes"]
+    assert matches[0]["similarity"] == similarity("tomatos", "Tomatoes")
+
+    assert auth_client.get("/api/v1/inventory/fuzzy", params={"q": "chiken brest"}).json()[0]["item"]["name"] == "Chicken Breast"
+    assert auth_client.get("/api/v1/inventory/fuzzy", params={"q": "tomatos", "min_similarity": 0.9}).json() == []
+
+def test_fuzzy_index_follows_writes(auth_client, db_session, sample_recipe):
+    def names(q):
+        return [match["recipe"]["name"] for match in auth_client.get("/api/v1/recipes/fuzzy", params={"q": q}).json()]
+
+    recipe = auth_client.post("/api/v1/recipes/", json=sample_recipe).json()
+    assert names("spagetti") == ["Test Spaghetti"]
+
+    # Inserted after the index was built
+    auth_client.post("/api/v1/recipes/", json={**sample_recipe, "name": "Lasagne"})
+    assert names("lasagna") == ["Lasagne"]
+
+    auth_client.put(f"/api/v1/recipes/{recipe['id']}", json={**sample_recipe, "name": "Risotto"})
+    assert names("spagetti") == []
+    assert names("risoto") == ["Risotto"]
+
+    # Renamed and deleted behind this worker's back, as by another worker
+    db_session.execute(text("UPDATE recipes SET name = 'Paella' WHERE name = 'Risotto'"))
+    db_session.execute(text("DELETE FROM recipes WHERE name = 'Lasagne'"))
+    db_session.commit()
+    assert names("risoto") == []
+    assert names("lasagna") == []
@@ -0,0 +1,142 @@
+import json
+
+from sqlalchemy import insert
+
+from api import imports
+from models import Recipe, User
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+def test_import_round_trips_an_export(auth_client, sample_inventory_item, sample_recipe):
+    auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
+    auth_client.post("/api/v1/recipes/", json=sample_recipe)
+    auth_client.post("/api/v1/shopping-list/", json={"name": "Basil", "quantity": 1, "unit": "bunch"})
+    exported = auth_client.get("/api/v1/export").content
+
+    response = auth_client.post(
+        "/api/v1/import", content=exported, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["imported"] == {"inventory": 1, "recipe": 1}
+    assert summary["skipped"] == 2  # export header and shopping-list row
+    assert summary["failed"] == 0
+
+    # Inventory merges into the existing item, recipes are added
+    inventory = auth_client.get("/api/v1/inventory/").json()
+    assert [item["quantity"] for item in inventory] == [sample_inventory_item["quantity"] * 2]
+    assert len(auth_client.get("/api/v1/recipes/").json()) == 2
+
+def test_import_csv_reports_row_errors(auth_client):
+    body = (
+        "name,quantity,unit,expiry_date\n"
+        "Rice,2,kg,\n"
+        '"Tomatoes, cherry",250,g,2024-12-31\n'
+        "Milk,lots,l,\n"
+        "Eggs,12,pcs,not-a-date\n"
+    )
+
+    response = auth_client.post(
+        "/api/v1/import", params={"kind": "inventory"}, content=body, headers={"Content-Type": "text/csv"}
+    )
+    summary = response.json()
+    assert summary["format"] == "csv"
+    assert summary["processed"] == 4
+    assert summary["imported"]["inventory"] == 2
+    assert [error["line"] for error in summary["errors"]] == [4, 5]
+    assert "quantity" in summary["errors"][0]["error"]
+    names = {item["name"] for item in auth_client.get("/api/v1/inventory/").json()}
+    assert names == {"Rice", "Tomatoes, cherry"}
+
+def test_import_needs_a_known_format(auth_client):
+    response = auth_client.post("/api/v1/import", content=b"x", headers={"Content-Type": "application/octet-stream"})
+    assert response.status_code == 415
+    response = auth_client.post("/api/v1/import", content=b"a,b\n", headers={"Content-Type": "text/csv"})
+    assert response.status_code == 400
+
+async def test_import_parses_incrementally_in_batches(db_session):
+    user = User(username="importer", email="importer@example.com", hashed_password="x")
+    db_session.add(user)
+    db_session.commit()
+    recipe = {
+        "name": "Soup", "description": "Warm", "prep_time": 30,
+        "ingredients": [{"name": "Leek", "quantity": 2, "unit": "pcs"}],
+        "instructions": ["Chop", "Simmer"],
+    }
+    body = (
+        "name,description,prep_time,ingredients,instructions\n"
+        + "".join(
+            f'Soup {i},"Warm,\nhearty déjà vu",30,"{json.dumps(recipe["ingredients"]).replace(chr(34), chr(34) * 2)}",'
+            f'"[""Chop""]"\n'
+            for i in range(5)
+        )
+    ).encode()
+
+    # 7-byte chunks split lines, quoted fields and multi-byte boundaries
+    summary = await imports.import_records(db_session, user, chunked(body, 7), "csv", "recipe", batch_size=2)
+
+    assert summary["failed"] == 0, summary["errors"]
+    assert summary["imported"]["recipe"] == 5
+    assert summary["batches"] == 3
+    recipes = sorted(user.recipes, key=lambda r: r.id)
+    assert recipes[0].description == "Warm,\nhearty déjà vu"
+    assert recipes[0].ingredients == recipe["ingredients"]
+
+async def test_overlong_lines_are_dropped():
+    body = b"ok\n" + b"x" * 50 + b"\nnext\n" + b"y" * 50
+    lines = [line async for line in imports.iter_lines(chunked(body, 7), max_length=10)]
+    assert lines == ["ok", None, "next", None]
+
+    records = [record async for record in imports.iter_ndjson(imports.iter_lines(chunked(body, 7), 10), "inventory")]
+    assert [(line, error) for line, kind, error in records if "longer" in str(error)] == [
+        (2, f"line longer than {imports.MAX_LINE_LENGTH} characters"),
+        (4, f"line longer than {imports.MAX_LINE_LENGTH} characters"),
+    ]
+
+async def test_csv_resyncs_after_an_overlong_record():
+    async def lines():
+        for line in ["name,quantity,unit", 'Milk,"1,l', "Eggs,12,pcs", "Rice,2,kg", "Oats,1,kg"]:
+            yield line
+        yield None  # overlong line from iter_lines
+        yield "Salt,1,g"
+
+    records = [record async for record in imports.iter_csv(lines(), "inventory", max_length=30)]
+    # The unbalanced quote swallows lines until the record passes 30 characters
+    assert records == [
+        (2, None, "record longer than 30 characters"),
+        (5, "inventory", {"name": "Oats", "quantity": "1", "unit": "kg"}),
+        (6, None, f"line longer than {imports.MAX_LINE_LENGTH} characters"),
+        (7, "inventory", {"name": "Salt", "quantity": "1", "unit": "g"}),
+    ]
+
+async def test_failed_batch_is_rolled_back_and_reported(db_session, monkeypatch):
+    user = User(username="importer", email="importer@example.com", hashed_password="x")
+    db_session.add(user)
+    db_session.commit()
+    calls = []
+
+    def import_recipes(db, recipes, user):
+        calls.append(len(recipes))
+        if len(calls) == 2:
+            # Rejected by the database after part of the batch is written
+            db.execute(insert(Recipe), [{**recipes[0].model_dump(), "user_id": user.id}])
+            db.execute(insert(Recipe), [{**recipes[1].model_dump(), "id": 1, "user_id": user.id}])
+        return original(db, recipes, user)
+
+    original = imports.INSERTERS["recipe"]
+    monkeypatch.setitem(imports.INSERTERS, "recipe", import_recipes)
+    body = "name,description,prep_time,ingredients,instructions\n" + "".join(
+        f'Soup {i},Warm,30,[],"[""Cook""]"\n' for i in range(6)
+    )
+
+    summary = await imports.import_records(db_session, user, chunked(body.encode(), 64), "csv", "recipe", batch_size=2)
+
+    assert summary["imported"]["recipe"] == 4
+    assert summary["batches"] == 2
+    assert summary["failed"] == 2
+    assert [error["line"] for error in summary["errors"]] == [4, 5]
+    assert summary["errors"][0]["error"] == "batch not imported: UNIQUE constraint failed: recipes.id"
+    db_session.expire_all()
+    assert sorted(recipe.name for recipe in user.recipes) == ["Soup 0", "Soup 1", "Soup 4", "Soup 5"]
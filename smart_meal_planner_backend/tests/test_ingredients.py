@@ -0,0 +1,24 @@
+from api.ingredients import canonical_unit, normalize_name
+
+def test_names_normalize_to_catalog_keys():
+    assert normalize_name("Tomatoes") == normalize_name("tomato") == "tomato"
+    assert normalize_name("  Cherry   Tomatoes! ") == "cherry tomato"
+    assert normalize_name("Berries") == "berry"
+    assert normalize_name("Peaches") == "peach"
+    assert normalize_name("Bay Leaves") == "bay leaf"
+    # words that only look plural are kept
+    assert normalize_name("Asparagus") == "asparagus"
+    assert normalize_name("Swiss") == "swiss"
+    assert normalize_name("Hummus") == "hummus"
+    # aliases resolve after singularizing
+    assert normalize_name("Spring Onions") == normalize_name("scallion") == "green onion"
+    assert normalize_name("All-purpose flour") == "flour"
+
+def test_units_map_to_base_units():
+    assert canonical_unit("Kilograms") == ("kg", "g", 1000.0)
+    assert canonical_unit("G") == ("g", "g", 1.0)
+    assert canonical_unit("tbsp.") == ("tbsp", "ml", 15.0)
+    assert canonical_unit("Litre") == ("l", "ml", 1000.0)
+    assert canonical_unit("piece") == ("pcs", "pcs", 1.0)
+    # units without a conversion are their own base, singular
+    assert canonical_unit("Cloves") == ("clove", "clove", 1.0)
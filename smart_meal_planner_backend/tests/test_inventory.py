@@ -1,9 +1,9 @@
 from fastapi.testclient import TestClient
 import pytest
-from datetime import date
+from datetime import date, timedelta
 
-def test_create_inventory_item(client, sample_inventory_item):
-    response = client.post("/api/v1/inventory/", json=sample_inventory_item)
+def test_create_inventory_item(auth_client, sample_inventory_item):
+    response = auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == sample_inventory_item["name"]
@@ -13,66 +13,164 @@ def test_create_inventory_item(client, sample_inventory_item):
     assert "created_at" in data
     assert "updated_at" in data
 
-def test_get_inventory_items(client, sample_inventory_item):
+def test_get_inventory_items(auth_client, sample_inventory_item):
     # Create an item first
-    client.post("/api/v1/inventory/", json=sample_inventory_item)
+    auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
     
-    response = client.get("/api/v1/inventory/")
+    response = auth_client.get("/api/v1/inventory/")
     assert response.status_code == 200
     data = response.json()
     assert len(data) > 0
     assert isinstance(data, list)
     assert data[0]["name"] == sample_inventory_item["name"]
 
-def test_get_inventory_item(client, sample_inventory_item):
+def test_get_inventory_item(auth_client, sample_inventory_item):
     # Create an item first
-    create_response = client.post("/api/v1/inventory/", json=sample_inventory_item)
+    create_response = auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
     item_id = create_response.json()["id"]
     
-    response = client.get(f"/api/v1/inventory/{item_id}")
+    response = auth_client.get(f"/api/v1/inventory/{item_id}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == item_id
     assert data["name"] == sample_inventory_item["name"]
 
-def test_update_inventory_item(client, sample_inventory_item):
+def test_update_inventory_item(auth_client, sample_inventory_item):
     # Create an item first
-    create_response = client.post("/api/v1/inventory/", json=sample_inventory_item)
+    create_response = auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
     item_id = create_response.json()["id"]
     
     # Update the item
     updated_data = sample_inventory_item.copy()
     updated_data["quantity"] = 3.5
     
-    response = client.put(f"/api/v1/inventory/{item_id}", json=updated_data)
+    response = auth_client.put(f"/api/v1/inventory/{item_id}", json=updated_data)
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == item_id
     assert data["quantity"] == 3.5
 
-def test_delete_inventory_item(client, sample_inventory_item):
+def test_delete_inventory_item(auth_client, sample_inventory_item):
     # Create an item first
-    create_response = client.post("/api/v1/inventory/", json=sample_inventory_item)
+    create_response = auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
     item_id = create_response.json()["id"]
     
     # Delete the item
-    response = client.delete(f"/api/v1/inventory/{item_id}")
+    response = auth_client.delete(f"/api/v1/inventory/{item_id}")
     assert response.status_code == 200
     
     # Verify item is deleted
-    get_response = client.get(f"/api/v1/inventory/{item_id}")
+    get_response = auth_client.get(f"/api/v1/inventory/{item_id}")
     assert get_response.status_code == 404
 
-def test_get_nonexistent_item(client):
-    response = client.get("/api/v1/inventory/999")
+def test_get_nonexistent_item(auth_client):
+    response = auth_client.get("/api/v1/inventory/999")
     assert response.status_code == 404
     assert response.json()["detail"] == "Item not found"
 
-def test_create_invalid_inventory_item(client):
+def test_create_invalid_inventory_item(auth_client):
     invalid_item = {
         "name": "Test Item",
         "quantity": "invalid",  # should be a number
         "unit": "kg"
     }
-    response = client.post("/api/v1/inventory/", json=invalid_item)
-    assert response.status_code == 422  # Validation error 
\ No newline at end of file
+    response = auth_client.post("/api/v1/inventory/", json=invalid_item)
+    assert response.status_code == 422  # Validation error 
+def test_create_existing_item_adds_quantity(auth_client, sample_inventory_item):
+    first = auth_client.post("/api/v1/inventory/", json=sample_inventory_item).json()
+    restock = {**sample_inventory_item, "quantity": 1.0, "expiry_date": "2024-12-01"}
+    second = auth_client.post("/api/v1/inventory/", json=restock).json()
+
+    assert second["id"] == first["id"]
+    assert second["quantity"] == sample_inventory_item["quantity"] + 1.0
+    assert second["expiry_date"] == "2024-12-01"  # the earlier date wins
+    assert len(auth_client.get("/api/v1/inventory/").json()) == 1
+
+def test_equivalent_names_and_units_share_an_item(auth_client, sample_inventory_item):
+    first = auth_client.post("/api/v1/inventory/", json=sample_inventory_item).json()
+    restock = {**sample_inventory_item, "name": "test tomato", "quantity": 500, "unit": "grams"}
+    second = auth_client.post("/api/v1/inventory/", json=restock).json()
+
+    assert second["id"] == first["id"]
+    assert second["unit"] == "kg"  # converted into the existing row's unit
+    assert second["quantity"] == sample_inventory_item["quantity"] + 0.5
+    assert len(auth_client.get("/api/v1/inventory/").json()) == 1
+
+def test_rename_onto_existing_item_conflicts(auth_client, sample_inventory_item):
+    auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
+    other = auth_client.post("/api/v1/inventory/", json={**sample_inventory_item, "name": "Rice"}).json()
+
+    response = auth_client.put(f"/api/v1/inventory/{other['id']}", json=sample_inventory_item)
+    assert response.status_code == 409
+
+def test_batch_create_inventory_items(auth_client, sample_inventory_item):
+    existing = auth_client.post("/api/v1/inventory/", json=sample_inventory_item).json()
+    receipt = [
+        {"name": "Milk", "quantity": 1, "unit": "l"},
+        {**sample_inventory_item, "quantity": 1.0},
+        {"name": "Milk", "quantity": 2, "unit": "l", "expiry_date": "2024-11-01"},
+    ]
+
+    response = auth_client.post("/api/v1/inventory/batch", json={"items": receipt})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [r["status"] for r in results] == ["created", "updated", "created"]
+    assert results[0]["id"] == results[2]["id"]  # folded into one row
+    assert results[0]["item"]["quantity"] == 3
+    assert results[0]["item"]["expiry_date"] == "2024-11-01"
+    assert results[1]["id"] == existing["id"]
+    assert results[1]["item"]["quantity"] == sample_inventory_item["quantity"] + 1.0
+    assert len(auth_client.get("/api/v1/inventory/").json()) == 2
+
+def test_batch_update_and_delete_inventory_items(auth_client, sample_inventory_item):
+    created = auth_client.post("/api/v1/inventory/batch", json={"items": [
+        sample_inventory_item, {"name": "Rice", "quantity": 1, "unit": "kg"}
+    ]}).json()["results"]
+    ids = [r["id"] for r in created]
+
+    response = auth_client.patch("/api/v1/inventory/batch", json={"items": [
+        {"id": ids[0], "quantity": 0.5}, {"id": 999, "quantity": 1}
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["updated", "not_found"]
+    assert results[0]["item"]["quantity"] == 0.5
+    assert results[0]["item"]["name"] == sample_inventory_item["name"]
+
+    response = auth_client.request("DELETE", "/api/v1/inventory/batch", json={"ids": [ids[1], 999]})
+    assert [r["status"] for r in response.json()["results"]] == ["deleted", "not_found"]
+    assert [item["id"] for item in auth_client.get("/api/v1/inventory/").json()] == [ids[0]]
+
+def test_batch_update_conflict_rolls_back(auth_client, sample_inventory_item):
+    created = auth_client.post("/api/v1/inventory/batch", json={"items": [
+        sample_inventory_item, {"name": "Rice", "quantity": 1, "unit": "kg"}
+    ]}).json()["results"]
+
+    response = auth_client.patch("/api/v1/inventory/batch", json={"items": [
+        {"id": created[0]["id"], "quantity": 9},
+        {"id": created[1]["id"], "name": sample_inventory_item["name"], "unit": sample_inventory_item["unit"]},
+    ]})
+    assert response.status_code == 409
+    assert auth_client.get(f"/api/v1/inventory/{created[0]['id']}").json()["quantity"] == sample_inventory_item["quantity"]
+
+def _days_from_now(days):
+    return (date.today() + timedelta(days=days)).isoformat()
+
+def test_expiring_items_and_summary(auth_client):
+    for name, days in (("Milk", 2), ("Spinach", -1), ("Rice", 200), ("Cheese", 6), ("Beef", 20)):
+        auth_client.post("/api/v1/inventory/", json={
+            "name": name, "quantity": 1, "unit": "pcs", "expiry_date": _days_from_now(days)
+        })
+    auth_client.post("/api/v1/inventory/", json={"name": "Salt", "quantity": 1, "unit": "g"})
+
+    response = auth_client.get("/api/v1/inventory/expiring", params={"within_days": 7})
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == ["Spinach", "Milk", "Cheese"]
+    response = auth_client.get("/api/v1/inventory/expiring", params={"within_days": 7, "include_expired": False})
+    assert [item["name"] for item in response.json()] == ["Milk", "Cheese"]
+
+    summary = auth_client.get("/api/v1/inventory/expiry-summary").json()
+    assert summary == {
+        "expired": 1, "within_3_days": 1, "within_7_days": 1, "within_30_days": 1, "later": 1, "no_date": 1
+    }
@@ -0,0 +1,90 @@
+import httpx
+import pytest
+
+from loadtest.compare import compare_reports
+from loadtest.report import Recorder, percentile
+from loadtest import runner
+from loadtest.runner import run_load
+from loadtest.scenarios import (
+    INGREDIENTS, SCENARIOS, create_inventory_item, provision_user, update_inventory_item
+)
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 99) == 0.0
+
+def test_recorder_report():
+    recorder = Recorder()
+    for ms in (10, 20, 30, 40):
+        recorder.record("GET /api/v1/inventory/", 200, ms / 1000)
+    recorder.record("GET /api/v1/inventory/", 500, 0.05)
+
+    report = recorder.report(elapsed=1.0, meta={"profile": "household"})
+    stats = report["routes"]["GET /api/v1/inventory/"]
+    assert stats["count"] == 5
+    assert stats["errors"] == 1
+    assert stats["throughput_rps"] == 5.0
+    assert stats["p99_ms"] == pytest.approx(50.0)
+    assert stats["statuses"] == {"200": 4, "500": 1}
+    assert report["meta"]["profile"] == "household"
+
+def test_compare_flags_regressions():
+    baseline = {"routes": {
+        "GET /a": {"p99_ms": 100.0, "throughput_rps": 50.0},
+        "GET /b": {"p99_ms": 100.0, "throughput_rps": 50.0},
+    }}
+    current = {"routes": {
+        "GET /a": {"p99_ms": 105.0, "throughput_rps": 49.0},
+        "GET /b": {"p99_ms": 150.0, "throughput_rps": 50.0},
+    }}
+    rows, regressed = compare_reports(baseline, current, tolerance=0.10)
+    assert regressed
+    assert {row["route"]: row["regression"] for row in rows} == {"GET /a": False, "GET /b": True}
+
+    _, regressed = compare_reports(baseline, baseline)
+    assert not regressed
+
+@pytest.mark.asyncio
+async def test_run_household_profile(app, client):
+    report = await run_load(
+        "http://testserver",
+        SCENARIOS["household"],
+        users=1,
+        duration=0.5,
+        transport=httpx.ASGITransport(app=app),
+    )
+    assert report["total"]["count"] > 0
+    assert report["meta"]["profile"] == "household"
+    assert all(route.split(" ", 1)[1].startswith("/api/v1/") for route in report["routes"])
+
+def test_think_time_override_leaves_profiles_unchanged(monkeypatch):
+    used = []
+
+    async def fake_run_load(base_url, scenario, users, duration, **kwargs):
+        used.append(scenario)
+        return {"routes": {}, "total": {}}
+
+    monkeypatch.setattr(runner, "run_load", fake_run_load)
+    monkeypatch.setattr(runner, "format_table", lambda rows: "")
+    assert runner.main(["--profile", "login_storm", "--think-time", "2.5"]) == 0
+
+    assert used[0].think_time == 2.5
+    assert SCENARIOS["login_storm"].think_time == 0.0
+
+@pytest.mark.asyncio
+async def test_inventory_updates_restock_in_place(app, client):
+    recorder = Recorder()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as http:
+        session = await provision_user(http, recorder, 0, "restock")
+        for _ in range(3 * len(INGREDIENTS)):
+            await create_inventory_item(session)
+        # Creates of an ingredient already stocked merge into its item, whose id is pooled once
+        assert len(session.inventory) <= len(INGREDIENTS)
+        for _ in range(30):
+            await update_inventory_item(session)
+
+    # Renaming onto another stocked ingredient would conflict (409)
+    assert recorder.statuses["PUT /api/v1/inventory/{item_id}"] == {200: 30}
@@ -0,0 +1,81 @@
+import io
+import json
+import logging
+
+from monitoring import logger as logger_module
+from monitoring.logger import get_logger, log_request_info
+
+class RecordingLogger:
+    def __init__(self):
+        self.events = []
+
+    def info(self, event, **kw):
+        self.events.append((event, kw))
+
+def _capture(monkeypatch):
+    stream = io.StringIO()
+    monkeypatch.setattr(logger_module.json_handler, "stream", stream)
+    return stream
+
+def test_structlog_and_stdlib_records_are_rendered_once(monkeypatch):
+    stream = _capture(monkeypatch)
+    get_logger("tests").info("structured_event", answer=42)
+    logging.getLogger("tests.stdlib").warning("plain %s", "message")
+    logger_module.log_queue.join()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    structured = next(line for line in lines if line["event"] == "structured_event")
+    assert structured["answer"] == 42
+    assert structured["level"] == "info"
+    assert "timestamp" in structured
+    plain = next(line for line in lines if line["event"] == "plain message")
+    assert plain["level"] == "warning"
+    assert plain["logger"] == "tests.stdlib"
+
+def test_exceptions_are_rendered(monkeypatch):
+    stream = _capture(monkeypatch)
+    try:
+        raise ValueError("bad value")
+    except ValueError:
+        get_logger("tests").exception("failed")
+    logger_module.log_queue.join()
+
+    line = json.loads(stream.getvalue().splitlines()[-1])
+    assert "ValueError: bad value" in line["exception"]
+
+def test_request_logs_are_sampled(monkeypatch):
+    monkeypatch.setattr(logger_module.settings, "LOG_SAMPLE_RATE", 0.0)
+    recorder = RecordingLogger()
+
+    log_request_info(recorder, "fast", status_code=200, duration=0.01)
+    log_request_info(recorder, "failed", status_code=500, duration=0.01)
+    log_request_info(recorder, "rejected", status_code=404, duration=0.01)
+    log_request_info(recorder, "slow", status_code=200, duration=logger_module.settings.SLOW_REQUEST_THRESHOLD)
+
+    assert [kw["request_id"] for _, kw in recorder.events] == ["failed", "rejected", "slow"]
+    assert all(kw["sample_rate"] == 0.0 for _, kw in recorder.events)
+
+def test_request_logs_unsampled_by_default():
+    recorder = RecordingLogger()
+    log_request_info(recorder, "fast", status_code=200, duration=0.01)
+    assert recorder.events == [("request_processed", {"request_id": "fast", "status_code": 200, "duration": 0.01})]
+
+def test_dropped_records_are_counted_and_reported(monkeypatch):
+    import queue
+    from prometheus_client import REGISTRY
+
+    stream = _capture(monkeypatch)
+    monkeypatch.setattr(logger_module._NonBlockingQueueHandler, "dropped", 0)
+    monkeypatch.setattr(logger_module, "listener", type("Stopped", (), {"stop": lambda self: None})())
+    before = REGISTRY.get_sample_value("log_records_dropped_total") or 0.0
+
+    handler = logger_module._NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    for i in range(3):
+        handler.handle(logging.makeLogRecord({"msg": f"record {i}"}))
+    assert handler.queue.qsize() == 1
+    assert REGISTRY.get_sample_value("log_records_dropped_total") == before + 2
+
+    logger_module._stop_writer()
+    record = json.loads(stream.getvalue())
+    assert record["level"] == "warning"
+    assert record["event"] == "log_records_dropped: 2 records dropped because the log queue was full"
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from config import get_settings
+from main import create_app
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_create_app_smoke():
+    settings = get_settings().model_copy(update={"ENABLE_METRICS": False, "ENABLE_RUNTIME_MONITOR": False})
+    app = create_app(settings)
+    assert app.state.settings is settings
+
+    paths = {route.path for route in app.routes}
+    assert {"/health", "/api/v1/auth/token", "/api/v1/recipes/", "/api/v1/ai/recipes/suggest"} <= paths
+
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "healthy"}
+        assert client.get("/api/v1/inventory/").status_code == 401
+
+def test_import_builds_no_app():
+    # Logging and Sentry are configured by create_app, not as a side effect of importing main
+    code = "import sys, main; print(hasattr(main, 'app'), 'sentry_sdk' in sys.modules)"
+    env = {**os.environ, "SENTRY_DSN": "https://public@sentry.example.com/1"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "False False"
@@ -1,8 +1,6 @@
 import pytest
 from unittest.mock import patch, AsyncMock, Mock
 import json
-from fastapi.testclient import TestClient
-from main import app
 import openai
 from fastapi import HTTPException
 import logging
@@ -12,7 +10,6 @@ import httpx
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-client = TestClient(app)
 
 @pytest.fixture
 def test_user():
@@ -114,7 +111,7 @@ async def test_optimize_meal_plan_success(client, test_user, mock_openai_respons
     token = login_response.json()["access_token"]
     
     # Mock OpenAI API call
-    with patch("openai.ChatCompletion.acreate", new_callable=AsyncMock) as mock_openai:
+    with patch("openai.resources.chat.AsyncCompletions.create", new_callable=AsyncMock) as mock_openai:
         mock_openai.return_value = mock_openai_response
         
         response = client.post(
@@ -227,7 +224,7 @@ async def test_optimize_meal_plan_rate_limit(client, test_user):
     )
     
     # Mock OpenAI API call with rate limit error
-    with patch("openai.ChatCompletion.acreate", new_callable=AsyncMock) as mock_openai:
+    with patch("openai.resources.chat.AsyncCompletions.create", new_callable=AsyncMock) as mock_openai:
         mock_openai.side_effect = openai.RateLimitError(
             message="Rate limit exceeded",
             response=mock_response,
@@ -274,7 +271,7 @@ async def test_optimize_meal_plan_api_error(client, test_user):
     mock_request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
     
     # Mock OpenAI API call with API error
-    with patch("openai.ChatCompletion.acreate", new_callable=AsyncMock) as mock_openai:
+    with patch("openai.resources.chat.AsyncCompletions.create", new_callable=AsyncMock) as mock_openai:
         mock_openai.side_effect = openai.APIError(
             message="API error",
             request=mock_request,
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = """
+from monitoring import metrics
+metrics.track_request(method="GET", endpoint="/api/v1/inventory/", status=200)
+metrics.http_requests_in_progress.labels(route_class="crud").inc()
+"""
+
+SCRAPE = """
+import json
+from monitoring import metrics
+registry = metrics.metrics_registry()
+print(json.dumps({
+    "requests": registry.get_sample_value(
+        "http_requests_total", {"method": "GET", "endpoint": "/api/v1/inventory/", "status": "200"}
+    ),
+    "in_progress": registry.get_sample_value("http_requests_in_progress", {"route_class": "crud"}),
+}))
+"""
+
+def _run(code, multiproc_dir):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+def test_counters_aggregate_and_dead_workers_are_reaped(tmp_path):
+    _run(WORKER, tmp_path)
+    _run(WORKER, tmp_path)
+
+    scraped = json.loads(_run(SCRAPE, tmp_path).strip().splitlines()[-1])
+    assert scraped["requests"] == 2.0
+    # Both workers have exited, so their in-flight gauges no longer count
+    assert not scraped["in_progress"]
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from database import Base
+from models import include_object
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def alembic_config(connection):
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+def test_migrations_match_models(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"include_object": include_object})
+        diff = compare_metadata(context, Base.metadata)
+    assert diff == []
+
+def test_migrations_downgrade_to_base(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        command.upgrade(config, "head")
+        command.downgrade(config, "base")
+
+    with engine.connect() as connection:
+        assert engine.dialect.get_table_names(connection) == ["alembic_version"]
+
+def test_ingredient_catalog_migration_merges_equivalent_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        command.upgrade(config, "5b9e2c7f0a18")
+        connection.execute(text(
+            "INSERT INTO inventory (id, name, quantity, unit, expiry_date, user_id) VALUES "
+            "(1, 'Tomatoes', 2, 'pcs', '2030-01-05', 1), (2, 'tomato', 1, 'pcs', '2030-01-02', 1), "
+            "(3, 'Rice', 500, 'grams', NULL, 1), (4, 'rice', 1, 'kg', NULL, 1), (5, 'Rice', 1, 'kg', NULL, 2)"
+        ))
+        connection.execute(text(
+            "INSERT INTO shopping_list (id, name, quantity, unit, purchased, user_id) VALUES "
+            "(1, 'Milk', 1, 'l', 0, 1), (2, 'milk', 250, 'ml', 0, 1), (3, 'Milk', 1, 'l', 1, 1)"
+        ))
+        command.upgrade(config, "head")
+
+        inventory = connection.execute(text(
+            "SELECT inventory.id, ingredients.name, quantity, unit, base_unit, expiry_date "
+            "FROM inventory JOIN ingredients ON ingredients.id = inventory.ingredient_id ORDER BY inventory.id"
+        )).all()
+        shopping = connection.execute(text("SELECT id, quantity, unit, purchased FROM shopping_list ORDER BY id")).all()
+
+    assert [tuple(row) for row in inventory] == [
+        (1, "tomato", 3, "pcs", "pcs", "2030-01-02"),
+        (3, "rice", 1500, "g", "g", None),
+        (5, "rice", 1, "kg", "g", None),
+    ]
+    assert [tuple(row) for row in shopping] == [(1, 1.25, "l", 0), (3, 1, "l", 1)]
+
+def test_recipe_search_migration_indexes_existing_recipes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        command.upgrade(config, "a7e0c3d915b2")
+        connection.execute(text(
+            "INSERT INTO recipes (id, name, description, instructions, user_id) VALUES "
+            "(1, 'Tomato Soup', 'Warm', '[\"Chop\", \"Simmer\"]', 1), (2, 'Toast', 'Crisp', NULL, 1)"
+        ))
+        command.upgrade(config, "head")
+        connection.execute(text(
+            "INSERT INTO recipes (id, name, description, instructions, user_id) VALUES (3, 'Tart', 'x', '[]', 2)"
+        ))
+
+        rows = connection.execute(text("SELECT rowid, instructions, owner FROM recipes_fts ORDER BY rowid")).all()
+    assert [tuple(row) for row in rows] == [(1, "Chop / Simmer", 1), (2, None, 1), (3, None, 2)]
@@ -0,0 +1,79 @@
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import get_db
+from main import create_app
+from models import User
+from monitoring.queries import QueryStats, statement_shape
+
+def _observed(metric, method, endpoint):
+    return REGISTRY.get_sample_value(f"{metric}_count", {"method": method, "endpoint": endpoint}) or 0.0
+
+def test_statement_shape_ignores_values():
+    assert statement_shape("SELECT * FROM recipes WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT * FROM recipes WHERE id IN (?, ?)")
+    assert statement_shape("SELECT *\n  FROM t WHERE name = 'a' LIMIT 5") == "SELECT * FROM t WHERE name = ? LIMIT ?"
+
+def test_repeated_shapes():
+    stats = QueryStats()
+    for i in range(4):
+        stats.record(f"SELECT * FROM shopping_list WHERE id = {i}", 0.001)
+    stats.record("SELECT * FROM recipes", 0.001)
+    assert stats.count == 5
+    assert stats.repeated(3) == [("SELECT * FROM shopping_list WHERE id = ?", 4)]
+    assert stats.repeated(4) == []
+
+def test_request_records_queries_by_route_template(auth_client, sample_inventory_item):
+    endpoint = "/api/v1/inventory/{item_id}"
+    before = _observed("db_queries_per_request", "GET", endpoint)
+    before_duration = _observed("db_duration_per_request_seconds", "GET", endpoint)
+
+    item = auth_client.post("/api/v1/inventory/", json=sample_inventory_item).json()
+    response = auth_client.get(f"/api/v1/inventory/{item['id']}")
+    assert response.status_code == 200
+
+    assert _observed("db_queries_per_request", "GET", endpoint) == before + 1
+    assert _observed("db_duration_per_request_seconds", "GET", endpoint) == before_duration + 1
+    assert REGISTRY.get_sample_value(
+        "db_queries_per_request_sum", {"method": "GET", "endpoint": endpoint}
+    ) > 0
+
+def test_repeated_statements_are_flagged(app, auth_client, sample_recipe, monkeypatch):
+    from monitoring import middleware
+
+    warnings = []
+    class RecordingLogger:
+        def warning(self, event, **kw):
+            warnings.append((event, kw))
+        def __getattr__(self, name):
+            return lambda *args, **kw: None
+
+    monkeypatch.setattr(middleware, "logger", RecordingLogger())
+    threshold = middleware.settings.QUERY_REPEAT_THRESHOLD
+
+    # An N+1 loop: one SELECT per user id
+    looping_app = create_app(app.state.settings)
+    looping_app.dependency_overrides = app.dependency_overrides
+    @looping_app.get("/users/{count}")
+    def load_users(count: int, db: Session = Depends(get_db)):
+        return [db.scalars(select(User).where(User.id == user_id)).first() is not None for user_id in range(count)]
+
+    assert TestClient(looping_app).get(f"/users/{threshold + 1}").status_code == 200
+    flagged = [kw for event, kw in warnings if event == "repeated_query"]
+    assert [kw["endpoint"] for kw in flagged] == ["/users/{count}"]
+    assert flagged[0]["count"] == threshold + 1
+    assert "FROM users" in flagged[0]["statement"]
+
+    # Shopping lists from a recipe use one upsert however many ingredients it has
+    warnings.clear()
+    sample_recipe["ingredients"] = [
+        {"name": f"Ingredient {i}", "quantity": 1, "unit": "g"} for i in range(threshold + 1)
+    ]
+    recipe = auth_client.post("/api/v1/recipes/", json=sample_recipe).json()
+    response = auth_client.post("/api/v1/shopping-list/recipe/", json={"recipe_id": recipe["id"]})
+    assert response.status_code == 200
+    assert len(response.json()) == threshold + 1
+    assert [event for event, kw in warnings if event == "repeated_query"] == []
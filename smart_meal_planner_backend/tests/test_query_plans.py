@@ -0,0 +1,99 @@
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from api import schemas
+from api.services import InventoryService, RecipeService, ShoppingListService
+from benchmarks.seed import migrate, seed_database
+from database import Base
+from models import InventoryItem, Recipe, ShoppingListItem, User
+
+SIZES = {"inventory": 200, "recipes": 50, "shopping": 200}
+
+HOT_QUERIES = {
+    "InventoryService.get_items": lambda db, user, ids: InventoryService.get_items(db, user),
+    "InventoryService.get_item": lambda db, user, ids: InventoryService.get_item(db, ids["inventory"], user),
+    "InventoryService.update_item": lambda db, user, ids: InventoryService.update_item(
+        db, ids["inventory"], schemas.InventoryItemCreate(name="Wild Rice", quantity=2, unit="kg"), user
+    ),
+    "InventoryService.delete_item": lambda db, user, ids: InventoryService.delete_item(db, ids["inventory"], user),
+    "InventoryService.create_items": lambda db, user, ids: InventoryService.create_items(db, [
+        schemas.InventoryItemCreate(name="Rice", quantity=1, unit="kg"),
+        schemas.InventoryItemCreate(name="Jasmine Rice", quantity=1, unit="kg"),
+    ], user),
+    "InventoryService.update_items": lambda db, user, ids: InventoryService.update_items(
+        db, [schemas.InventoryItemUpdate(id=ids["inventory"], quantity=3)], user
+    ),
+    "InventoryService.delete_items": lambda db, user, ids: InventoryService.delete_items(db, [ids["inventory"]], user),
+    "InventoryService.get_expiring": lambda db, user, ids: InventoryService.get_expiring(db, user, 30),
+    "InventoryService.get_expiry_summary": lambda db, user, ids: InventoryService.get_expiry_summary(db, user),
+    "RecipeService.rank_by_expiring": lambda db, user, ids: RecipeService.rank_by_expiring(db, user, 30),
+    "RecipeService.find_cookable": lambda db, user, ids: RecipeService.find_cookable(db, user, max_missing=2),
+    "RecipeService.get_recipes": lambda db, user, ids: RecipeService.get_recipes(db, user),
+    "RecipeService.get_recipe": lambda db, user, ids: RecipeService.get_recipe(db, ids["recipe"], user),
+    "RecipeService.find_recipes_by_ingredients": lambda db, user, ids: RecipeService.find_recipes_by_ingredients(
+        db, ["Rice", "Eggs"], user
+    ),
+    "ShoppingListService.get_items": lambda db, user, ids: ShoppingListService.get_items(db, user),
+    "ShoppingListService.get_summary": lambda db, user, ids: ShoppingListService.get_summary(db, user),
+    "ShoppingListService.mark_as_purchased": lambda db, user, ids: ShoppingListService.mark_as_purchased(
+        db, ids["shopping"], user
+    ),
+    "ShoppingListService.purchase_items": lambda db, user, ids: ShoppingListService.purchase_items(
+        db, [ids["shopping"], ids["shopping"] + 1], user
+    ),
+    "ShoppingListService.generate_from_recipe": lambda db, user, ids: ShoppingListService.generate_from_recipe(
+        db, ids["recipe"], user
+    ),
+}
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    migrate(engine)
+    # Several users so a scan and a per-user search differ
+    seed_database(engine, 3, SIZES, password_hash="x")
+    yield engine
+    engine.dispose()
+
+def _capture(engine, fn) -> List[Tuple[str, tuple]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")) and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_queries_use_indexes(engine, name):
+    with Session(engine) as db:
+        user = db.scalars(select(User).order_by(User.id.desc())).first()
+        ids = {
+            "inventory": db.scalar(select(InventoryItem.id).where(InventoryItem.user_id == user.id)),
+            "recipe": db.scalar(select(Recipe.id).where(Recipe.user_id == user.id)),
+            "shopping": db.scalar(select(ShoppingListItem.id).where(
+                ShoppingListItem.user_id == user.id, ShoppingListItem.purchased == False
+            )),
+        }
+        statements = _capture(engine, lambda: HOT_QUERIES[name](db, user, ids))
+        db.rollback()
+
+    assert statements
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            # "SCAN t" is a full table scan; "SEARCH t USING ...", "SCAN t USING ... INDEX" and
+            # scans of constant VALUES lists are not
+            scans = [
+                step for step in plan
+                if step.startswith("SCAN") and "INDEX" not in step and step.split()[1] in Base.metadata.tables
+            ]
+            assert not scans, f"{name}: {statement!r} scans: {plan}"
@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from datetime import date
+from datetime import date, timedelta
 
 @pytest.fixture
 def sample_recipe():
@@ -19,8 +19,8 @@ def sample_recipe():
         "prep_time": 20
     }
 
-def test_create_recipe(client, sample_recipe):
-    response = client.post("/api/v1/recipes/", json=sample_recipe)
+def test_create_recipe(auth_client, sample_recipe):
+    response = auth_client.post("/api/v1/recipes/", json=sample_recipe)
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == sample_recipe["name"]
@@ -30,32 +30,32 @@ def test_create_recipe(client, sample_recipe):
     assert "created_at" in data
     assert "updated_at" in data
 
-def test_get_recipes(client, sample_recipe):
+def test_get_recipes(auth_client, sample_recipe):
     # Create a recipe first
-    client.post("/api/v1/recipes/", json=sample_recipe)
+    auth_client.post("/api/v1/recipes/", json=sample_recipe)
     
-    response = client.get("/api/v1/recipes/")
+    response = auth_client.get("/api/v1/recipes/")
     assert response.status_code == 200
     data = response.json()
     assert len(data) > 0
     assert isinstance(data, list)
     assert data[0]["name"] == sample_recipe["name"]
 
-def test_get_recipe(client, sample_recipe):
+def test_get_recipe(auth_client, sample_recipe):
     # Create a recipe first
-    create_response = client.post("/api/v1/recipes/", json=sample_recipe)
+    create_response = auth_client.post("/api/v1/recipes/", json=sample_recipe)
     recipe_id = create_response.json()["id"]
     
-    response = client.get(f"/api/v1/recipes/{recipe_id}")
+    response = auth_client.get(f"/api/v1/recipes/{recipe_id}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == recipe_id
     assert data["name"] == sample_recipe["name"]
     assert len(data["ingredients"]) == len(sample_recipe["ingredients"])
 
-def test_update_recipe(client, sample_recipe):
+def test_update_recipe(auth_client, sample_recipe):
     # Create a recipe first
-    create_response = client.post("/api/v1/recipes/", json=sample_recipe)
+    create_response = auth_client.post("/api/v1/recipes/", json=sample_recipe)
     recipe_id = create_response.json()["id"]
     
     # Update the recipe
@@ -63,32 +63,32 @@ def test_update_recipe(client, sample_recipe):
     updated_data["prep_time"] = 25
     updated_data["description"] = "Updated description"
     
-    response = client.put(f"/api/v1/recipes/{recipe_id}", json=updated_data)
+    response = auth_client.put(f"/api/v1/recipes/{recipe_id}", json=updated_data)
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == recipe_id
     assert data["prep_time"] == 25
     assert data["description"] == "Updated description"
 
-def test_delete_recipe(client, sample_recipe):
+def test_delete_recipe(auth_client, sample_recipe):
     # Create a recipe first
-    create_response = client.post("/api/v1/recipes/", json=sample_recipe)
+    create_response = auth_client.post("/api/v1/recipes/", json=sample_recipe)
     recipe_id = create_response.json()["id"]
     
     # Delete the recipe
-    response = client.delete(f"/api/v1/recipes/{recipe_id}")
+    response = auth_client.delete(f"/api/v1/recipes/{recipe_id}")
     assert response.status_code == 200
     
     # Verify recipe is deleted
-    get_response = client.get(f"/api/v1/recipes/{recipe_id}")
+    get_response = auth_client.get(f"/api/v1/recipes/{recipe_id}")
     assert get_response.status_code == 404
 
-def test_find_recipes_by_ingredients(client, sample_recipe):
+def test_find_recipes_by_ingredients(auth_client, sample_recipe):
     # Create a recipe first
-    client.post("/api/v1/recipes/", json=sample_recipe)
+    auth_client.post("/api/v1/recipes/", json=sample_recipe)
     
     # Search for recipes with matching ingredients
-    response = client.get("/api/v1/recipes/by-ingredients/", params={
+    response = auth_client.get("/api/v1/recipes/by-ingredients/", params={
         "ingredients": ["Spaghetti", "Tomato Sauce"]
     })
     assert response.status_code == 200
@@ -98,15 +98,139 @@ def test_find_recipes_by_ingredients(client, sample_recipe):
     assert "match_percentage" in data[0]
     assert data[0]["match_percentage"] == 100.0  # Should be perfect match
 
-def test_find_recipes_partial_match(client, sample_recipe):
+def test_find_recipes_partial_match(auth_client, sample_recipe):
     # Create a recipe first
-    client.post("/api/v1/recipes/", json=sample_recipe)
+    auth_client.post("/api/v1/recipes/", json=sample_recipe)
     
     # Search with only one matching ingredient
-    response = client.get("/api/v1/recipes/by-ingredients/", params={
+    response = auth_client.get("/api/v1/recipes/by-ingredients/", params={
         "ingredients": ["Spaghetti"]
     })
     assert response.status_code == 200
     data = response.json()
     assert len(data) > 0
-    assert data[0]["match_percentage"] == 50.0  # Should be 50% match 
\ No newline at end of file
+    assert data[0]["match_percentage"] == 50.0  # Should be 50% match 
+def test_recipes_ranked_by_expiring_stock(auth_client):
+    soon = (date.today() + timedelta(days=1)).isoformat()
+    later = (date.today() + timedelta(days=5)).isoformat()
+    expired = (date.today() - timedelta(days=1)).isoformat()
+    for name, quantity, expiry in (("Spinach", 200, soon), ("Cream", 500, later), ("Eggs", 6, expired)):
+        auth_client.post("/api/v1/inventory/", json={"name": name, "quantity": quantity, "unit": "g", "expiry_date": expiry})
+
+    def recipe(name, ingredients):
+        return auth_client.post("/api/v1/recipes/", json={
+            "name": name, "description": name, "instructions": ["Cook"], "prep_time": 10,
+            "ingredients": [{"name": n, "quantity": q, "unit": "g"} for n, q in ingredients],
+        }).json()["id"]
+
+    spinach_pie = recipe("Spinach pie", [("spinach", 200), ("Flour", 100)])
+    creamy = recipe("Creamy spinach", [("Spinach", 50), ("Cream", 500)])
+    recipe("Omelette", [("Eggs", 6)])  # only uses expired stock
+    recipe("Toast", [("Bread", 100)])
+
+    response = auth_client.get("/api/v1/recipes/use-soon", params={"within_days": 7})
+    assert response.status_code == 200
+    ranked = response.json()
+    # all of the spinach due tomorrow (0.5) beats a quarter of it plus the cream due in 5 days (0.125 + 1/6)
+    assert [match["recipe"]["id"] for match in ranked] == [spinach_pie, creamy]
+    assert ranked[0]["expiring_ingredients"] == ["spinach"]
+    assert ranked[1]["expiring_ingredients"] == ["Spinach", "Cream"]
+
+def test_cookable_recipes_check_quantities(auth_client):
+    expired = (date.today() - timedelta(days=1)).isoformat()
+    for name, quantity, unit, expiry in (
+        ("Eggs", 6, "pcs", None), ("Milk", 200, "ml", None), ("Flour", 100, "g", None), ("Butter", 50, "g", expired)
+    ):
+        auth_client.post("/api/v1/inventory/", json={"name": name, "quantity": quantity, "unit": unit, "expiry_date": expiry})
+
+    def recipe(name, ingredients):
+        return auth_client.post("/api/v1/recipes/", json={
+            "name": name, "description": name, "instructions": ["Cook"], "prep_time": 10,
+            "ingredients": [{"name": n, "quantity": q, "unit": u} for n, q, u in ingredients],
+        }).json()["id"]
+
+    omelette = recipe("Omelette", [("eggs", 3, "pcs"), ("Milk", 50, "ml")])
+    pancakes = recipe("Pancakes", [("Eggs", 2, "pcs"), ("Milk", 300, "ml"), ("Flour", 100, "g")])
+    cake = recipe("Cake", [("Eggs", 4, "pcs"), ("Butter", 100, "g"), ("Sugar", 100, "g")])
+
+    response = auth_client.get("/api/v1/recipes/cookable")
+    assert response.status_code == 200
+    assert [(m["recipe"]["id"], m["missing"]) for m in response.json()] == [(omelette, [])]
+
+    matches = auth_client.get("/api/v1/recipes/cookable", params={"max_missing": 2}).json()
+    assert [m["recipe"]["id"] for m in matches] == [omelette, pancakes, cake]
+    assert matches[1]["missing"] == [
+        {"name": "Milk", "unit": "ml", "required": 300, "available": 200, "shortfall": 100}
+    ]
+    # expired butter does not count
+    assert [m["name"] for m in matches[2]["missing"]] == ["Butter", "Sugar"]
+
+    # a double omelette needs all six eggs; double pancakes are short on milk and flour
+    matches = auth_client.get("/api/v1/recipes/cookable", params={"max_missing": 1, "servings": 2}).json()
+    assert [m["recipe"]["id"] for m in matches] == [omelette]
+
+def test_search_recipes_ranks_highlights_and_pages(auth_client, db_session):
+    from models import Recipe, User
+
+    def recipe(name, description, instructions):
+        return auth_client.post("/api/v1/recipes/", json={
+            "name": name, "description": description, "instructions": instructions, "prep_time": 10,
+            "ingredients": [],
+        }).json()["id"]
+
+    soup = recipe("Tomato Soup", "Rich and warm", ["Chop the tomatoes", "Simmer gently"])
+    pasta = recipe("Pasta Pomodoro", "Spaghetti with tomato sauce", ["Boil the pasta"])
+    salad = recipe("Green Salad", "Crisp leaves", ["Toss with a tomato vinaigrette"])
+    recipe("Pancakes", "Fluffy", ["Whisk", "Fry"])
+    # another user's recipe never matches
+    other = User(username="other", email="other@example.com", hashed_password="x")
+    db_session.add(other)
+    db_session.flush()
+    db_session.add(Recipe(name="Tomato Tart", description="tomato", instructions=[], ingredients=[], user_id=other.id))
+    db_session.commit()
+
+    response = auth_client.get("/api/v1/recipes/search", params={"q": "tomatoes"})
+    assert response.status_code == 200
+    page = response.json()
+    # name beats description beats instructions
+    assert [hit["recipe"]["id"] for hit in page["results"]] == [soup, pasta, salad]
+    assert page["next_cursor"] is None
+    assert "<mark>Tomato</mark>" in page["results"][0]["snippet"]
+    assert "<mark>tomato</mark> vinaigrette" in page["results"][2]["snippet"]
+
+    ids, cursor = [], None
+    while True:
+        page = auth_client.get("/api/v1/recipes/search", params={"q": "tomato", "limit": 1, "cursor": cursor}).json()
+        ids += [hit["recipe"]["id"] for hit in page["results"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == [soup, pasta, salad]
+
+    # the last word matches as a prefix; punctuation is not query syntax
+    assert [hit["recipe"]["id"] for hit in auth_client.get(
+        "/api/v1/recipes/search", params={"q": 'gently "simm'}
+    ).json()["results"]] == [soup]
+    assert auth_client.get("/api/v1/recipes/search", params={"q": "!!"}).json() == {"results": [], "next_cursor": None}
+    assert auth_client.get("/api/v1/recipes/search", params={"q": "tomato", "cursor": "nope"}).status_code == 400
+
+    # kept in sync with updates and deletes
+    auth_client.put(f"/api/v1/recipes/{salad}", json={
+        "name": "Green Salad", "description": "Crisp leaves", "instructions": ["Toss with lemon"], "prep_time": 5,
+        "ingredients": [],
+    })
+    auth_client.delete(f"/api/v1/recipes/{pasta}")
+    page = auth_client.get("/api/v1/recipes/search", params={"q": "tomato"}).json()
+    assert [hit["recipe"]["id"] for hit in page["results"]] == [soup]
+
+def test_search_recipes_ignores_owner_id(auth_client, current_user):
+    for name in ("Tomato Soup", f"Pasta {current_user} Ways"):
+        auth_client.post("/api/v1/recipes/", json={
+            "name": name, "description": "Easy", "instructions": ["Cook"], "prep_time": 10, "ingredients": [],
+        })
+
+    # a digit of the user's id only matches recipe text, not the indexed owner
+    for q in (str(current_user), str(current_user)[0]):
+        results = auth_client.get("/api/v1/recipes/search", params={"q": q}).json()["results"]
+        assert [hit["recipe"]["name"] for hit in results] == [f"Pasta {current_user} Ways"]
+        assert results[0]["snippet"] == f"Pasta <mark>{current_user}</mark> Ways"
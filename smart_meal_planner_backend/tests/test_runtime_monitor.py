@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+
+from monitoring.runtime import RuntimeMonitor, configure_threadpool
+
+def _gauge(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {})
+
+@pytest.mark.asyncio
+async def test_monitor_reports_event_loop_lag():
+    monitor = RuntimeMonitor(interval=0.05)
+    monitor.start()
+    await asyncio.sleep(0.01)
+    time.sleep(0.2)  # block the loop past the monitor's wake-up
+    await asyncio.sleep(0.01)  # the overdue sample runs, the next one is not due yet
+    lag = _gauge("event_loop_lag_seconds")
+    await monitor.stop()
+    assert monitor._task is None
+    assert lag >= 0.1
+
+@pytest.mark.asyncio
+async def test_sample_threadpool_and_db_pool(tmp_path):
+    configure_threadpool(7)
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    monitor = RuntimeMonitor(engine)
+    with engine.connect():
+        monitor.sample(loop_lag=0.0)
+    assert _gauge("threadpool_workers_limit") == 7
+    assert _gauge("threadpool_workers_active") == 0
+    assert _gauge("threadpool_tasks_queued") == 0
+    assert _gauge("db_pool_connections_checked_out") == 1
+    configure_threadpool(40)
+
+def test_in_progress_requests_by_route_class(client):
+    assert client.get("/health").status_code == 200
+    assert _gauge("http_requests_in_progress", {"route_class": "health"}) == 0
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.seed import INGREDIENT_NAMES, migrate, seed_database
+from models import InventoryItem, Recipe, ShoppingListItem, User
+
+SIZES = {"inventory": 20, "recipes": 5, "shopping": 30}
+ANCHOR = date(2024, 6, 1)
+
+def seeded_engine(workers):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    migrate(engine)
+    seed_database(engine, 6, SIZES, seed=7, workers=workers, users_per_chunk=2, anchor=ANCHOR, password_hash="x")
+    return engine
+
+def dump(engine, model):
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(select(model.__table__).order_by(model.id))]
+
+def test_seed_row_counts():
+    engine = seeded_engine(workers=1)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count(User.id))).scalar() == 6
+        assert conn.execute(select(func.count(InventoryItem.id))).scalar() == 6 * SIZES["inventory"]
+        assert conn.execute(select(func.count(Recipe.id))).scalar() == 6 * SIZES["recipes"]
+        assert conn.execute(select(func.count(ShoppingListItem.id))).scalar() == 6 * SIZES["shopping"]
+
+        # Shopping rows only reference recipes owned by the same user
+        mismatched = conn.execute(
+            select(func.count(ShoppingListItem.id))
+            .join(Recipe, Recipe.id == ShoppingListItem.recipe_id)
+            .where(Recipe.user_id != ShoppingListItem.user_id)
+        ).scalar()
+        assert mismatched == 0
+
+        # Inventory names come from the catalog as-is, with no invented variants
+        names = conn.execute(select(InventoryItem.name).distinct()).scalars().all()
+        assert set(names) <= set(INGREDIENT_NAMES)
+
+def test_seed_is_deterministic_across_worker_counts():
+    single = seeded_engine(workers=1)
+    parallel = seeded_engine(workers=2)
+    for model in (User, InventoryItem, Recipe, ShoppingListItem):
+        assert dump(single, model) == dump(parallel, model)
+
+def test_seed_large_inventory_is_distinct_ingredients():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    migrate(engine)
+    seed_database(engine, 1, {"inventory": 2_000, "recipes": 0, "shopping": 0}, anchor=ANCHOR, password_hash="x")
+    with engine.connect() as conn:
+        keys = conn.execute(select(InventoryItem.ingredient_id, InventoryItem.base_unit)).all()
+    assert len(keys) == len(set(keys)) == 2_000
+
+def test_seed_refuses_unmigrated_database():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        seed_database(engine, 1, SIZES, password_hash="x")
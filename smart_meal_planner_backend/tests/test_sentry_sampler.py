@@ -0,0 +1,44 @@
+import sentry_sdk
+
+from monitoring.sentry import AdaptiveSampler, init_sentry, sampler, settings
+
+def _context(path, parent_sampled=None):
+    return {"asgi_scope": {"type": "http", "path": path}, "parent_sampled": parent_sampled}
+
+def test_rates_by_route_class():
+    sampler = AdaptiveSampler()
+    assert sampler(_context("/health")) == settings.SENTRY_HEALTH_TRACES_SAMPLE_RATE
+    assert sampler(_context("/api/v1/ai/recipes/suggest")) == settings.SENTRY_AI_TRACES_SAMPLE_RATE
+    assert sampler(_context("/api/v1/inventory/")) == settings.SENTRY_TRACES_SAMPLE_RATE
+    assert sampler(_context("/api/v1/inventory/", parent_sampled=True)) == 1.0
+
+def test_boosts_on_error_rate():
+    sampler = AdaptiveSampler(window=20)
+    for i in range(20):
+        sampler.observe("/api/v1/inventory/", 0.01, failed=i < 2)
+    assert sampler.error_rate() == 0.1
+    assert sampler.rate_for("/api/v1/recipes/") == settings.SENTRY_BOOSTED_TRACES_SAMPLE_RATE
+    assert sampler.rate_for("/health") == settings.SENTRY_HEALTH_TRACES_SAMPLE_RATE
+
+    # Failures age out of the window
+    for _ in range(20):
+        sampler.observe("/api/v1/inventory/", 0.01, failed=False)
+    assert sampler.error_rate() == 0.0
+    assert sampler.rate_for("/api/v1/recipes/") == settings.SENTRY_TRACES_SAMPLE_RATE
+
+def test_boosts_slow_route_class():
+    sampler = AdaptiveSampler()
+    sampler.observe("/api/v1/auth/login", settings.SLOW_REQUEST_THRESHOLD * 2, failed=False)
+    assert sampler.rate_for("/api/v1/auth/me") == settings.SENTRY_BOOSTED_TRACES_SAMPLE_RATE
+    assert sampler.rate_for("/api/v1/inventory/") == settings.SENTRY_TRACES_SAMPLE_RATE
+
+def test_init_sentry_installs_sampler(monkeypatch):
+    monkeypatch.setattr(settings, "SENTRY_DSN", "https://public@sentry.example.com/1")
+    init_sentry(environment="test")
+    client = sentry_sdk.Hub.current.client
+    try:
+        assert client.options["traces_sampler"] is sampler
+        assert client.options["environment"] == "test"
+    finally:
+        client.close(timeout=0)
+        sentry_sdk.Hub.current.bind_client(None)
@@ -0,0 +1,59 @@
+import os
+
+from config import get_settings
+from serve import gunicorn_options, prepare_multiprocess_dir, rss_mb
+
+def test_gunicorn_options_from_settings():
+    settings = get_settings().model_copy(update={"WORKERS": None, "PORT": 8123, "WORKER_MAX_REQUESTS": 500})
+    options = gunicorn_options(settings)
+    assert options["workers"] == (os.cpu_count() or 1)
+    assert options["bind"] == "0.0.0.0:8123"
+    assert options["preload_app"] is True
+    assert options["max_requests"] == 500
+    assert options["worker_class"] == "serve.RecyclingUvicornWorker"
+
+    options = gunicorn_options(settings.model_copy(update={"WORKERS": 3}))
+    assert options["workers"] == 3
+
+def test_prepare_multiprocess_dir_clears_stale_files(tmp_path):
+    (tmp_path / "counter_123.db").write_bytes(b"")
+    (tmp_path / "keep.txt").write_text("not a metrics file")
+    prepare_multiprocess_dir(str(tmp_path / "metrics"))
+    prepare_multiprocess_dir(str(tmp_path))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["keep.txt", "metrics"]
+
+def test_rss_mb():
+    assert rss_mb() > 1
+
+def test_metrics_served_by_master_only_under_serve(monkeypatch, tmp_path):
+    import main
+    import monitoring.metrics
+    from fastapi.testclient import TestClient
+    from serve import when_ready
+
+    started = []
+    monkeypatch.setattr(monitoring.metrics, "start_metrics_server", lambda port: started.append("master") or True)
+    monkeypatch.setattr(main, "start_metrics_server", lambda port: started.append("worker") or True)
+    app = main.create_app(get_settings().model_copy(update={"ENABLE_METRICS": True, "ENABLE_RUNTIME_MONITOR": False}))
+
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    when_ready(None)
+    with TestClient(app):
+        pass
+    assert started == ["worker"]
+
+    # uvicorn --workers: the first worker to bind serves the aggregated metrics
+    started.clear()
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    when_ready(None)
+    with TestClient(app):
+        pass
+    assert started == ["worker"]
+
+    # serve.py: the gunicorn master does
+    started.clear()
+    monkeypatch.setenv(monitoring.metrics.SUPERVISOR_ENV, "1")
+    when_ready(None)
+    with TestClient(app):
+        pass
+    assert started == ["master"]
@@ -0,0 +1,42 @@
+import contextvars
+
+from monitoring.timing import current_timing, start_request, timed
+
+def _phases(header):
+    return {entry.split(";")[0] for entry in header.split(", ")}
+
+def test_timed_is_noop_outside_request():
+    assert current_timing() is None
+    with timed("db"):
+        pass
+    assert current_timing() is None
+
+def test_timed_accumulates_phases():
+    contextvars.copy_context().run(_accumulate_phases)
+    assert current_timing() is None
+
+def _accumulate_phases():
+    timing = start_request()
+    with timed("auth"):
+        pass
+    with timed("auth"):
+        pass
+    timing.add("db", 0.0125)
+    assert set(timing.phases) == {"auth", "db"}
+    assert "db;dur=12.50" in timing.server_timing()
+    assert timing.log_fields()["db_duration"] == 0.0125
+
+def test_server_timing_header(auth_client, sample_inventory_item):
+    auth_client.post("/api/v1/inventory/", json=sample_inventory_item)
+    response = auth_client.get("/api/v1/inventory/")
+    assert response.status_code == 200
+    assert {"db", "render", "total"} <= _phases(response.headers["Server-Timing"])
+
+def test_server_timing_includes_auth(client):
+    response = client.post("/api/v1/auth/register", json={
+        "username": "timing",
+        "email": "timing@example.com",
+        "password": "password123"
+    })
+    assert response.status_code == 200
+    assert "auth" in _phases(response.headers["Server-Timing"])
@@ -12,8 +12,8 @@ def sample_shopping_item():
         "purchased": False
     }
 
-def test_create_shopping_item(client, sample_shopping_item):
-    response = client.post("/api/v1/shopping-list/", json=sample_shopping_item)
+def test_create_shopping_item(auth_client, sample_shopping_item):
+    response = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item)
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == sample_shopping_item["name"]
@@ -23,11 +23,11 @@ def test_create_shopping_item(client, sample_shopping_item):
     assert "created_at" in data
     assert "updated_at" in data
 
-def test_get_shopping_list(client, sample_shopping_item):
+def test_get_shopping_list(auth_client, sample_shopping_item):
     # Create an item first
-    client.post("/api/v1/shopping-list/", json=sample_shopping_item)
+    auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item)
     
-    response = client.get("/api/v1/shopping-list/")
+    response = auth_client.get("/api/v1/shopping-list/")
     assert response.status_code == 200
     data = response.json()
     assert "total_items" in data
@@ -38,48 +38,48 @@ def test_get_shopping_list(client, sample_shopping_item):
     assert data["total_items"] == len(data["items"])
     assert data["pending_items"] == data["total_items"] - data["purchased_items"]
 
-def test_update_shopping_item(client, sample_shopping_item):
+def test_update_shopping_item(auth_client, sample_shopping_item):
     # Create an item first
-    create_response = client.post("/api/v1/shopping-list/", json=sample_shopping_item)
+    create_response = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item)
     item_id = create_response.json()["id"]
     
     # Update the item
     updated_data = sample_shopping_item.copy()
     updated_data["quantity"] = 3.5
     
-    response = client.put(f"/api/v1/shopping-list/{item_id}", json=updated_data)
+    response = auth_client.put(f"/api/v1/shopping-list/{item_id}", json=updated_data)
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == item_id
     assert data["quantity"] == 3.5
 
-def test_delete_shopping_item(client, sample_shopping_item):
+def test_delete_shopping_item(auth_client, sample_shopping_item):
     # Create an item first
-    create_response = client.post("/api/v1/shopping-list/", json=sample_shopping_item)
+    create_response = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item)
     item_id = create_response.json()["id"]
     
     # Delete the item
-    response = client.delete(f"/api/v1/shopping-list/{item_id}")
+    response = auth_client.delete(f"/api/v1/shopping-list/{item_id}")
     assert response.status_code == 200
 
-def test_mark_item_as_purchased(client, sample_shopping_item):
+def test_mark_item_as_purchased(auth_client, sample_shopping_item):
     # Create an item first
-    create_response = client.post("/api/v1/shopping-list/", json=sample_shopping_item)
+    create_response = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item)
     item_id = create_response.json()["id"]
     
     # Mark as purchased
-    response = client.post(f"/api/v1/shopping-list/{item_id}/purchase")
+    response = auth_client.post(f"/api/v1/shopping-list/{item_id}/purchase")
     assert response.status_code == 200
     data = response.json()
     assert data["purchased"] == True
 
-def test_generate_shopping_list_from_recipe(client, sample_recipe):
+def test_generate_shopping_list_from_recipe(auth_client, sample_recipe):
     # Create a recipe first
-    recipe_response = client.post("/api/v1/recipes/", json=sample_recipe)
+    recipe_response = auth_client.post("/api/v1/recipes/", json=sample_recipe)
     recipe_id = recipe_response.json()["id"]
     
     # Generate shopping list
-    response = client.post("/api/v1/shopping-list/recipe/", json={
+    response = auth_client.post("/api/v1/shopping-list/recipe/", json={
         "recipe_id": recipe_id,
         "servings": 2.0
     })
@@ -91,17 +91,26 @@ def test_generate_shopping_list_from_recipe(client, sample_recipe):
     for item, original in zip(data, sample_recipe["ingredients"]):
         assert item["quantity"] == original["quantity"] * 2.0
 
-def test_mark_purchased_updates_inventory(client, sample_shopping_item):
+def test_delete_recipe_keeps_generated_items(auth_client, sample_recipe):
+    recipe_id = auth_client.post("/api/v1/recipes/", json=sample_recipe).json()["id"]
+    auth_client.post("/api/v1/shopping-list/recipe/", json={"recipe_id": recipe_id})
+
+    assert auth_client.delete(f"/api/v1/recipes/{recipe_id}").status_code == 200
+    items = auth_client.get("/api/v1/shopping-list/").json()["items"]
+    assert len(items) == len(sample_recipe["ingredients"])
+    assert all(item["recipe_id"] is None for item in items)
+
+def test_mark_purchased_updates_inventory(auth_client, sample_shopping_item):
     # Create a shopping list item
-    create_response = client.post("/api/v1/shopping-list/", json=sample_shopping_item)
+    create_response = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item)
     item_id = create_response.json()["id"]
     
     # Mark as purchased with inventory update
-    response = client.post(f"/api/v1/shopping-list/{item_id}/purchase", params={"update_inventory": True})
+    response = auth_client.post(f"/api/v1/shopping-list/{item_id}/purchase", params={"update_inventory": True})
     assert response.status_code == 200
     
     # Check inventory
-    inventory_response = client.get("/api/v1/inventory/")
+    inventory_response = auth_client.get("/api/v1/inventory/")
     inventory_data = inventory_response.json()
     assert len(inventory_data) > 0
     
@@ -112,4 +121,65 @@ def test_mark_purchased_updates_inventory(client, sample_shopping_item):
     )
     assert matching_item is not None
     assert matching_item["quantity"] == sample_shopping_item["quantity"]
-    assert matching_item["unit"] == sample_shopping_item["unit"] 
\ No newline at end of file
+    assert matching_item["unit"] == sample_shopping_item["unit"] 
+def test_generate_from_recipe_twice_adds_to_pending_items(auth_client, sample_recipe):
+    recipe_id = auth_client.post("/api/v1/recipes/", json=sample_recipe).json()["id"]
+
+    first = auth_client.post("/api/v1/shopping-list/recipe/", json={"recipe_id": recipe_id}).json()
+    second = auth_client.post("/api/v1/shopping-list/recipe/", json={"recipe_id": recipe_id}).json()
+
+    assert [item["id"] for item in second] == [item["id"] for item in first]
+    for item, original in zip(second, sample_recipe["ingredients"]):
+        assert item["quantity"] == original["quantity"] * 2
+
+def test_generate_from_recipe_folds_equivalent_ingredients(auth_client, sample_recipe):
+    auth_client.post("/api/v1/shopping-list/", json={"name": "Tomatoes", "quantity": 1, "unit": "kg"})
+    recipe_id = auth_client.post("/api/v1/recipes/", json={**sample_recipe, "ingredients": [
+        {"name": "Tomato", "quantity": 200, "unit": "g"},
+        {"name": "Basil", "quantity": 1, "unit": "bunch"},
+        {"name": "tomatoes", "quantity": 0.3, "unit": "kg"},
+    ]}).json()["id"]
+
+    items = auth_client.post("/api/v1/shopping-list/recipe/", json={"recipe_id": recipe_id}).json()
+    assert [item["name"] for item in items] == ["Tomatoes", "Basil", "Tomatoes"]
+    assert items[0]["id"] == items[2]["id"]
+    assert items[0]["quantity"] == 1.5  # 1 kg + 200 g + 0.3 kg, in the pending item's unit
+
+def test_mark_purchased_twice_restocks_once(auth_client, sample_shopping_item):
+    item_id = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item).json()["id"]
+
+    auth_client.post(f"/api/v1/shopping-list/{item_id}/purchase")
+    response = auth_client.post(f"/api/v1/shopping-list/{item_id}/purchase")
+    assert response.status_code == 200
+
+    inventory = auth_client.get("/api/v1/inventory/").json()
+    assert [item["quantity"] for item in inventory] == [sample_shopping_item["quantity"]]
+
+def test_batch_purchase_merges_into_inventory(auth_client):
+    auth_client.post("/api/v1/inventory/", json={"name": "Milk", "quantity": 1, "unit": "l"})
+    ids = [
+        auth_client.post("/api/v1/shopping-list/", json=item).json()["id"]
+        for item in (
+            {"name": "Milk", "quantity": 2, "unit": "l"},
+            {"name": "Eggs", "quantity": 12, "unit": "pcs"},
+        )
+    ]
+    auth_client.post(f"/api/v1/shopping-list/{ids[1]}/purchase")
+
+    response = auth_client.post("/api/v1/shopping-list/purchase", json={"item_ids": [ids[0], ids[1], 999, ids[0]]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["purchased", "already_purchased", "not_found", "purchased"]
+    assert results[0]["item"]["purchased"] is True
+
+    inventory = {item["name"]: item["quantity"] for item in auth_client.get("/api/v1/inventory/").json()}
+    assert inventory == {"Milk": 3, "Eggs": 12}  # each item restocked exactly once
+
+def test_batch_purchase_without_inventory_update(auth_client, sample_shopping_item):
+    item_id = auth_client.post("/api/v1/shopping-list/", json=sample_shopping_item).json()["id"]
+
+    response = auth_client.post(
+        "/api/v1/shopping-list/purchase", params={"update_inventory": False}, json={"item_ids": [item_id]}
+    )
+    assert response.json()["results"][0]["status"] == "purchased"
+    assert auth_client.get("/api/v1/inventory/").json() == []